@@ -0,0 +1,63 @@
+# benchmarks/cipher.py
+#
+# Per-entry overhead of the one-shot cipher helpers vs CipherSession.
+#
+#   python -m benchmarks.cipher [entries] [payload_bytes]
+
+import os
+import sys
+import time
+
+from crypto.cipher import encrypt, decrypt, CipherSession
+
+
+def _per_entry_us(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def run(count: int = 20000, size: int = 160) -> dict:
+    key = os.urandom(32)
+    session = CipherSession(key)
+
+    plaintexts = [os.urandom(size) for _ in range(count)]
+    blobs = session.encrypt_many(plaintexts)
+
+    results = {
+        "encrypt(key, ...)": _per_entry_us(
+            lambda: [encrypt(key, p) for p in plaintexts], count
+        ),
+        "session.encrypt": _per_entry_us(
+            lambda: [session.encrypt(p) for p in plaintexts], count
+        ),
+        "session.encrypt_many": _per_entry_us(
+            lambda: session.encrypt_many(plaintexts), count
+        ),
+        "decrypt(key, ...)": _per_entry_us(
+            lambda: [decrypt(key, b) for b in blobs], count
+        ),
+        "session.decrypt": _per_entry_us(
+            lambda: [session.decrypt(b) for b in blobs], count
+        ),
+        "session.decrypt_many": _per_entry_us(
+            lambda: session.decrypt_many(blobs), count
+        ),
+    }
+
+    session.wipe()
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 20000
+    size = int(argv[1]) if len(argv) > 1 else 160
+
+    print(f"{count} entries x {size} bytes")
+    for name, us in run(count, size).items():
+        print(f"  {name:<24} {us:8.2f} us/entry")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/encoding.py
+#
+# Record encoding: the binary codec vs the old JSON records, per entry
+# (encode/decode time and encoded size).
+#
+#   python -m benchmarks.encoding [entries] [note_length]
+
+import json
+import sys
+import time
+from dataclasses import fields
+
+from benchmarks.synthetic import make_entries
+from models.entry import EntryMeta, EntrySecret
+
+
+def _json(record) -> bytes:
+    # What serialize() wrote before the binary format
+    return json.dumps({f.name: getattr(record, f.name) for f in fields(record)}).encode("utf-8")
+
+
+def _per_entry_us(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def _compare(cls, records) -> dict:
+    count = len(records)
+    as_json = [_json(r) for r in records]
+    as_binary = [r.serialize() for r in records]
+
+    return {
+        "json": {
+            "encode_us": _per_entry_us(lambda: [_json(r) for r in records], count),
+            "decode_us": _per_entry_us(lambda: [cls.deserialize(d) for d in as_json], count),
+            "bytes": sum(map(len, as_json)) / count,
+        },
+        "binary": {
+            "encode_us": _per_entry_us(lambda: [r.serialize() for r in records], count),
+            "decode_us": _per_entry_us(lambda: [cls.deserialize(d) for d in as_binary], count),
+            "bytes": sum(map(len, as_binary)) / count,
+        },
+    }
+
+
+def run(count: int = 20000, note_length: int = 200) -> dict:
+    metas, secrets = zip(*(e.split() for e in make_entries(count, note_length)))
+
+    return {
+        "EntryMeta": _compare(EntryMeta, list(metas)),
+        "EntrySecret": _compare(EntrySecret, list(secrets)),
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 20000
+    note_length = int(argv[1]) if len(argv) > 1 else 200
+
+    print(f"{count} entries, notes {note_length} chars")
+    for name, formats in run(count, note_length).items():
+        print(f"  {name}")
+        for fmt, r in formats.items():
+            print(
+                f"    {fmt:<7} encode {r['encode_us']:6.2f} us"
+                f"  decode {r['decode_us']:6.2f} us"
+                f"  {r['bytes']:7.1f} bytes"
+            )
+
+
+if __name__ == "__main__":
+    main()
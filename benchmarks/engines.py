@@ -0,0 +1,180 @@
+# benchmarks/engines.py
+#
+# Storage engines side by side on write-heavy work: single-entry
+# commits, usage flushes, edits, a full rekey swap, reopening (index
+# build) and listing. Engines only see blobs, so random bytes of the
+# size of real AES-GCM records stand in for encrypted data.
+#
+#   python -m benchmarks.engines [--entries N] [--repeat N]
+#                                [--engine NAME ...] [--output FILE]
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import measure
+from storage.engines import ENGINES
+
+# Encrypted sizes of a typical EntryMeta / EntrySecret / EntryUsage
+_META = 100
+_SECRET = 260
+_USAGE = 45
+
+# Entries written per usage flush (a few minutes of browsing)
+_USAGE_BATCH = 20
+
+
+def _blob(rng: random.Random, size: int) -> bytes:
+    return rng.randbytes(size)
+
+
+class EngineBench:
+    def __init__(self, cls, directory: Path, entries: int, repeat: int, seed: int = 0):
+        self.cls = cls
+        self.path = directory / f"vault{cls.SUFFIX}"
+        self.repeat = repeat
+        self.rng = random.Random(seed)
+
+        self.engine = cls(self.path)
+        self.engine.create_account(b"u" * 32, b"s" * 16, b"v" * 32, b"w" * 60, "kdf")
+        self.engine.add_entries(
+            (_blob(self.rng, _META), _blob(self.rng, _SECRET)) for _ in range(entries)
+        )
+        self.ids = [entry_id for entry_id, _ in self.engine.get_all_meta()]
+
+    def close(self):
+        self.engine.close()
+
+    # ========================
+    # Benchmarks
+    # ========================
+
+    def add_entry(self):
+        count = 50
+        return measure(
+            lambda: [self.engine.add_entry(b"m" * _META, b"s" * _SECRET) for _ in range(count)],
+            repeat=self.repeat,
+            items=count,
+        )
+
+    def usage_flush(self):
+        batches = itertools.cycle(
+            [
+                [(entry_id, _blob(self.rng, _USAGE)) for entry_id in self.rng.sample(self.ids, _USAGE_BATCH)]
+                for _ in range(8)
+            ]
+        )
+        count = 50
+        return measure(
+            lambda: [self.engine.put_usage_many(next(batches)) for _ in range(count)],
+            repeat=self.repeat,
+            items=count,
+        )
+
+    def update_entry(self):
+        ids = itertools.cycle(self.ids)
+        count = 50
+        return measure(
+            lambda: [
+                self.engine.update_entry(next(ids), b"m" * _META, b"s" * _SECRET)
+                for _ in range(count)
+            ],
+            repeat=self.repeat,
+            items=count,
+        )
+
+    def rekey(self):
+        """
+        Staging in REKEY_BATCH_SIZE batches plus the final swap, minus
+        the crypto.
+        """
+        def run():
+            self.engine.begin_rekey(b"u" * 32, b"s" * 16, b"v" * 32, b"w" * 60, "kdf")
+            last_id = 0
+            while rows := self.engine.get_entries_after(last_id, 500):
+                last_id = rows[-1][0]
+                self.engine.stage_rekey_batch(rows, last_id)
+            self.engine.finish_rekey(self.engine.get_all_usage())
+
+        return measure(run, repeat=min(self.repeat, 3), items=len(self.ids))
+
+    def reopen(self):
+        def run():
+            self.engine.close()
+            self.engine = self.cls(self.path)
+
+        return measure(run, repeat=self.repeat, items=len(self.ids))
+
+    def get_all_meta(self):
+        return measure(
+            self.engine.get_all_meta,
+            repeat=self.repeat,
+            items=len(self.ids),
+        )
+
+    def compact(self):
+        return measure(self.engine.compact, repeat=min(self.repeat, 3))
+
+
+BENCHMARKS = (
+    "add_entry",
+    "usage_flush",
+    "update_entry",
+    "rekey",
+    "reopen",
+    "get_all_meta",
+    "compact",
+)
+
+
+def run(entries: int, repeat: int, engines=None, seed: int = 0) -> dict:
+    results = {}
+
+    for name in engines or ENGINES:
+        with tempfile.TemporaryDirectory(prefix="vaultx-engines-") as tmp:
+            bench = EngineBench(ENGINES[name], Path(tmp), entries, repeat, seed)
+            try:
+                results[name] = {}
+                for benchmark in BENCHMARKS:
+                    results[name][benchmark] = getattr(bench, benchmark)()
+                    print(
+                        f"  {name:<7} {benchmark:<14} p50 {results[name][benchmark]['p50_ms']:10.3f} ms",
+                        file=sys.stderr,
+                    )
+                results[name]["file_bytes"] = os.path.getsize(bench.path)
+            finally:
+                bench.close()
+
+    return {
+        "timestamp": time.time(),
+        "params": {"entries": entries, "repeat": repeat, "seed": seed},
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.engines")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", nargs="+", choices=ENGINES)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    report = run(args.entries, args.repeat, args.engine, args.seed)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
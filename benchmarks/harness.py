@@ -0,0 +1,67 @@
+# benchmarks/harness.py
+#
+# Timing helpers shared by the benchmark suite.
+
+import gc
+import statistics
+import time
+import tracemalloc
+
+
+def _percentile(sorted_ms: list[float], pct: float) -> float:
+    if len(sorted_ms) == 1:
+        return sorted_ms[0]
+
+    rank = (len(sorted_ms) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_ms) - 1)
+    return sorted_ms[low] + (sorted_ms[high] - sorted_ms[low]) * (rank - low)
+
+
+def measure(fn, repeat: int = 5, items: int = 1, setup=None) -> dict:
+    """
+    Time fn() `repeat` times and report latency percentiles (ms),
+    throughput (items per second, `items` per call) and peak traced
+    memory of one extra call.
+
+    setup() runs before every call and is not timed. Peak memory is
+    measured separately because tracemalloc slows allocation-heavy
+    code down too much to share a run with the timings.
+    """
+    samples = []
+
+    for _ in range(repeat):
+        if setup:
+            setup()
+
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    if setup:
+        setup()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    mean = statistics.fmean(samples)
+
+    return {
+        "runs": repeat,
+        "items": items,
+        "min_ms": samples[0],
+        "p50_ms": _percentile(samples, 50),
+        "p90_ms": _percentile(samples, 90),
+        "p99_ms": _percentile(samples, 99),
+        "max_ms": samples[-1],
+        "mean_ms": mean,
+        "throughput_per_s": items / (mean / 1000) if mean else None,
+        "peak_kib": peak / 1024,
+    }
@@ -0,0 +1,307 @@
+# benchmarks/suite.py
+#
+# Headless benchmarks of the vault's hot paths on a synthetic vault.
+# Results are printed (or written) as JSON so runs can be diffed across
+# commits.
+#
+#   python -m benchmarks.suite [--entries N] [--note-length N]
+#                              [--repeat N] [--engine NAME]
+#                              [--only NAME ...] [--output FILE]
+
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import measure
+from benchmarks.synthetic import MASTER_PASSWORD, SyntheticVault
+from crypto.cipher import CipherSession, generate_key
+from core.entries import load_passwords
+from crypto.kdf import DEFAULT_PARAMS, derive_key
+from models.entry import EntryMeta, VaultEntry
+from models.health import HealthAudit
+from models.search import SearchIndex
+from models.store import EntryStore
+from storage.loader import load_entries
+from storage.engines import ENGINES
+from storage.rekey import RekeyEngine
+from storage.usage import UsageTracker
+from utils.password_gen import generate_password
+from utils.strength import clear_cache as clear_strength_cache, estimate
+
+
+def _typing(sites, count: int = 8):
+    """
+    Keystroke sequences for a handful of sites: "g", "gi", "git", ...
+    """
+    queries = []
+    for site in sites[:count]:
+        word = EntryMeta(site).domain.removeprefix("www.")
+        queries.extend(word[:i] for i in range(1, min(len(word), 8) + 1))
+        queries.append("")
+    return queries
+
+
+class Suite:
+    def __init__(self, vault: SyntheticVault, repeat: int):
+        self.vault = vault
+        self.storage = vault.storage
+        self.session = vault.session
+        self.repeat = repeat
+        self.count = len(vault.entries)
+
+    # ========================
+    # Benchmarks
+    # ========================
+
+    def derive_key(self):
+        return measure(
+            lambda: derive_key(MASTER_PASSWORD, self.vault.salt, DEFAULT_PARAMS),
+            repeat=min(self.repeat, 3),
+        )
+
+    def encrypt_many(self):
+        plaintexts = [entry.split()[1].serialize() for entry in self.vault.entries]
+        return measure(
+            lambda: self.session.encrypt_many(plaintexts),
+            repeat=self.repeat,
+            items=self.count,
+        )
+
+    def decrypt_many(self):
+        blobs = [secret for _, _, secret in self.storage.get_all_entries()]
+        return measure(
+            lambda: self.session.decrypt_many(blobs),
+            repeat=self.repeat,
+            items=len(blobs),
+        )
+
+    def serialize(self):
+        entries = self.vault.entries
+        return measure(
+            lambda: [entry.serialize() for entry in entries],
+            repeat=self.repeat,
+            items=self.count,
+        )
+
+    def deserialize(self):
+        records = [entry.serialize() for entry in self.vault.entries]
+        return measure(
+            lambda: [VaultEntry.deserialize(data) for data in records],
+            repeat=self.repeat,
+            items=self.count,
+        )
+
+    def get_all_entries(self):
+        return measure(
+            self.storage.get_all_entries,
+            repeat=self.repeat,
+            items=self.count,
+        )
+
+    def refresh(self):
+        return measure(
+            lambda: self._refresh(EntryStore(), SearchIndex()),
+            repeat=self.repeat,
+            items=self.count,
+        )
+
+    def filter(self):
+        """
+        Per-keystroke latency while typing a few site names.
+        """
+        store, index = EntryStore(), SearchIndex()
+        self._refresh(store, index)
+
+        queries = _typing([entry.site for entry in self.vault.entries])
+        keystrokes = itertools.cycle(queries)
+
+        return measure(
+            lambda: index.search(next(keystrokes)),
+            repeat=len(queries) * self.repeat,
+        )
+
+    def rekey(self):
+        """
+        Full re-encryption, as ChangeMasterPasswordDialog drives it.
+        Alternates between two data keys so every run does real work.
+        """
+        account = self.storage.get_account()
+        sessions = [self.session, CipherSession(generate_key())]
+
+        def run():
+            engine = RekeyEngine(self.storage, sessions[0], sessions[1])
+            engine.start(
+                account.username_hash,
+                account.salt,
+                account.verifier,
+                account.wrapped_dek,
+                account.kdf,
+            )
+            engine.run()
+            sessions.reverse()
+
+        # measure() makes one extra call for peak memory, so the vault
+        # may end up on either key; nothing after this reads it back.
+        return measure(run, repeat=min(self.repeat, 3), items=self.count)
+
+    def generate_password(self):
+        count = 1000
+        return measure(
+            lambda: [generate_password(length=20) for _ in range(count)],
+            repeat=self.repeat,
+            items=count,
+        )
+
+    def password_strength(self):
+        """
+        Cold strength estimates (memoized results cleared first) of
+        the vault's passwords.
+        """
+        passwords = [entry.password for entry in self.vault.entries[:1000]]
+        return measure(
+            lambda: [estimate(password) for password in passwords],
+            repeat=self.repeat,
+            items=len(passwords),
+            setup=clear_strength_cache,
+        )
+
+    def health_audit(self):
+        """
+        Full health audit as VaultView.audit_health runs it: decrypt
+        every password, hash it into the audit, list reused and stale
+        entries. Strength scoring happens afterwards in steps and is
+        covered by password_strength.
+        """
+        usage = UsageTracker(self.storage, lambda: self.session).load()
+
+        def run():
+            audit = HealthAudit()
+            audit.load(
+                (entry_id, password, usage[entry_id].last_used if entry_id in usage else 0.0)
+                for entry_id, password in load_passwords(self.storage, self.session)
+            )
+            return audit.reused(), audit.stale()
+
+        return measure(run, repeat=self.repeat, items=self.count)
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _refresh(self, store, index):
+        # Mirrors VaultView.refresh, minus the widgets
+        metas = load_entries(self.storage.get_all_meta(), self.session)
+        usage = UsageTracker(self.storage, lambda: self.session).load()
+
+        for entry_id, meta in metas:
+            if entry_id in usage:
+                meta.last_used = usage[entry_id].last_used
+
+        store.load(metas)
+        index.build(
+            (entry_id, meta, usage[entry_id].use_count if entry_id in usage else 0)
+            for entry_id, meta in metas
+        )
+
+
+# Run order matters: rekey re-encrypts the vault, so it goes last
+BENCHMARKS = (
+    "derive_key",
+    "encrypt_many",
+    "decrypt_many",
+    "serialize",
+    "deserialize",
+    "get_all_entries",
+    "refresh",
+    "filter",
+    "generate_password",
+    "password_strength",
+    "health_audit",
+    "rekey",
+)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    entries: int,
+    note_length: int,
+    repeat: int,
+    only=None,
+    seed: int = 0,
+    engine: str = "sqlite",
+) -> dict:
+    names = [name for name in BENCHMARKS if not only or name in only]
+
+    with tempfile.TemporaryDirectory(prefix="vaultx-bench-") as tmp:
+        started = time.perf_counter()
+        path = Path(tmp) / f"vault{ENGINES[engine].SUFFIX}"
+        vault = SyntheticVault(path, entries, note_length, seed, engine)
+        setup_s = time.perf_counter() - started
+
+        try:
+            suite = Suite(vault, repeat)
+            results = {}
+            for name in names:
+                results[name] = getattr(suite, name)()
+                print(f"  {name:<20} p50 {results[name]['p50_ms']:10.3f} ms", file=sys.stderr)
+        finally:
+            vault.close()
+
+    return {
+        "revision": _git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "entries": entries,
+            "note_length": note_length,
+            "repeat": repeat,
+            "seed": seed,
+            "engine": engine,
+            "kdf": DEFAULT_PARAMS.encode(),
+        },
+        "setup_s": setup_s,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--note-length", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=ENGINES, default="sqlite")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    report = run(args.entries, args.note_length, args.repeat, args.only, args.seed, args.engine)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,3 +8,81 @@ TITLE_TEXT = "  Welcome Havok :: VaultX  "
 
 AUTO_LOCK_MINUTES = 3
 LOCK_ON_BLUR = True
+
+# Unlock decrypt pipeline (0 workers = one per core)
+DECRYPT_WORKERS = 0
+DECRYPT_CHUNK_SIZE = 512
+DECRYPT_USE_PROCESSES = False
+
+# Decrypted secrets kept in memory while unlocked
+SECRET_CACHE_SIZE = 64
+SECRET_CACHE_TTL_SECONDS = 60
+
+# Entries re-encrypted per batch during a master password change
+REKEY_BATCH_SIZE = 500
+
+# Argon2 calibration (per host, re-tuned after login)
+KDF_TARGET_MS = 500
+KDF_MAX_MEMORY_MB = 1024
+KDF_MAX_PARALLELISM = 16
+# Re-wrap only when time_cost x memory_cost is this far off target.
+# Calibrate after this long without input, or at the deadline at the
+# latest; the master password is not kept for the retune past it.
+KDF_RETUNE_TOLERANCE = 0.25
+KDF_RETUNE_IDLE_SECONDS = 30
+KDF_RETUNE_DEADLINE_SECONDS = 120
+
+# Usage stats are buffered in memory and written in batches
+USAGE_FLUSH_SECONDS = 30
+
+# Vault search: max ranked results per query, and how many candidates
+# a broad (short) query scores
+SEARCH_RESULT_LIMIT = 500
+SEARCH_SCAN_LIMIT = 2000
+
+# Vault list: delay after the last keystroke before filtering
+FILTER_DEBOUNCE_MS = 120
+
+# Diagnostics: timing spans around hot paths. Off means no wrappers
+# at all; VAULTX_TRACE=1 in the environment also turns them on.
+TRACE_ENABLED = False
+TRACE_WINDOW = 1024
+
+# Import / export: entries per transaction (import) or frame (export)
+IMPORT_BATCH_SIZE = 1000
+
+# Backups: snapshots kept, rows changed before an automatic snapshot,
+# and pages copied per backup step
+BACKUP_KEEP = 10
+BACKUP_EVERY_CHANGES = 200
+BACKUP_PAGES_PER_STEP = 64
+
+# Vault storage engine: "sqlite" (vault.db) or "log" (vault.vxlog, an
+# append-only record log). Switching engines starts an empty vault.
+STORAGE_ENGINE = "sqlite"
+
+# Log engine: dead bytes tolerated before background compaction (at
+# least as many as are live), and whether every commit is fsynced
+LOG_COMPACT_MIN_BYTES = 4 * 1024 * 1024
+LOG_FSYNC = True
+
+# Unlock agent (vaultx agent): longest request line accepted. It locks
+# after AUTO_LOCK_MINUTES without a request.
+AGENT_MAX_REQUEST_BYTES = 64 * 1024
+
+# Hotkey launcher: rows shown per query
+LAUNCHER_RESULTS = 8
+
+# Password strength: guesses per second assumed for the crack time
+# shown next to the score (an offline attack on a slow hash)
+STRENGTH_GUESSES_PER_SECOND = 1e4
+
+# Breached-password check: entries looked up per event-loop turn
+BREACH_CHECK_BATCH = 1000
+
+# Health audit: days without use before an entry counts as stale,
+# passwords strength-scored per event-loop turn, and rows listed per
+# section of the Health tab
+HEALTH_STALE_DAYS = 365
+HEALTH_SCORE_BATCH = 200
+HEALTH_LIST_LIMIT = 500
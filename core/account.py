@@ -0,0 +1,230 @@
+# core/account.py
+
+import hashlib
+import hmac
+
+from crypto.cipher import CipherSession, generate_key, wrap_key, unwrap_key
+from crypto.kdf import (
+    DEFAULT_PARAMS,
+    generate_salt,
+    derive_key,
+    calibrate,
+    needs_retune,
+)
+from storage.rekey import RekeyEngine, migrate_to_envelope
+
+_CHECK = b"vaultx-check"
+
+
+class InvalidLogin(Exception):
+    """
+    Username or master password does not match the account.
+    """
+
+
+def account_hashes(key: bytes, username: str):
+    """
+    (username_hash, verifier) for a password-derived key.
+    """
+    username_hash = hmac.new(
+        key,
+        username.encode("utf-8"),
+        hashlib.sha256,
+    ).digest()
+
+    verifier = hmac.new(
+        key,
+        _CHECK,
+        hashlib.sha256,
+    ).digest()
+
+    return username_hash, verifier
+
+
+def check_password(account, key: bytes) -> bool:
+    """
+    Does `key` (derived from the account's salt and parameters) match
+    the account's verifier? The username is not needed.
+    """
+    verifier = hmac.new(key, _CHECK, hashlib.sha256).digest()
+    return hmac.compare_digest(verifier, account.verifier)
+
+
+def check_login(account, key: bytes, username: str) -> bool:
+    username_hash, verifier = account_hashes(key, username)
+    return (
+        hmac.compare_digest(username_hash, account.username_hash)
+        and hmac.compare_digest(verifier, account.verifier)
+    )
+
+
+# ========================
+# Unlock
+# ========================
+
+def unlock_params(storage) -> tuple:
+    """
+    (account, salt, kdf params) for deriving the login key. A vault
+    without an account gets a fresh salt and the default parameters.
+    """
+    account = storage.get_account()
+
+    if account:
+        return account, account.salt, account.kdf_params
+    return None, generate_salt(), DEFAULT_PARAMS
+
+
+def open_vault(storage, username: str, key: bytes, account, salt: bytes) -> bytes:
+    """
+    Verify the login key (or create the account on first run) and
+    return the vault's data key. Raises InvalidLogin.
+
+    account and salt are what unlock_params() returned for `key`.
+    """
+    username_hash, verifier = account_hashes(key, username)
+
+    # ------------------------
+    # First run: create account
+    # ------------------------
+
+    if account is None:
+        dek = generate_key()
+
+        storage.create_account(
+            username_hash=username_hash,
+            salt=salt,
+            verifier=verifier,
+            wrapped_dek=wrap_key(key, dek),
+            kdf=DEFAULT_PARAMS.encode(),
+        )
+        return dek
+
+    # ------------------------
+    # Normal login
+    # ------------------------
+
+    if not check_login(account, key, username):
+        raise InvalidLogin("Invalid username or master password")
+
+    # Vaults from before envelope encryption get a data key on their
+    # first unlock
+    if account.wrapped_dek is None:
+        return migrate_to_envelope(storage, key)
+
+    return unwrap_key(key, account.wrapped_dek)
+
+
+def retuned_account(account, username: str, password: str, key: bytes) -> dict | None:
+    """
+    Benchmark this host and, if the account's Argon2 parameters are
+    off target, return update_account() arguments that re-wrap the
+    data key under a fresh salt with the calibrated ones. Slow: runs
+    several derivations.
+    """
+    target = calibrate()
+    if not needs_retune(account.kdf_params, target):
+        return None
+
+    salt = generate_salt()
+    new_key = derive_key(password, salt, target)
+    username_hash, verifier = account_hashes(new_key, username)
+    dek = unwrap_key(key, account.wrapped_dek)
+
+    return dict(
+        username_hash=username_hash,
+        salt=salt,
+        verifier=verifier,
+        wrapped_dek=wrap_key(new_key, dek),
+        kdf=target.encode(),
+    )
+
+
+# ========================
+# Master password change
+# ========================
+
+def change_password(storage, account, username: str, new_salt: bytes, old_key: bytes, new_key: bytes):
+    """
+    Re-wrap the data key under a new master password; entries are
+    untouched. old_key must already be checked with check_password().
+    """
+    new_username_hash, new_verifier = account_hashes(new_key, username)
+    dek = unwrap_key(old_key, account.wrapped_dek)
+
+    # A paused rotation was journaled under the old password
+    storage.abort_rekey()
+
+    storage.update_account(
+        username_hash=new_username_hash,
+        salt=new_salt,
+        verifier=new_verifier,
+        wrapped_dek=wrap_key(new_key, dek),
+        kdf=account.kdf,
+    )
+
+
+def rotation_params(storage, account, rotate: bool) -> tuple:
+    """
+    (journal, new salt, new kdf params) for a password change. A
+    paused rotation can only be resumed with its own salt.
+    """
+    journal = storage.get_rekey_journal() if rotate else None
+
+    if journal:
+        return journal, journal.salt, journal.kdf_params
+    return None, generate_salt(), account.kdf_params
+
+
+def resumes(journal, username: str, new_key: bytes) -> bool:
+    """
+    Was the paused rotation in `journal` started with this new
+    username and password?
+    """
+    if journal is None:
+        return False
+
+    username_hash, verifier = account_hashes(new_key, username)
+    return (
+        hmac.compare_digest(username_hash, journal.username_hash)
+        and hmac.compare_digest(verifier, journal.verifier)
+    )
+
+
+def start_rotation(
+    storage,
+    account,
+    username: str,
+    new_salt: bytes,
+    journal,
+    new_key: bytes,
+    old_session,
+) -> tuple[RekeyEngine, CipherSession]:
+    """
+    Password change plus a fresh data key: returns a started (or
+    resumed, if `journal` matches) RekeyEngine and the new session.
+    The caller steps the engine and calls finish(). A journal that
+    does not match must be aborted first.
+    """
+    new_username_hash, new_verifier = account_hashes(new_key, username)
+
+    if journal:
+        new_dek = unwrap_key(new_key, journal.wrapped_dek)
+    else:
+        new_dek = generate_key()
+
+    new_session = CipherSession(new_dek)
+    engine = RekeyEngine(storage, old_session, new_session)
+
+    if journal:
+        engine.resume()
+    else:
+        engine.start(
+            new_username_hash,
+            new_salt,
+            new_verifier,
+            wrap_key(new_key, new_dek),
+            account.kdf,
+        )
+
+    return engine, new_session
+
@@ -0,0 +1,324 @@
+# core/agent.py
+#
+# Unlock-once agent: holds an unlocked Vault (entry metadata and the
+# search index in memory) and answers lookups over a Unix-domain
+# socket, so clients skip both the key derivation and the decrypt.
+#
+# Protocol: one JSON object per line in each direction, any number of
+# requests per connection.
+#
+#   {"op": "search", "query": "git", "limit": 20}
+#       -> {"ok": true, "entries": [{"site", "username", "domain"}, ...]}
+#   {"op": "url", "url": "https://login.example.co.uk/", "limit": 5}
+#       -> {"ok": true, "entries": [...]}, best match first
+#   {"op": "get", "site": "github"}
+#       -> {"ok": true, "entry": {"site", ..., "password", "notes"}}
+#   {"op": "list", "limit": 0} / {"op": "status"} / {"op": "lock"}
+#
+# Failures answer {"ok": false, "error": "..."}.
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import struct
+import time
+from pathlib import Path
+
+from cryptography.exceptions import InvalidTag
+
+from core.agent_client import AgentError
+from core.vault import Vault
+
+from config import AUTO_LOCK_MINUTES, USAGE_FLUSH_SECONDS, AGENT_MAX_REQUEST_BYTES
+
+
+# ========================
+# Server
+# ========================
+
+class VaultAgent:
+    """
+    Serves one unlocked Vault until it locks: after idle_minutes
+    without a request (AUTO_LOCK_MINUTES by default), on a "lock"
+    request, or on SIGINT/SIGTERM. Locking flushes usage, wipes the
+    data key and removes the socket; a new agent needs the master
+    password again.
+
+    Every request is answered from memory on the event loop thread
+    (a get decrypts one secret), so one agent serves any number of
+    concurrent clients. Connections from other users are refused by
+    peer credentials where the platform has SO_PEERCRED, and by the
+    socket's private directory and 0600 mode everywhere.
+
+    Other processes may write to the vault meanwhile. Before each
+    request and each usage flush the agent checks the storage's
+    data_version: on a change it reloads the entries, and if the
+    account's salt or wrapped data key changed (master password
+    change or data key rotation) it locks without writing anything,
+    as its key may no longer match what is stored.
+    """
+
+    def __init__(self, vault: Vault, path, idle_minutes: float = AUTO_LOCK_MINUTES):
+        self.vault = vault
+        self.path = Path(path)
+        self.idle_seconds = idle_minutes * 60
+
+        self.requests = 0
+        self._data_version = None
+        self._account = None
+        self._last_request = time.monotonic()
+        self._locked: asyncio.Event | None = None
+        self._clients = {}
+
+        self.ops = {
+            "status": self.op_status,
+            "list": self.op_list,
+            "search": self.op_search,
+            "lookup": self.op_lookup,
+            "url": self.op_url,
+            "get": self.op_get,
+            "lock": self.op_lock,
+        }
+
+    def run(self):
+        """
+        Serve until locked (blocking).
+        """
+        asyncio.run(self.serve())
+
+    async def serve(self):
+        self._locked = asyncio.Event()
+        self._claim_path()
+
+        account = self.vault.storage.get_account()
+        self._account = (account.salt, account.wrapped_dek)
+        self._data_version = self.vault.storage.data_version
+        self._warm()
+
+        # No window in which the socket is reachable by others
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(
+                self._client,
+                path=str(self.path),
+                limit=AGENT_MAX_REQUEST_BYTES,
+            )
+        finally:
+            os.umask(umask)
+
+        loop = asyncio.get_running_loop()
+        for signum in _STOP_SIGNALS:
+            loop.add_signal_handler(signum, self.lock)
+
+        tasks = [
+            asyncio.create_task(self._auto_lock()),
+            asyncio.create_task(self._flush_usage()),
+        ]
+
+        try:
+            async with server:
+                await self._locked.wait()
+
+                # Hang up on connected clients and let their handlers
+                # finish, rather than have asyncio.run() cancel them
+                for writer in self._clients:
+                    writer.close()
+                await asyncio.gather(*self._clients.values(), return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for signum in _STOP_SIGNALS:
+                loop.remove_signal_handler(signum)
+
+            self.path.unlink(missing_ok=True)
+            self.vault.close()
+
+    def lock(self):
+        if self._locked is not None:
+            self._locked.set()
+
+    # ------------------------
+    # Requests
+    # ------------------------
+
+    def handle(self, line: bytes) -> dict:
+        if not self._sync():
+            return {"ok": False, "error": "The vault's key changed; the agent locked"}
+
+        try:
+            request = json.loads(line)
+            op = self.ops.get(request.get("op"))
+            if op is None:
+                raise AgentError(f"Unknown op: {request.get('op')!r}")
+
+            self.requests += 1
+            return {"ok": True, **op(request)}
+
+        except KeyError as e:
+            return {"ok": False, "error": f"Missing field: {e.args[0]}"}
+        except LookupError as e:
+            return {"ok": False, "error": str(e)}
+        except (AgentError, ValueError, TypeError, AttributeError) as e:
+            return {"ok": False, "error": str(e)}
+        except InvalidTag:
+            # Written under another key without an account change
+            # _sync() could see; nothing this agent holds is safe
+            self._stale_key()
+            return {"ok": False, "error": "Entry could not be decrypted; the agent locked"}
+
+    def op_status(self, request) -> dict:
+        idle = time.monotonic() - self._last_request
+        return {
+            "entries": len(self.vault.store),
+            "requests": self.requests,
+            "locks_in": max(0.0, self.idle_seconds - idle),
+        }
+
+    def op_list(self, request) -> dict:
+        limit = int(request.get("limit") or 0)
+        entries = self.vault.entries()[:limit or None]
+        return {"entries": [_row(meta) for _, meta in entries]}
+
+    def op_search(self, request) -> dict:
+        limit = int(request.get("limit") or 0)
+        ids = self.vault.search(str(request.get("query", "")))[:limit or None]
+        return {"entries": [_row(self.vault.meta(entry_id)) for entry_id in ids]}
+
+    def op_lookup(self, request) -> dict:
+        found = self.vault.lookup(str(request["site"]))
+        return {"entry": _row(found[1]) if found else None}
+
+    def op_url(self, request) -> dict:
+        limit = int(request.get("limit") or 0)
+        entries = self.vault.for_url(str(request["url"]))[:limit or None]
+        return {"entries": [_row(meta) for _, meta in entries]}
+
+    def op_get(self, request) -> dict:
+        entry_id, meta = self.vault.resolve(str(request["site"]))
+        secret = self.vault.secret(entry_id)
+        self.vault.touch(entry_id)
+
+        return {"entry": {**_row(meta), "password": secret.password, "notes": secret.notes}}
+
+    def op_lock(self, request) -> dict:
+        # After the reply has been written
+        asyncio.get_running_loop().call_soon(self.lock)
+        return {}
+
+    # ------------------------
+    # Internal
+    # ------------------------
+
+    async def _client(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if not _peer_is_owner(sock):
+            writer.close()
+            return
+
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while not self._locked.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+
+                self._last_request = time.monotonic()
+                writer.write(json.dumps(self.handle(line)).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        except (ConnectionError, ValueError):
+            # Client went away, or sent a line over the limit
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    async def _auto_lock(self):
+        while True:
+            remaining = self._last_request + self.idle_seconds - time.monotonic()
+            if remaining <= 0:
+                self.lock()
+                return
+            await asyncio.sleep(remaining)
+
+    async def _flush_usage(self):
+        while True:
+            await asyncio.sleep(USAGE_FLUSH_SECONDS)
+            if self._sync():
+                self.vault.usage.flush()
+
+    def _sync(self) -> bool:
+        """
+        Catch up with writes from other processes. False (and the
+        agent locks) if the key changed.
+        """
+        storage = self.vault.storage
+        version = storage.data_version
+        if version == self._data_version:
+            return True
+
+        account = storage.get_account()
+        if account is None or (account.salt, account.wrapped_dek) != self._account:
+            self._stale_key()
+            return False
+
+        self._data_version = version
+        self.vault.reload()
+        self._warm()
+        return True
+
+    def _stale_key(self):
+        # Usage encrypted with this key would be unreadable after a
+        # rotation: drop it rather than let close() write it
+        self.vault.usage.clear()
+        self.lock()
+
+    def _warm(self):
+        # Build the store, search index, name map and domain index
+        # before they are needed
+        self.vault.search("")
+        self.vault.lookup("")
+        self.vault.for_url("")
+
+    def _claim_path(self):
+        """
+        Take over the socket path, unless a live agent is on it.
+        """
+        if not self.path.exists():
+            return
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(str(self.path))
+        except OSError:
+            # Left behind by an agent that did not shut down cleanly
+            self.path.unlink()
+            return
+
+        raise AgentError(f"An agent is already serving this vault ({self.path})")
+
+
+# ========================
+# Internal
+# ========================
+
+_STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+def _row(meta) -> dict:
+    return {"site": meta.site, "username": meta.username, "domain": meta.domain}
+
+
+def _peer_is_owner(sock) -> bool:
+    """
+    Is the connected peer running as this user? Without SO_PEERCRED
+    (e.g. macOS) the directory and socket permissions are the check.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid == os.getuid()
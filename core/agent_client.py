@@ -0,0 +1,105 @@
+# core/agent_client.py
+#
+# Client side of the unlock agent (core/agent.py). Kept apart from the
+# server so callers that only ask the agent do not import asyncio or
+# the crypto stack.
+
+import hashlib
+import json
+import os
+import socket
+from pathlib import Path
+
+from storage.vault import VAULT_PATH
+
+
+class AgentError(Exception):
+    """
+    The agent answered with an error.
+    """
+
+
+def socket_path(vault_path) -> Path:
+    """
+    The agent socket for a vault file, in a directory only this user
+    can enter ($XDG_RUNTIME_DIR/vaultx, else ~/.vaultx/run).
+    """
+    digest = hashlib.sha256(str(Path(vault_path).resolve()).encode("utf-8")).hexdigest()
+    return _private_dir() / f"agent-{digest[:16]}.sock"
+
+
+class AgentClient:
+    """
+    Blocking client for short-lived callers (the CLI, the launcher).
+    request() raises OSError when no agent is running and AgentError
+    when the agent answers with an error.
+    """
+
+    def __init__(self, path, timeout: float = 5.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._file = None
+
+    @classmethod
+    def for_vault(cls, vault_path, timeout: float = 5.0) -> "AgentClient":
+        return cls(socket_path(vault_path), timeout)
+
+    def request(self, op: str, **args) -> dict:
+        if self._sock is None:
+            self._connect()
+
+        self._sock.sendall(json.dumps({"op": op, **args}).encode("utf-8") + b"\n")
+        line = self._file.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("Agent closed the connection")
+
+        response = json.loads(line)
+        if not response.pop("ok", False):
+            raise AgentError(response.get("error", "Agent error"))
+        return response
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        # Only talk to a socket this user owns
+        if self.path.stat().st_uid != os.getuid():
+            raise PermissionError(f"{self.path} is not owned by this user")
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.path))
+        except OSError:
+            sock.close()
+            raise
+
+        self._sock = sock
+        self._file = sock.makefile("rb")
+
+
+# ========================
+# Internal
+# ========================
+
+def _private_dir() -> Path:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    directory = Path(runtime) / "vaultx" if runtime else VAULT_PATH / "run"
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    info = directory.stat()
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be owned by this user with mode 0700")
+    return directory
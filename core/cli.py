@@ -0,0 +1,385 @@
+# core/cli.py
+#
+# Command-line access to the vault. Imports nothing from Qt, so a
+# lookup costs interpreter start + key derivation + decrypting the
+# entry list. With an agent running (vaultx agent), list, search, url,
+# get and copy are answered by it instead, without a password prompt.
+#
+#   python vaultx.py [--vault PATH] [--user NAME] COMMAND ...
+#
+# Commands: list, search QUERY, url URL, get SITE, copy SITE, add SITE,
+#           breach, rekey, agent, status, lock
+
+import argparse
+import getpass
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from core.agent_client import AgentClient, AgentError, socket_path
+from storage.engines import ENGINES, VaultInUse
+from storage.vault import VAULT_PATH, VaultStorage
+
+from config import STORAGE_ENGINE, AUTO_LOCK_MINUTES
+
+# Annotations only: importing the vault loads the crypto stack, which
+# an agent answer never needs
+if TYPE_CHECKING:
+    from core.vault import Vault
+
+
+class CliError(Exception):
+    pass
+
+
+# ========================
+# Commands: fn(vault, args)
+# ========================
+
+def cmd_list(vault: "Vault", args):
+    for _, meta in vault.entries()[:args.limit or None]:
+        print(f"{meta.site}\t{meta.username}")
+
+
+def cmd_search(vault: "Vault", args):
+    for entry_id in vault.search(args.query)[:args.limit or None]:
+        meta = vault.meta(entry_id)
+        print(f"{meta.site}\t{meta.username}")
+
+
+def cmd_url(vault: "Vault", args):
+    for _, meta in vault.for_url(args.url)[:args.limit or None]:
+        print(f"{meta.site}\t{meta.username}")
+
+
+def cmd_get(vault: "Vault", args):
+    entry_id, meta = _resolve(vault, args.site)
+    secret = vault.secret(entry_id)
+    vault.touch(entry_id)
+
+    _print_entry(meta.site, meta.username, meta.domain, secret.password, secret.notes, args.show)
+
+
+def cmd_copy(vault: "Vault", args):
+    entry_id, _ = _resolve(vault, args.site)
+    secret = vault.secret(entry_id)
+    vault.touch(entry_id)
+
+    _write_password(secret.password)
+
+
+def cmd_add(vault: "Vault", args):
+    from models.entry import VaultEntry
+    from utils.password_gen import generate_password
+
+    if vault.find(args.site) is not None and not args.replace:
+        raise CliError(f"{args.site} already exists (use --replace)")
+
+    if args.generate:
+        password = generate_password(length=args.generate)
+    else:
+        password = getpass.getpass(f"Password for {args.site}: ")
+        if password != getpass.getpass("Confirm: "):
+            raise CliError("Passwords do not match")
+        if not password:
+            raise CliError("Password required")
+
+    vault.save(VaultEntry(
+        site=args.site,
+        username=args.entry_username,
+        password=password,
+        notes=args.notes,
+    ))
+    print(f"Saved {args.site}", file=sys.stderr)
+
+
+def cmd_breach(vault: "Vault", args):
+    from utils.breach import DEFAULT_PATH, BreachCorpus
+
+    path = Path(args.corpus) if args.corpus else DEFAULT_PATH
+    try:
+        corpus = BreachCorpus(path)
+    except FileNotFoundError:
+        raise CliError(
+            f"No breach corpus at {path}; convert a Pwned Passwords "
+            "dump with: python -m utils.breach --convert FILE"
+        ) from None
+    except ValueError as e:
+        raise CliError(str(e)) from None
+
+    with corpus:
+        found = vault.breached(corpus)
+        hashes = len(corpus)
+
+    for _, meta, count in found:
+        print(f"{meta.site}\t{meta.username}\t{count}")
+    print(
+        f"{len(found)} of {len(vault.store)} passwords appear in {hashes:,} breached hashes",
+        file=sys.stderr,
+    )
+
+
+def cmd_rekey(vault: "Vault", args):
+    new = getpass.getpass("New master password: ")
+    if new != getpass.getpass("Confirm new master password: "):
+        raise CliError("Passwords do not match")
+
+    def progress(done, total):
+        print(f"\rRe-encrypting {done}/{total}", end="", file=sys.stderr, flush=True)
+
+    vault.change_master_password(args.username, args.master_password, new, args.rotate, progress)
+    if args.rotate:
+        print(file=sys.stderr)
+    print("Master password changed.", file=sys.stderr)
+
+
+def cmd_agent(vault: "Vault", args):
+    if not _agent_supported():
+        raise CliError("The agent needs Unix-domain sockets")
+
+    from core.agent import VaultAgent
+
+    agent = VaultAgent(vault, socket_path(args.vault_path), args.idle)
+    print(
+        f"Agent serving {agent.path}; locks after {args.idle:g} idle minutes "
+        "(Ctrl+C or vaultx lock to stop)",
+        file=sys.stderr,
+    )
+    try:
+        agent.run()
+    except AgentError as e:
+        raise CliError(str(e)) from None
+
+
+# ========================
+# Commands answered by an agent: fn(client, args)
+# ========================
+
+def agent_list(client: AgentClient, args):
+    for row in client.request("list", limit=args.limit)["entries"]:
+        print(f"{row['site']}\t{row['username']}")
+
+
+def agent_search(client: AgentClient, args):
+    for row in client.request("search", query=args.query, limit=args.limit)["entries"]:
+        print(f"{row['site']}\t{row['username']}")
+
+
+def agent_url(client: AgentClient, args):
+    for row in client.request("url", url=args.url, limit=args.limit)["entries"]:
+        print(f"{row['site']}\t{row['username']}")
+
+
+def agent_get(client: AgentClient, args):
+    row = client.request("get", site=args.site)["entry"]
+    _print_entry(row["site"], row["username"], row["domain"], row["password"], row["notes"], args.show)
+
+
+def agent_copy(client: AgentClient, args):
+    _write_password(client.request("get", site=args.site)["entry"]["password"])
+
+
+def agent_status(client: AgentClient, args):
+    status = client.request("status")
+    print(
+        f"Unlocked: {status['entries']} entries, {status['requests']} requests, "
+        f"locks in {status['locks_in'] / 60:.1f} min"
+    )
+
+
+def agent_lock(client: AgentClient, args):
+    client.request("lock")
+    print("Agent locked.", file=sys.stderr)
+
+
+# ========================
+# Entry point
+# ========================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="vaultx", description="VaultX command line")
+    parser.add_argument("--vault", type=str, help="vault file (default: the app's)")
+    parser.add_argument("--engine", choices=ENGINES, default=STORAGE_ENGINE)
+    parser.add_argument(
+        "--user",
+        dest="username",
+        default=os.environ.get("VAULTX_USER"),
+        help="vault username (default: $VAULTX_USER, else prompt)",
+    )
+    parser.add_argument("--timings", action="store_true", help="print phase timings to stderr")
+    parser.add_argument("--no-agent", action="store_true", help="unlock here even if an agent runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("list", help="all entries, most recently used first")
+    cmd.add_argument("--limit", type=int, default=0)
+    cmd.set_defaults(fn=cmd_list, agent_fn=agent_list)
+
+    cmd = commands.add_parser("search", help="ranked search over site, username, domain")
+    cmd.add_argument("query")
+    cmd.add_argument("--limit", type=int, default=20)
+    cmd.set_defaults(fn=cmd_search, agent_fn=agent_search)
+
+    cmd = commands.add_parser("url", help="entries for a URL's site, best match first")
+    cmd.add_argument("url")
+    cmd.add_argument("--limit", type=int, default=0)
+    cmd.set_defaults(fn=cmd_url, agent_fn=agent_url)
+
+    cmd = commands.add_parser("get", help="show an entry")
+    cmd.add_argument("site")
+    cmd.add_argument("--show", action="store_true", help="print the password too")
+    cmd.set_defaults(fn=cmd_get, agent_fn=agent_get)
+
+    cmd = commands.add_parser("copy", help="write an entry's password to stdout")
+    cmd.add_argument("site")
+    cmd.set_defaults(fn=cmd_copy, agent_fn=agent_copy)
+
+    cmd = commands.add_parser("add", help="add an entry")
+    cmd.add_argument("site")
+    cmd.add_argument("--username", dest="entry_username", default="")
+    cmd.add_argument("--notes", default="")
+    cmd.add_argument("--generate", type=int, nargs="?", const=20, default=0, metavar="LENGTH")
+    cmd.add_argument("--replace", action="store_true", help="overwrite an existing site")
+    cmd.set_defaults(fn=cmd_add)
+
+    cmd = commands.add_parser("breach", help="entries whose password appears in a breach corpus")
+    cmd.add_argument("--corpus", type=str, default=None, help="converted corpus (default: ~/.vaultx/breached-passwords.bin)")
+    cmd.set_defaults(fn=cmd_breach)
+
+    cmd = commands.add_parser("rekey", help="change the master password")
+    cmd.add_argument("--rotate", action="store_true", help="also re-encrypt with a new data key")
+    cmd.set_defaults(fn=cmd_rekey)
+
+    cmd = commands.add_parser("agent", help="unlock once and serve lookups until idle")
+    cmd.add_argument("--idle", type=float, default=AUTO_LOCK_MINUTES, metavar="MINUTES")
+    cmd.set_defaults(fn=cmd_agent)
+
+    cmd = commands.add_parser("status", help="show the running agent")
+    cmd.set_defaults(fn=None, agent_fn=agent_status)
+
+    cmd = commands.add_parser("lock", help="lock the running agent")
+    cmd.set_defaults(fn=None, agent_fn=agent_lock)
+
+    return parser
+
+
+def main(argv=None, started: float | None = None) -> int:
+    started = time.perf_counter() if started is None else started
+    args = build_parser().parse_args(argv)
+    args.vault_path = Path(args.vault) if args.vault else VAULT_PATH / f"vault{ENGINES[args.engine].SUFFIX}"
+
+    agent_fn = getattr(args, "agent_fn", None)
+    if agent_fn and not args.no_agent and _agent_supported():
+        code = _via_agent(agent_fn, args, started)
+        if code is not None:
+            return code
+
+    if args.fn is None:
+        print("vaultx: No agent is running for this vault", file=sys.stderr)
+        return 1
+
+    # Only now: the crypto stack is most of the import time, and an
+    # agent answer needs none of it
+    from core.account import InvalidLogin
+    from core.vault import Vault
+
+    try:
+        storage = VaultStorage(args.vault_path, args.engine)
+    except VaultInUse as e:
+        print(f"vaultx: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        if not storage.has_account():
+            raise CliError(f"No account in {storage.path}; create one in the app first")
+
+        # Time spent at the prompts is not counted
+        phases = {"startup_ms": (time.perf_counter() - started) * 1000}
+
+        args.username = (args.username or input("Username: ")).strip()
+        args.master_password = getpass.getpass("Master password: ")
+
+        mark = time.perf_counter()
+        vault = Vault.unlock(storage, args.username, args.master_password)
+        phases["unlock_ms"] = (time.perf_counter() - mark) * 1000
+
+        mark = time.perf_counter()
+        try:
+            args.fn(vault, args)
+        finally:
+            vault.close()
+        phases["command_ms"] = (time.perf_counter() - mark) * 1000
+
+        if args.timings:
+            phases["total_without_unlock_ms"] = phases["startup_ms"] + phases["command_ms"]
+            print(
+                " ".join(f"{name}={value:.1f}" for name, value in phases.items()),
+                file=sys.stderr,
+            )
+        return 0
+
+    except InvalidLogin as e:
+        print(f"vaultx: {e}", file=sys.stderr)
+        return 2
+    except CliError as e:
+        print(f"vaultx: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        storage.close()
+
+
+# ========================
+# Internal
+# ========================
+
+def _agent_supported() -> bool:
+    # Unix-domain sockets and owner checks (not on Windows)
+    return hasattr(os, "getuid") and hasattr(socket, "AF_UNIX")
+
+
+def _via_agent(agent_fn, args, started: float) -> int | None:
+    """
+    Run the command through the vault's agent. None when no agent is
+    reachable, so the caller unlocks the vault itself.
+    """
+    try:
+        client = AgentClient.for_vault(args.vault_path)
+        mark = time.perf_counter()
+        with client:
+            agent_fn(client, args)
+    except AgentError as e:
+        print(f"vaultx: {e}", file=sys.stderr)
+        return 1
+    except OSError:
+        return None
+
+    if args.timings:
+        startup_ms = (mark - started) * 1000
+        agent_ms = (time.perf_counter() - mark) * 1000
+        print(f"startup_ms={startup_ms:.1f} agent_ms={agent_ms:.1f}", file=sys.stderr)
+    return 0
+
+
+def _print_entry(site, username, domain, password, notes, show: bool):
+    print(f"site:     {site}")
+    print(f"username: {username}")
+    print(f"domain:   {domain}")
+    print(f"password: {password if show else '********'}")
+    if notes:
+        print(f"notes:    {notes}")
+
+
+def _write_password(password: str):
+    # No trailing newline when piped (e.g. into a clipboard tool)
+    sys.stdout.write(password + ("\n" if sys.stdout.isatty() else ""))
+
+
+def _resolve(vault: "Vault", site: str) -> tuple:
+    try:
+        return vault.resolve(site)
+    except LookupError as e:
+        raise CliError(str(e)) from None
@@ -0,0 +1,137 @@
+# core/entries.py
+
+import hashlib
+
+from models.entry import EntryMeta, EntrySecret, EntryUsage, VaultEntry
+from storage.loader import load_entries
+
+from config import DECRYPT_CHUNK_SIZE
+
+
+def load_metas(storage, session, usage: dict | None = None) -> list[tuple[int, EntryMeta]]:
+    """
+    Decrypt every entry's metadata, with last_used taken from the
+    usage records (loaded here unless passed in). Returns
+    (entry_id, EntryMeta) pairs and leaves secrets encrypted.
+    """
+    metas = load_entries(storage.get_all_meta(), session)
+    if usage is None:
+        usage = load_usage(storage, session)
+
+    for entry_id, meta in metas:
+        if entry_id in usage:
+            meta.last_used = usage[entry_id].last_used
+
+    return metas
+
+
+def load_usage(storage, session) -> dict[int, EntryUsage]:
+    return dict(
+        load_entries(
+            storage.get_all_usage(),
+            session,
+            record_type=EntryUsage,
+        )
+    )
+
+
+def names_domain(name: str, domain: str) -> bool:
+    """
+    Is `name` the domain's leading label(s), e.g. "github" for
+    www.github.com?
+    """
+    domain = domain.removeprefix("www.")
+    return domain == name or domain.startswith(name + ".")
+
+
+def domain_names(domain: str) -> list[str]:
+    """
+    Every name for which names_domain(name, domain) holds.
+    """
+    labels = domain.removeprefix("www.").split(".")
+    return [".".join(labels[:end]) for end in range(1, len(labels) + 1)]
+
+
+def find_entry(storage, session, site: str) -> tuple[int, EntryMeta] | None:
+    """
+    First entry (in id order) whose site matches case-insensitively,
+    else the only entry whose domain the name picks out (see
+    names_domain()). Metadata is decrypted a chunk at a time and only
+    the site and domain fields are read, so the vault is never fully
+    decoded.
+    """
+    site = site.lower()
+    rows = storage.get_all_meta()
+    named = []
+
+    for start in range(0, len(rows), DECRYPT_CHUNK_SIZE):
+        chunk = rows[start:start + DECRYPT_CHUNK_SIZE]
+        for (entry_id, _), data in zip(chunk, session.decrypt_many(blob for _, blob in chunk)):
+            if EntryMeta.site_of(data).lower() == site:
+                return entry_id, EntryMeta.deserialize(data)
+            if len(named) < 2 and names_domain(site, EntryMeta.domain_of(data)):
+                named.append((entry_id, data))
+
+    if len(named) == 1:
+        entry_id, data = named[0]
+        return entry_id, EntryMeta.deserialize(data)
+    return None
+
+
+def read_secret(storage, session, entry_id: int) -> EntrySecret | None:
+    blob = storage.get_secret(entry_id)
+    if blob is None:
+        return None
+
+    return EntrySecret.deserialize(session.decrypt(blob))
+
+
+class _Password:
+    # load_entries() record type: the password alone, notes untouched
+    deserialize = staticmethod(EntrySecret.password_of)
+
+
+def load_passwords(storage, session) -> list[tuple[int, str]]:
+    """
+    (entry_id, password) for every entry, read from the entries table
+    in one pass and decrypted in parallel chunks.
+    """
+    rows = [(entry_id, secret) for entry_id, _, secret in storage.get_all_entries()]
+    return load_entries(rows, session, record_type=_Password)
+
+
+def password_digests(storage, session) -> dict[int, bytes]:
+    """
+    SHA-1 of every entry's password (see load_passwords()).
+    """
+    return {
+        entry_id: hashlib.sha1(password.encode("utf-8")).digest()
+        for entry_id, password in load_passwords(storage, session)
+    }
+
+
+def save_entry(
+    storage,
+    session,
+    entry: VaultEntry,
+    entry_id: int | None = None,
+    last_used: float | None = None,
+) -> tuple[int, EntryMeta, EntrySecret]:
+    """
+    Encrypt and store an entry: a new one, or entry_id's replacement.
+    last_used keeps an edited entry's place in the recency order.
+    Returns (entry_id, meta, secret).
+    """
+    meta, secret = entry.split()
+    if last_used is not None:
+        meta.last_used = last_used
+
+    meta_blob = session.encrypt(meta.serialize())
+    secret_blob = session.encrypt(secret.serialize())
+
+    if entry_id is not None:
+        storage.update_entry(entry_id, meta_blob, secret_blob)
+    else:
+        entry_id = storage.add_entry(meta_blob, secret_blob)
+
+    return entry_id, meta, secret
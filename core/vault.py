@@ -0,0 +1,307 @@
+# core/vault.py
+
+from core.account import (
+    InvalidLogin,
+    check_password,
+    unlock_params,
+    open_vault,
+    change_password,
+    rotation_params,
+    resumes,
+    start_rotation,
+)
+from core.entries import (
+    domain_names,
+    find_entry,
+    load_metas,
+    password_digests,
+    read_secret,
+    save_entry,
+)
+from crypto.cipher import CipherSession
+from crypto.kdf import derive_key, generate_salt
+from models.entry import EntryMeta, EntrySecret, VaultEntry
+from models.search import SearchIndex
+from models.store import EntryStore
+from storage.usage import UsageTracker
+
+
+class Vault:
+    """
+    An unlocked vault without any UI: lookups, edits and master
+    password changes for scripts and the command line.
+
+    Entry metadata is decrypted on first use and kept in an
+    EntryStore, except for lookup(), which scans for one site and
+    stops at the match. Secrets are decrypted per call. Usage is
+    recorded for looked-up entries and written on close().
+    """
+
+    def __init__(self, storage, session: CipherSession):
+        self.storage = storage
+        self.session = session
+        self.usage = UsageTracker(storage, lambda: self.session)
+
+        self._store: EntryStore | None = None
+        self._index: SearchIndex | None = None
+        self._names: dict[str, list[int]] | None = None
+        self._usage_loaded = False
+
+    @classmethod
+    def unlock(cls, storage, username: str, password: str) -> "Vault":
+        """
+        Derive the login key (the slow part) and open the vault.
+        Raises InvalidLogin; a vault without an account is an error
+        here, accounts are created by the app.
+        """
+        account, salt, params = unlock_params(storage)
+        if account is None:
+            raise InvalidLogin("Vault has no account yet")
+
+        key = derive_key(password, salt, params)
+        return cls(storage, CipherSession(open_vault(storage, username, key, account, salt)))
+
+    def close(self):
+        """
+        Persist usage and wipe the data key.
+        """
+        if self.session:
+            self.usage.flush()
+            self.session.wipe()
+        self.session = None
+        self._store = None
+        self._index = None
+        self._names = None
+
+    def reload(self):
+        """
+        Forget everything read from storage, after another process
+        changed it; it is read again on next use. Buffered usage is
+        written first.
+        """
+        self.usage.flush()
+        self._store = None
+        self._index = None
+        self._names = None
+        self._usage_loaded = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ========================
+    # Lookups
+    # ========================
+
+    @property
+    def store(self) -> EntryStore:
+        if self._store is None:
+            self._store = EntryStore()
+            self._store.load(load_metas(self.storage, self.session, self._load_usage()))
+        return self._store
+
+    def entries(self) -> list[tuple[int, EntryMeta]]:
+        """
+        (entry_id, EntryMeta), most recently used first.
+        """
+        return list(self.store)
+
+    def find(self, site: str) -> int | None:
+        """
+        Entry id for an exact site name (case-insensitive).
+        """
+        return self.store.id_for_site(site)
+
+    def lookup(self, site: str) -> tuple[int, EntryMeta] | None:
+        """
+        (entry_id, meta) for an exact site name, else for the only
+        entry whose domain the name picks out ("github"). Scans
+        without loading the store when it is not loaded yet.
+        """
+        if self._store is None:
+            return find_entry(self.storage, self.session, site)
+
+        entry_id = self._store.id_for_site(site)
+        if entry_id is not None:
+            return entry_id, self._store.get(entry_id)
+
+        named = self._named(site.lower())
+        return (named[0], self._store.get(named[0])) if len(named) == 1 else None
+
+    def for_url(self, url: str) -> list[tuple[int, EntryMeta]]:
+        """
+        (entry_id, meta) for every entry of the URL's registrable
+        domain: same host first, then parent hosts, then the rest,
+        each most recently used first.
+        """
+        return [(entry_id, self.store.get(entry_id)) for entry_id in self.store.ids_for_url(url)]
+
+    def resolve(self, site: str) -> tuple[int, EntryMeta]:
+        """
+        lookup(), else the only search hit. Raises LookupError
+        (naming up to five candidates when there are several).
+        """
+        found = self.lookup(site)
+        if found is not None:
+            return found
+
+        hits = self.search(site)
+        if len(hits) == 1:
+            return hits[0], self.meta(hits[0])
+        if not hits:
+            raise LookupError(f"No entry for {site}")
+
+        candidates = ", ".join(self.meta(entry_id).site for entry_id in hits[:5])
+        raise LookupError(f"No single match for {site}; candidates: {candidates}")
+
+    def search(self, query: str) -> list[int]:
+        """
+        Entry ids ranked the way the vault list ranks them.
+        """
+        if self._index is None:
+            self._index = SearchIndex()
+            self._index.build(
+                (entry_id, meta, self._use_count(entry_id))
+                for entry_id, meta in self.store
+            )
+
+        ids = self._index.search(query)
+        return [entry_id for entry_id, _ in self.store] if ids is None else ids
+
+    def meta(self, entry_id: int) -> EntryMeta | None:
+        return self.store.get(entry_id)
+
+    def secret(self, entry_id: int) -> EntrySecret | None:
+        return read_secret(self.storage, self.session, entry_id)
+
+    def touch(self, entry_id: int):
+        """
+        Count a use of the entry (written on close()).
+        """
+        # Recording on top of an unloaded count would reset it
+        if not self._usage_loaded:
+            self.usage.load_one(entry_id)
+
+        usage = self.usage.record(entry_id)
+        if self._store is not None:
+            self._store.touch(entry_id, usage.last_used)
+        if self._index is not None:
+            self._index.touch(entry_id, usage.last_used, usage.use_count)
+
+    def breached(self, corpus) -> list[tuple[int, EntryMeta, int]]:
+        """
+        (entry_id, meta, times seen) for every entry whose password
+        is in the breach corpus (a utils.breach.BreachCorpus), most
+        seen first. All entries are checked in one sorted batch.
+        """
+        digests = password_digests(self.storage, self.session)
+        counts = corpus.counts(digests.values())
+
+        found = [
+            (entry_id, self.store.get(entry_id), counts[sha1])
+            for entry_id, sha1 in digests.items()
+            if sha1 in counts
+        ]
+        found.sort(key=lambda row: -row[2])
+        return found
+
+    # ========================
+    # Edits
+    # ========================
+
+    def save(self, entry: VaultEntry) -> int:
+        """
+        Add the entry, or replace the one with the same site.
+        Returns its id.
+        """
+        entry_id = self.find(entry.site)
+        last_used = self.store.get(entry_id).last_used if entry_id is not None else None
+
+        entry_id, meta, _ = save_entry(self.storage, self.session, entry, entry_id, last_used)
+
+        self.store.put(entry_id, meta)
+        self._names = None
+        if self._index is not None:
+            self._index.add(entry_id, meta, self._use_count(entry_id))
+        return entry_id
+
+    def delete(self, entry_id: int):
+        self.storage.delete_entry(entry_id)
+        self.usage.forget(entry_id)
+        self._names = None
+        if self._store is not None:
+            self._store.remove(entry_id)
+        if self._index is not None:
+            self._index.remove(entry_id)
+
+    # ========================
+    # Master password
+    # ========================
+
+    def change_master_password(
+        self,
+        username: str,
+        current: str,
+        new: str,
+        rotate: bool = False,
+        progress=None,
+    ):
+        """
+        Blocking master password change. With rotate, every entry is
+        re-encrypted under a new data key (resuming a paused rotation
+        started with the same new password); progress(done, total)
+        is called per batch. Raises InvalidLogin.
+        """
+        account = self.storage.get_account()
+        journal, new_salt, new_params = rotation_params(self.storage, account, rotate)
+
+        old_key = derive_key(current, account.salt, account.kdf_params)
+        if not check_password(account, old_key):
+            raise InvalidLogin("Current password is incorrect")
+
+        new_key = derive_key(new, new_salt, new_params)
+
+        if not rotate:
+            change_password(self.storage, account, username, new_salt, old_key, new_key)
+            return
+
+        if journal and not resumes(journal, username, new_key):
+            # Different new password: start over under a fresh salt
+            self.storage.abort_rekey()
+            journal, new_salt = None, generate_salt()
+            new_key = derive_key(new, new_salt, account.kdf_params)
+
+        self.usage.flush()
+        engine, new_session = start_rotation(
+            self.storage, account, username, new_salt, journal, new_key, self.session
+        )
+        engine.run(progress)
+
+        self.session.wipe()
+        self.session = new_session
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _load_usage(self) -> dict:
+        if not self._usage_loaded:
+            self.usage.load()
+            self._usage_loaded = True
+        return self.usage.usage
+
+    def _named(self, name: str) -> list[int]:
+        # name -> ids, built on first use (see domain_names())
+        if self._names is None:
+            self._names = {}
+            for entry_id, meta in self.store:
+                for each in domain_names(meta.domain):
+                    self._names.setdefault(each, []).append(entry_id)
+
+        return self._names.get(name, [])
+
+    def _use_count(self, entry_id: int) -> int:
+        usage = self.usage.get(entry_id)
+        return usage.use_count if usage else 0
@@ -3,14 +3,96 @@
 import os
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+from utils.trace import traced, trace_methods
+
+NONCE_SIZE = 12
+KEY_SIZE = 32
+
+# Associated data binding wrapped keys to their purpose
+_WRAP_AAD = b"vaultx-dek"
+
+
+@traced("cipher.encrypt")
 def encrypt(key: bytes, plaintext: bytes) -> bytes:
-    nonce = os.urandom(12)
+    nonce = os.urandom(NONCE_SIZE)
     aes = AESGCM(key)
     ciphertext = aes.encrypt(nonce, plaintext, None)
     return nonce + ciphertext
 
+@traced("cipher.decrypt")
 def decrypt(key: bytes, blob: bytes) -> bytes:
-    nonce = blob[:12]
-    ciphertext = blob[12:]
+    view = memoryview(blob)
     aes = AESGCM(key)
-    return aes.decrypt(nonce, ciphertext, None)
+    return aes.decrypt(view[:NONCE_SIZE], view[NONCE_SIZE:], None)
+
+
+# ========================
+# Envelope keys
+# ========================
+
+def generate_key() -> bytes:
+    return os.urandom(KEY_SIZE)
+
+@traced("cipher.wrap_key")
+def wrap_key(kek: bytes, dek: bytes) -> bytes:
+    nonce = os.urandom(NONCE_SIZE)
+    return nonce + AESGCM(kek).encrypt(nonce, dek, _WRAP_AAD)
+
+@traced("cipher.unwrap_key")
+def unwrap_key(kek: bytes, wrapped: bytes) -> bytes:
+    view = memoryview(wrapped)
+    return AESGCM(kek).decrypt(view[:NONCE_SIZE], view[NONCE_SIZE:], _WRAP_AAD)
+
+
+@trace_methods("cipher.session")
+class CipherSession:
+    """
+    AES-GCM context for one unlocked vault.
+
+    Created once per unlock so the AEAD object is not rebuilt for
+    every entry. Blobs are read through memoryview slices, so the
+    nonce/ciphertext split does not copy. wipe() zeroes the key copy
+    held here and drops the context; the session is unusable after.
+    """
+
+    def __init__(self, key: bytes):
+        self._key = bytearray(key)
+        self._aes = AESGCM(bytes(self._key))
+
+    @property
+    def active(self) -> bool:
+        return self._aes is not None
+
+    def encrypt(self, plaintext: bytes) -> bytes:
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + self._context().encrypt(nonce, plaintext, None)
+
+    def decrypt(self, blob: bytes) -> bytes:
+        view = memoryview(blob)
+        return self._context().decrypt(view[:NONCE_SIZE], view[NONCE_SIZE:], None)
+
+    def encrypt_many(self, plaintexts) -> list[bytes]:
+        aes = self._context()
+        out = []
+        for plaintext in plaintexts:
+            nonce = os.urandom(NONCE_SIZE)
+            out.append(nonce + aes.encrypt(nonce, plaintext, None))
+        return out
+
+    def decrypt_many(self, blobs) -> list[bytes]:
+        aes = self._context()
+        out = []
+        for blob in blobs:
+            view = memoryview(blob)
+            out.append(aes.decrypt(view[:NONCE_SIZE], view[NONCE_SIZE:], None))
+        return out
+
+    def wipe(self):
+        for i in range(len(self._key)):
+            self._key[i] = 0
+        self._aes = None
+
+    def _context(self) -> AESGCM:
+        if self._aes is None:
+            raise RuntimeError("Cipher session has been wiped")
+        return self._aes
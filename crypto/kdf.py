@@ -1,18 +1,125 @@
 # cipher/dkf.py
 
 import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
 from argon2.low_level import hash_secret_raw, Type
 
+from utils.trace import traced
+
+from config import (
+    KDF_TARGET_MS,
+    KDF_MAX_MEMORY_MB,
+    KDF_MAX_PARALLELISM,
+    KDF_RETUNE_TOLERANCE,
+)
+
+
+@dataclass(frozen=True)
+class KdfParams:
+    """
+    Argon2id cost parameters. Stored per account next to the salt as
+    "argon2id$t=3$m=65536$p=2".
+    """
+
+    time_cost: int = 3
+    memory_cost: int = 64 * 1024  # KiB
+    parallelism: int = 2
+
+    def encode(self) -> str:
+        return (
+            f"argon2id$t={self.time_cost}"
+            f"$m={self.memory_cost}$p={self.parallelism}"
+        )
+
+    @staticmethod
+    def decode(text: str | None) -> "KdfParams":
+        # Vaults created before per-account parameters used the defaults
+        if not text:
+            return DEFAULT_PARAMS
+
+        name, *fields = text.split("$")
+        if name != "argon2id":
+            raise ValueError(f"Unsupported KDF: {name}")
+
+        values = dict(field.split("=", 1) for field in fields)
+        return KdfParams(
+            time_cost=int(values["t"]),
+            memory_cost=int(values["m"]),
+            parallelism=int(values["p"]),
+        )
+
+
+DEFAULT_PARAMS = KdfParams()
+
+# Calibration never goes below the original hard-coded cost
+MIN_TIME_COST = DEFAULT_PARAMS.time_cost
+MIN_MEMORY_COST = DEFAULT_PARAMS.memory_cost
+
+
 def generate_salt() -> bytes:
     return os.urandom(16)
 
-def derive_key(password: str, salt: bytes) -> bytes:
+@traced("kdf.derive_key")
+def derive_key(password: str, salt: bytes, params: KdfParams = DEFAULT_PARAMS) -> bytes:
     return hash_secret_raw(
         secret=password.encode("utf-8"),
         salt=salt,
-        time_cost=3,
-        memory_cost=64 * 1024,
-        parallelism=2,
+        time_cost=params.time_cost,
+        memory_cost=params.memory_cost,
+        parallelism=params.parallelism,
         hash_len=32,
         type=Type.ID,
     )
+
+
+# ========================
+# Host calibration
+# ========================
+
+def _measure_ms(params: KdfParams) -> float:
+    start = time.perf_counter()
+    derive_key("vaultx-calibration", b"\0" * 16, params)
+    return (time.perf_counter() - start) * 1000
+
+
+@lru_cache(maxsize=None)
+def calibrate(target_ms: int = KDF_TARGET_MS) -> KdfParams:
+    """
+    Pick Argon2id parameters that take roughly target_ms on this host.
+
+    Parallelism uses every core. Memory doubles (from the 64 MiB floor)
+    while a single pass stays under a third of the budget; time_cost
+    then fills the rest. Cached per process: a few derivations are
+    needed to measure.
+    """
+    parallelism = max(1, min(os.cpu_count() or 1, KDF_MAX_PARALLELISM))
+    max_memory = KDF_MAX_MEMORY_MB * 1024
+
+    memory = MIN_MEMORY_COST
+    single_pass = _measure_ms(KdfParams(1, memory, parallelism))
+
+    while memory * 2 <= max_memory and single_pass * 2 < target_ms / 3:
+        memory *= 2
+        single_pass = _measure_ms(KdfParams(1, memory, parallelism))
+
+    time_cost = max(MIN_TIME_COST, int(target_ms / max(single_pass, 1e-3)))
+    return KdfParams(time_cost, memory, parallelism)
+
+
+def needs_retune(current: KdfParams, target: KdfParams) -> bool:
+    """
+    Compare total cost (time_cost x memory_cost) within
+    KDF_RETUNE_TOLERANCE: calibration timings are noisy, and a vault
+    should not be re-wrapped on every login because time_cost moved a
+    few steps or memory doubled at the margin.
+    """
+    if current.parallelism != target.parallelism:
+        return True
+
+    current_cost = current.time_cost * current.memory_cost
+    target_cost = target.time_cost * target.memory_cost
+    ratio = max(current_cost, target_cost) / min(current_cost, target_cost)
+    return ratio > 1 + KDF_RETUNE_TOLERANCE
@@ -1,20 +1,47 @@
 # main.py
 
-import sys
-import ctypes
+import time
+
+_STARTED = time.perf_counter()
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon, QFont
+import sys
 
-from ui.app import PasswordManagerApp
-from utils.resources import resource_path
+from utils.startup import StartupProfile
 
 
 def main():
+    # --profile-startup: time imports before anything heavy is loaded,
+    # report once the login window has painted and deferred startup
+    # has run, then exit
+    profile = None
+    if "--profile-startup" in sys.argv:
+        sys.argv.remove("--profile-startup")
+        profile = StartupProfile(_STARTED)
+        profile.install()
+
+    # Needed for the optional process-pool decrypt in frozen builds
+    # (multiprocessing is slow to import, so only there)
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+
     # REQUIRED for Windows taskbar icon grouping
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
-        "VaultX.PasswordManager"
-    )
+    if sys.platform == "win32":
+        import ctypes
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
+            "VaultX.PasswordManager"
+        )
+
+    # Imported here so the profile sees them; the vault UI, crypto
+    # backends and hotkey listener load after first paint
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QIcon, QFont
+
+    from ui.app import PasswordManagerApp
+    from utils.resources import resource_path
+
+    if profile:
+        profile.mark("imports done")
 
     app = QApplication(sys.argv)
 
@@ -32,10 +59,13 @@ def main():
     except FileNotFoundError:
         pass
 
-    window = PasswordManagerApp()
+    window = PasswordManagerApp(profile)
     window.setWindowIcon(app_icon)
     window.show()
 
+    if profile:
+        profile.mark("window shown")
+
     sys.exit(app.exec())
 
 
@@ -0,0 +1,105 @@
+# models/codec.py
+
+import json
+import struct
+import zlib
+from dataclasses import fields
+
+# First byte of every binary record. JSON records start with "{".
+FORMAT_V1 = 0x01
+_JSON_START = ord("{")
+
+# Compressible text fields are deflated from this size up, and only
+# kept compressed when that saves at least an eighth
+_COMPRESS_MIN_BYTES = 256
+
+
+class RecordCodec:
+    """
+    Versioned binary layout for one record type:
+
+        B    format (FORMAT_V1)
+        B    flags (bit i: text field i is zlib-compressed)
+        ...  numeric fields, fixed width (struct codes)
+        nI   byte length of each text field
+        ...  text fields, UTF-8, back to back
+
+    decode() still accepts the JSON objects written by older versions.
+    """
+
+    def __init__(self, cls, numbers=(), texts=(), compress=()):
+        self.cls = cls
+        self.numbers = tuple(name for name, _ in numbers)
+        self.texts = tuple(texts)
+        self.compress = tuple(i for i, name in enumerate(self.texts) if name in compress)
+
+        codes = "".join(code for _, code in numbers)
+        self._header = struct.Struct(f"<BB{codes}{len(self.texts)}I")
+
+        # Positions of cls's constructor arguments in numbers + texts
+        stored = self.numbers + self.texts
+        self._order = [stored.index(f.name) for f in fields(cls) if f.init]
+
+    def encode(self, record) -> bytes:
+        texts = [getattr(record, name).encode("utf-8") for name in self.texts]
+
+        flags = 0
+        for i in self.compress:
+            raw = texts[i]
+            if len(raw) >= _COMPRESS_MIN_BYTES:
+                packed = zlib.compress(raw)
+                if len(packed) <= len(raw) - len(raw) // 8:
+                    texts[i] = packed
+                    flags |= 1 << i
+
+        header = self._header.pack(
+            FORMAT_V1,
+            flags,
+            *(getattr(record, name) for name in self.numbers),
+            *map(len, texts),
+        )
+        return header + b"".join(texts)
+
+    def decode(self, data):
+        if not data:
+            raise ValueError("Empty record")
+
+        version = data[0]
+        if version == _JSON_START:
+            return self.cls(**json.loads(data))
+        if version != FORMAT_V1:
+            raise ValueError(f"Unknown record format: {version:#04x}")
+
+        header = self._header.unpack_from(data)
+        flags = header[1]
+        split = 2 + len(self.numbers)
+
+        values = list(header[2:split])
+        pos = self._header.size
+
+        for i, length in enumerate(header[split:]):
+            raw = data[pos:pos + length]
+            pos += length
+            if flags & (1 << i):
+                raw = zlib.decompress(raw)
+            values.append(raw.decode("utf-8"))
+
+        return self.cls(*map(values.__getitem__, self._order))
+
+    def peek(self, data, name: str) -> str:
+        """
+        One text field without building the record (for scans that
+        only compare, e.g. a site lookup).
+        """
+        if data[:1] == b"{":
+            return json.loads(data).get(name, "")
+
+        index = self.texts.index(name)
+        header = self._header.unpack_from(data)
+        lengths = header[2 + len(self.numbers):]
+
+        pos = self._header.size + sum(lengths[:index])
+        raw = data[pos:pos + lengths[index]]
+        if header[1] & (1 << index):
+            raw = zlib.decompress(raw)
+        return raw.decode("utf-8")
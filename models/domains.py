@@ -0,0 +1,267 @@
+# models/domains.py
+#
+# URL -> host -> registrable domain (eTLD+1), and an index from
+# registrable domain to entry ids.
+#
+# public_suffix.json.gz is the Public Suffix List (ICANN and private
+# sections; Mozilla Public License 2.0, see https://publicsuffix.org)
+# compiled to a label trie, right to left. Regenerate it
+# from https://publicsuffix.org/list/public_suffix_list.dat with:
+#
+#   python -m models.domains --compile public_suffix_list.dat
+#
+# Trie nodes are dicts of label -> child, where a child is another
+# node or 1 (a rule with nothing below it). In a node, "$" marks the
+# node itself as a rule, "*" a wildcard rule one label down, and
+# "!label" an exception to that wildcard.
+
+import gzip
+import json
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit
+
+_TRIE_FILE = Path(__file__).with_name("public_suffix.json.gz")
+
+# Loaded on first use
+_TRIE: dict | None = None
+
+
+def host_of(url_or_domain: str) -> str:
+    """
+    Lowercased host of a URL or bare domain, without scheme, user
+    info, port, path or trailing dot. Punycode labels are decoded so
+    they compare equal to their Unicode spelling.
+    """
+    text = url_or_domain.strip()
+    if "://" not in text:
+        text = "//" + text
+
+    try:
+        host = urlsplit(text).hostname or ""
+    except ValueError:
+        # e.g. an unclosed "[" taken for an IPv6 literal
+        return url_or_domain.strip().lower()
+
+    host = host.rstrip(".")
+    if "xn--" in host:
+        host = ".".join(_decode_label(label) for label in host.split("."))
+    return host
+
+
+def registrable_domain(host: str) -> str:
+    """
+    The public suffix plus one label: "login.example.co.uk" ->
+    "example.co.uk", "alice.github.io" -> "alice.github.io". IP
+    addresses, single-label names and bare public suffixes are
+    returned as they are.
+    """
+    if "." not in host or _is_ip(host):
+        return host
+
+    labels = host.split(".")
+    suffix = _suffix_length(labels)
+    if suffix >= len(labels):
+        return host
+
+    return ".".join(labels[-suffix - 1:])
+
+
+class DomainIndex:
+    """
+    Registrable domain -> entry ids, updated per entry.
+
+    for_url() reads the URL's bucket, so its cost depends on how many
+    entries share that registrable domain, not on the vault size. The
+    bucket is ranked:
+    - entries for the same host (ignoring "www.")
+    - then entries for a parent of the host (example.com for
+      login.example.com)
+    - then the rest of the registrable domain
+    Each group is ordered most recently used first.
+    """
+
+    def __init__(self):
+        # registrable domain -> {entry_id: host}
+        self._buckets: dict[str, dict[int, str]] = {}
+        self._keys: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def put(self, entry_id: int, meta):
+        self.remove(entry_id)
+
+        host = _bare(host_of(meta.domain or meta.site))
+        if not host:
+            return
+
+        key = registrable_domain(host)
+        self._buckets.setdefault(key, {})[entry_id] = host
+        self._keys[entry_id] = key
+
+    def remove(self, entry_id: int):
+        key = self._keys.pop(entry_id, None)
+        if key is None:
+            return
+
+        bucket = self._buckets[key]
+        del bucket[entry_id]
+        if not bucket:
+            del self._buckets[key]
+
+    def clear(self):
+        self._buckets.clear()
+        self._keys.clear()
+
+    def for_url(self, url: str, last_used) -> list[int]:
+        """
+        Ranked ids of entries for the URL's registrable domain.
+        last_used(entry_id) supplies the recency.
+        """
+        host = _bare(host_of(url))
+        bucket = self._buckets.get(registrable_domain(host))
+        if not bucket:
+            return []
+
+        def rank(entry_id):
+            entry_host = bucket[entry_id]
+            if entry_host == host:
+                tier = 0
+            elif host.endswith("." + entry_host):
+                tier = 1
+            else:
+                tier = 2
+            return tier, -last_used(entry_id), entry_id
+
+        return sorted(bucket, key=rank)
+
+
+# ========================
+# Public suffix trie
+# ========================
+
+def compile_list(lines) -> dict:
+    """
+    Build the trie from the lines of public_suffix_list.dat.
+    """
+    root = {}
+
+    for line in lines:
+        rule = line.split()[0] if line.strip() else ""
+        if not rule or rule.startswith("//"):
+            continue
+
+        exception = rule.startswith("!")
+        labels = rule.lstrip("!").lower().split(".")[::-1]
+
+        node = root
+        for label in labels[:-1]:
+            node = node.setdefault(label, {})
+
+        if exception:
+            node["!" + labels[-1]] = 1
+        else:
+            node.setdefault(labels[-1], {})["$"] = 1
+
+    return _collapse(root)
+
+
+def _collapse(node: dict):
+    # Rules without children become plain 1s
+    if node.keys() == {"$"}:
+        return 1
+
+    return {
+        label: _collapse(child) if isinstance(child, dict) else child
+        for label, child in node.items()
+    }
+
+
+def _trie() -> dict:
+    global _TRIE
+    if _TRIE is None:
+        with gzip.open(_TRIE_FILE, "rt", encoding="utf-8") as f:
+            _TRIE = json.load(f)
+    return _TRIE
+
+
+def _suffix_length(labels: list[str]) -> int:
+    """
+    Number of trailing labels that form the public suffix. Unlisted
+    TLDs count as one label (the list's implicit "*" rule).
+    """
+    node = _trie()
+    length = 1
+
+    for depth, label in enumerate(reversed(labels)):
+        if not isinstance(node, dict):
+            break
+        if "!" + label in node:
+            return depth
+        if "*" in node:
+            length = depth + 1
+
+        child = node.get(label)
+        if child is None:
+            break
+        if child == 1 or "$" in child:
+            length = depth + 1
+        node = child
+
+    return length
+
+
+# ========================
+# Internal
+# ========================
+
+def _bare(host: str) -> str:
+    return host.removeprefix("www.")
+
+
+def _decode_label(label: str) -> str:
+    if not label.startswith("xn--"):
+        return label
+    try:
+        return label.encode("ascii").decode("idna")
+    except UnicodeError:
+        return label
+
+
+def _is_ip(host: str) -> bool:
+    # No TLD is numeric; IPv6 literals are the only hosts with ":"
+    return ":" in host or host.rpartition(".")[2].isdigit()
+
+
+# ========================
+# Entry point
+# ========================
+
+def main(argv=None) -> int:
+    """
+    --compile FILE: rebuild public_suffix.json.gz from a downloaded
+    public_suffix_list.dat. Otherwise print each argument's host and
+    registrable domain.
+    """
+    args = sys.argv[1:] if argv is None else argv
+
+    if args[:1] == ["--compile"] and len(args) == 2:
+        with open(args[1], encoding="utf-8") as f:
+            trie = compile_list(f)
+
+        data = json.dumps(trie, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+        with gzip.GzipFile(_TRIE_FILE, "wb", compresslevel=9, mtime=0) as f:
+            f.write(data.encode("utf-8"))
+
+        print(f"Wrote {_TRIE_FILE}")
+        return 0
+
+    for url in args:
+        host = host_of(url)
+        print(f"{url}\t{host}\t{registrable_domain(host)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,102 @@
 # models/entry.py
 
 from dataclasses import dataclass
-import json
 import time
-from urllib.parse import urlparse
+
+from models.codec import RecordCodec
+from models.domains import host_of
+from utils.trace import trace_methods
 
 
 def normalize_domain(url_or_domain: str) -> str:
+    # URLs keep only the host (no user info or port)
     if "://" in url_or_domain:
-        parsed = urlparse(url_or_domain)
-        return parsed.netloc.lower()
+        return host_of(url_or_domain)
     return url_or_domain.lower()
 
 
-@dataclass
+@trace_methods("entry.meta", "serialize", "deserialize")
+@dataclass(slots=True)
+class EntryMeta:
+    """
+    Small, list-facing half of an entry. Decrypted for every row on
+    unlock; never carries the password or notes.
+    """
+
+    site: str
+    username: str = ""
+    domain: str = ""
+    last_used: float = 0.0
+
+    def __post_init__(self):
+        if not self.domain:
+            self.domain = normalize_domain(self.site)
+
+    def touch(self):
+        self.last_used = time.time()
+
+    def serialize(self) -> bytes:
+        return _CODECS[EntryMeta].encode(self)
+
+    @staticmethod
+    def deserialize(data: bytes) -> "EntryMeta":
+        return _CODECS[EntryMeta].decode(data)
+
+    @staticmethod
+    def site_of(data: bytes) -> str:
+        return _CODECS[EntryMeta].peek(data, "site")
+
+    @staticmethod
+    def domain_of(data: bytes) -> str:
+        # Stored domains are already normalized; very old records may
+        # lack one
+        domain = _CODECS[EntryMeta].peek(data, "domain")
+        return domain or normalize_domain(EntryMeta.site_of(data))
+
+
+@trace_methods("entry.secret", "serialize", "deserialize")
+@dataclass(slots=True)
+class EntrySecret:
+    """
+    Sensitive half of an entry. Only decrypted on demand.
+    """
+
+    password: str
+    notes: str = ""
+
+    def serialize(self) -> bytes:
+        return _CODECS[EntrySecret].encode(self)
+
+    @staticmethod
+    def deserialize(data: bytes) -> "EntrySecret":
+        return _CODECS[EntrySecret].decode(data)
+
+    @staticmethod
+    def password_of(data: bytes) -> str:
+        # Skips the notes, which are the costly part to decode
+        return _CODECS[EntrySecret].peek(data, "password")
+
+
+@trace_methods("entry.usage", "serialize", "deserialize")
+@dataclass(slots=True)
+class EntryUsage:
+    """
+    Per-entry usage stats, stored in their own table.
+    """
+
+    last_used: float = 0.0
+    use_count: int = 0
+
+    def serialize(self) -> bytes:
+        return _CODECS[EntryUsage].encode(self)
+
+    @staticmethod
+    def deserialize(data: bytes) -> "EntryUsage":
+        return _CODECS[EntryUsage].decode(data)
+
+
+@trace_methods("entry", "serialize", "deserialize")
+@dataclass(slots=True)
 class VaultEntry:
     site: str
     username: str
@@ -30,9 +113,42 @@ class VaultEntry:
         self.last_used = time.time()
 
     def serialize(self) -> bytes:
-        return json.dumps(self.__dict__).encode("utf-8")
+        return _CODECS[VaultEntry].encode(self)
 
     @staticmethod
     def deserialize(data: bytes) -> "VaultEntry":
-        obj = json.loads(data.decode("utf-8"))
-        return VaultEntry(**obj)
+        return _CODECS[VaultEntry].decode(data)
+
+    def split(self) -> tuple[EntryMeta, EntrySecret]:
+        meta = EntryMeta(
+            site=self.site,
+            username=self.username,
+            domain=self.domain,
+            last_used=self.last_used,
+        )
+        return meta, EntrySecret(password=self.password, notes=self.notes)
+
+
+# Binary layouts; JSON records from older versions still decode
+_CODECS = {
+    EntryMeta: RecordCodec(
+        EntryMeta,
+        numbers=(("last_used", "d"),),
+        texts=("site", "username", "domain"),
+    ),
+    EntrySecret: RecordCodec(
+        EntrySecret,
+        texts=("password", "notes"),
+        compress=("notes",),
+    ),
+    EntryUsage: RecordCodec(
+        EntryUsage,
+        numbers=(("last_used", "d"), ("use_count", "I")),
+    ),
+    VaultEntry: RecordCodec(
+        VaultEntry,
+        numbers=(("last_used", "d"),),
+        texts=("site", "username", "password", "notes", "domain"),
+        compress=("notes",),
+    ),
+}
@@ -0,0 +1,217 @@
+# models/health.py
+#
+# Vault health: reused, weak and stale passwords, kept up to date per
+# entry instead of rescanning the vault.
+#
+# Passwords are never stored here. Each is reduced to a keyed hash
+# (BLAKE2b under a random key, held only in memory and replaced
+# whenever the audit is cleared), so equal passwords land in the same
+# bucket without a dictionary of plain hashes being built up next to
+# the decrypted vault.
+
+import hashlib
+import os
+import time
+
+from utils.password_gen import password_strength
+
+from config import HEALTH_STALE_DAYS
+
+_DIGEST_SIZE = 16
+
+
+class HealthAudit:
+    """
+    Keyed password hash -> entry ids, with a strength label per hash
+    and last_used per entry.
+
+    put() and remove() cost one hash and a few dict operations, plus a
+    strength estimate the first time a password is seen. load() fills
+    the audit in one pass without scoring: strength estimates are by
+    far the slowest part, so they are left to score_pending(), which
+    reads back one password per unscored hash. Equal passwords are
+    scored once.
+    """
+
+    def __init__(self):
+        self._hasher = _keyed_hasher()
+
+        # keyed hash -> {entry_id}
+        self._buckets: dict[bytes, set[int]] = {}
+        self._hashes: dict[int, bytes] = {}
+        self._last_used: dict[int, float] = {}
+
+        # keyed hash -> password_strength() label, and the hashes
+        # load() left unscored
+        self._labels: dict[bytes, str] = {}
+        self._unscored: list[bytes] = []
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    # ========================
+    # Updates
+    # ========================
+
+    def load(self, entries):
+        """
+        Replace the contents with (entry_id, password, last_used)
+        triples. Nothing is scored yet (see score_pending()).
+        """
+        self.clear()
+
+        # _fingerprint() inlined: hashing is most of a full audit
+        hasher = self._hasher
+        buckets = self._buckets
+        for entry_id, password, last_used in entries:
+            h = hasher.copy()
+            h.update(password.encode("utf-8"))
+            fingerprint = h.digest()
+            bucket = buckets.get(fingerprint)
+            if bucket is None:
+                buckets[fingerprint] = {entry_id}
+            else:
+                bucket.add(entry_id)
+            self._hashes[entry_id] = fingerprint
+            self._last_used[entry_id] = last_used
+
+        self._unscored = list(buckets)
+
+    def put(self, entry_id: int, password: str, last_used: float = 0.0):
+        """
+        Add or replace an entry, scoring its password if it is new to
+        the audit.
+        """
+        self.remove(entry_id)
+
+        fingerprint = self._fingerprint(password)
+        self._buckets.setdefault(fingerprint, set()).add(entry_id)
+        self._hashes[entry_id] = fingerprint
+        self._last_used[entry_id] = last_used
+
+        if fingerprint not in self._labels:
+            self._labels[fingerprint] = password_strength(password)
+
+    def touch(self, entry_id: int, last_used: float):
+        if entry_id in self._last_used:
+            self._last_used[entry_id] = last_used
+
+    def remove(self, entry_id: int):
+        fingerprint = self._hashes.pop(entry_id, None)
+        if fingerprint is None:
+            return
+
+        del self._last_used[entry_id]
+
+        bucket = self._buckets[fingerprint]
+        bucket.discard(entry_id)
+        if not bucket:
+            del self._buckets[fingerprint]
+            self._labels.pop(fingerprint, None)
+
+    def clear(self):
+        self._hasher = _keyed_hasher()
+        self._buckets.clear()
+        self._hashes.clear()
+        self._last_used.clear()
+        self._labels.clear()
+        self._unscored.clear()
+
+    def score_pending(self, read_password, limit: int) -> int:
+        """
+        Score up to `limit` unscored passwords, reading each through
+        read_password(entry_id) (None if the entry is gone). Entries
+        changed or deleted behind the audit's back (by another
+        process) are rehashed or removed on the way. Returns how many
+        hashes are left to look at; 0 when done.
+        """
+        scored = 0
+        while self._unscored and scored < limit:
+            fingerprint = self._unscored.pop()
+            # Removed, or scored by put() since
+            if fingerprint not in self._buckets or fingerprint in self._labels:
+                continue
+
+            scored += 1
+            changed = []
+            for entry_id in self._buckets[fingerprint]:
+                password = read_password(entry_id)
+                if password is not None and self._fingerprint(password) == fingerprint:
+                    self._labels[fingerprint] = password_strength(password)
+                    break
+                changed.append((entry_id, password))
+
+            for entry_id, password in changed:
+                if password is None:
+                    self.remove(entry_id)
+                else:
+                    self.put(entry_id, password, self._last_used[entry_id])
+
+        return len(self._unscored)
+
+    # ========================
+    # Results
+    # ========================
+
+    def pending(self) -> int:
+        """
+        Distinct passwords not scored yet.
+        """
+        return len(self._buckets) - len(self._labels)
+
+    def reused(self) -> list[list[int]]:
+        """
+        Groups of entry ids sharing a password, largest first.
+        """
+        groups = [sorted(bucket) for bucket in self._buckets.values() if len(bucket) > 1]
+        groups.sort(key=lambda group: (-len(group), group[0]))
+        return groups
+
+    def weak(self) -> list[int]:
+        """
+        Ids of entries whose password scored "Weak".
+        """
+        return sorted(
+            entry_id
+            for fingerprint, bucket in self._buckets.items()
+            if self._labels.get(fingerprint) == "Weak"
+            for entry_id in bucket
+        )
+
+    def label(self, entry_id: int) -> str | None:
+        """
+        The entry's strength label, None if not scored yet.
+        """
+        fingerprint = self._hashes.get(entry_id)
+        return self._labels.get(fingerprint) if fingerprint else None
+
+    def stale(self, now: float | None = None) -> list[int]:
+        """
+        Ids of entries not used in HEALTH_STALE_DAYS, least recently
+        used first. Entries never used (last_used 0) have no age and
+        are left out.
+        """
+        cutoff = (time.time() if now is None else now) - HEALTH_STALE_DAYS * 86400
+        ages = sorted(
+            (last_used, entry_id)
+            for entry_id, last_used in self._last_used.items()
+            if 0 < last_used < cutoff
+        )
+        return [entry_id for _, entry_id in ages]
+
+    def last_used(self, entry_id: int) -> float:
+        return self._last_used.get(entry_id, 0.0)
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _fingerprint(self, password: str) -> bytes:
+        h = self._hasher.copy()
+        h.update(password.encode("utf-8"))
+        return h.digest()
+
+
+def _keyed_hasher():
+    # Copied per password, which is cheaper than keying a new hasher
+    return hashlib.blake2b(digest_size=_DIGEST_SIZE, key=os.urandom(32))
@@ -0,0 +1,374 @@
+# models/search.py
+
+import math
+import re
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from heapq import nlargest
+
+from config import SEARCH_RESULT_LIMIT, SEARCH_SCAN_LIMIT
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+# Field separator inside a document's haystack
+_SEP = "\0"
+
+# Trigrams carried by more than this share of the vault are too
+# common to help fuzzy candidate selection (".com", "mai", ...)
+_COMMON_GRAM_SHARE = 0.25
+
+
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _subsequence_span(query: str, text: str) -> int | None:
+    """
+    Width of the window from the first match of query[0] to the end of
+    a greedy subsequence match of query in text, or None.
+    """
+    start = text.find(query[0])
+    if start < 0:
+        return None
+
+    pos = start
+    for ch in query[1:]:
+        pos = text.find(ch, pos + 1)
+        if pos < 0:
+            return None
+
+    return pos - start + 1
+
+
+class _Doc:
+    __slots__ = ("site", "hay", "last_used", "use_count", "frecency")
+
+    def __init__(self, fields, last_used, use_count):
+        self.site = fields[0]
+        self.hay = _SEP + _SEP.join(fields)
+        self.last_used = last_used
+        self.use_count = use_count
+        self.frecency = 0.0
+
+    @property
+    def fields(self):
+        return self.hay[1:].split(_SEP)
+
+
+class SearchIndex:
+    """
+    Ranked search over site, domain and username.
+
+    - queries of 3+ chars: trigram posting lists, intersected smallest
+      first, then verified as substrings
+    - shorter queries: bisect over a sorted token list (word prefixes)
+    - fuzzy: when exact hits run short, entries sharing at least half
+      of the query's informative trigrams are scored as subsequence
+      matches or near misses (typos)
+
+    Ranking adds match quality to a frecency bonus (use_count decayed
+    by last_used age). When a query extends the previous one, only the
+    previous hits are re-scored instead of consulting the index. Broad
+    queries with more than `scan_limit` candidates only score the most
+    frecent ones, which bounds the cost of one- and two-letter queries.
+
+    All mutations are incremental: add/remove/touch per entry.
+    """
+
+    def __init__(
+        self,
+        limit: int = SEARCH_RESULT_LIMIT,
+        scan_limit: int = SEARCH_SCAN_LIMIT,
+    ):
+        self.limit = limit
+        self.scan_limit = scan_limit
+
+        self._docs: dict[int, _Doc] = {}
+        self._order: list[tuple[float, int]] = []
+        self._grams: dict[str, set[int]] = {}
+        self._tokens: list[tuple[str, int]] = []
+
+        self._last_query = ""
+        self._last_hits = None
+
+    # ========================
+    # Building
+    # ========================
+
+    def build(self, items):
+        """
+        items: (entry_id, meta, use_count)
+        """
+        self.clear()
+        for entry_id, meta, use_count in items:
+            self._insert(entry_id, meta, use_count)
+
+        self._tokens.sort()
+
+        now = time.time()
+        for doc in self._docs.values():
+            doc.frecency = self._frecency(doc, now)
+
+        self._order = sorted(
+            (-doc.frecency, entry_id) for entry_id, doc in self._docs.items()
+        )
+
+    def clear(self):
+        self._docs.clear()
+        self._order.clear()
+        self._grams.clear()
+        self._tokens.clear()
+        self._invalidate()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ========================
+    # Deltas
+    # ========================
+
+    def add(self, entry_id: int, meta, use_count: int = 0):
+        """
+        Insert or replace one entry.
+        """
+        if entry_id in self._docs:
+            self.remove(entry_id)
+
+        doc = self._insert(entry_id, meta, use_count, keep_sorted=True)
+        doc.frecency = self._frecency(doc, time.time())
+        insort(self._order, (-doc.frecency, entry_id))
+        self._invalidate()
+
+    def remove(self, entry_id: int):
+        doc = self._docs.pop(entry_id, None)
+        if doc is None:
+            return
+
+        self._unorder(entry_id, doc)
+
+        for gram in self._doc_grams(doc):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._grams[gram]
+
+        for token in self._doc_tokens(doc):
+            i = bisect_left(self._tokens, (token, entry_id))
+            if i < len(self._tokens) and self._tokens[i] == (token, entry_id):
+                del self._tokens[i]
+
+        self._invalidate()
+
+    def touch(self, entry_id: int, last_used: float, use_count: int):
+        doc = self._docs.get(entry_id)
+        if doc is None:
+            return
+
+        self._unorder(entry_id, doc)
+
+        doc.last_used = last_used
+        doc.use_count = use_count
+        doc.frecency = self._frecency(doc, time.time())
+
+        insort(self._order, (-doc.frecency, entry_id))
+
+    # ========================
+    # Querying
+    # ========================
+
+    def search(self, query: str) -> list[int] | None:
+        """
+        Ranked entry ids (best first, at most `limit`), or None for an
+        empty query.
+        """
+        q = query.strip().lower()
+        if not q:
+            self._invalidate()
+            return None
+
+        narrowing = (
+            self._last_hits is not None
+            and len(self._last_query) >= 3
+            and q.startswith(self._last_query)
+        )
+
+        if narrowing:
+            # Every hit for q was a hit for the shorter query
+            candidates = self._last_hits
+        elif len(q) < 3:
+            candidates = self._prefix_hits(q)
+        else:
+            candidates = self._substring_hits(q)
+
+        complete = len(candidates) <= self.scan_limit
+        if not complete:
+            candidates = self._most_frecent(candidates, self.scan_limit)
+
+        scores = self._score(q, candidates)
+
+        # Only a complete set of exact hits can be narrowed: a
+        # truncated scan missed some, and fuzzy hits for q need not
+        # be hits for a longer query
+        self._last_query = q
+        self._last_hits = set(scores) if complete else None
+
+        if len(q) >= 3 and len(scores) < self.limit:
+            self._add_fuzzy(q, scores)
+
+        return nlargest(self.limit, scores, key=scores.__getitem__)
+
+    def _score(self, q: str, candidates) -> dict[int, float]:
+        docs = self._docs
+        quality = self._quality
+        scores = {}
+
+        for entry_id in candidates:
+            doc = docs[entry_id]
+            value = quality(q, doc)
+            if value:
+                scores[entry_id] = value + doc.frecency
+
+        return scores
+
+    def _prefix_hits(self, q: str) -> set[int]:
+        tokens = self._tokens
+        lo = bisect_left(tokens, (q, -1))
+        hi = bisect_left(tokens, (q + "\uffff", -1), lo)
+        return {entry_id for _, entry_id in tokens[lo:hi]}
+
+    def _substring_hits(self, q: str) -> set[int]:
+        grams = self._query_grams(q)
+
+        hits = set(grams[0])
+        for ids in grams[1:]:
+            if not hits:
+                break
+            hits &= ids
+
+        return hits
+
+    def _most_frecent(self, candidates, count: int) -> list[int]:
+        """
+        Broad queries (one or two letters on a big vault) only score
+        the `count` most frecent candidates.
+        """
+        picked = []
+        for _, entry_id in self._order:
+            if entry_id in candidates:
+                picked.append(entry_id)
+                if len(picked) == count:
+                    break
+        return picked
+
+    def _add_fuzzy(self, q: str, scores: dict[int, float]):
+        """
+        Entries sharing at least half of the query's informative
+        trigrams: subsequence matches, or near misses (typos).
+        """
+        cap = max(1, int(len(self._docs) * _COMMON_GRAM_SHARE))
+        useful = [ids for ids in self._query_grams(q) if 0 < len(ids) <= cap]
+        if not useful:
+            return
+
+        counts = Counter()
+        for ids in useful:
+            counts.update(ids)
+
+        needed = max(1, len(useful) // 2)
+        for entry_id, count in counts.items():
+            if count < needed or entry_id in scores:
+                continue
+
+            doc = self._docs[entry_id]
+            value = self._quality(q, doc) or 10.0 * count / len(useful)
+            scores[entry_id] = value + doc.frecency
+
+    def _query_grams(self, q: str):
+        return sorted(
+            (self._grams.get(gram, ()) for gram in _trigrams(q)),
+            key=len,
+        )
+
+    # ========================
+    # Scoring
+    # ========================
+
+    @staticmethod
+    def _quality(q: str, doc: _Doc) -> float:
+        site = doc.site
+        if site.startswith(q):
+            return 100.0 if len(site) == len(q) else 90.0
+
+        hay = doc.hay
+        pos = hay.find(q)
+
+        if pos > 0:
+            before = hay[pos - 1]
+            if before == _SEP:
+                return 80.0
+            if not before.isalnum():
+                return 70.0
+            return 50.0 - min(pos, 10)
+
+        span = _subsequence_span(q, hay)
+        if span is None:
+            return 0.0
+        return 10.0 + 20.0 * len(q) / span
+
+    @staticmethod
+    def _frecency(doc: _Doc, now: float) -> float:
+        if not doc.use_count:
+            return 0.0
+        age_days = max(0.0, (now - doc.last_used) / 86400)
+        return 10.0 * math.log1p(doc.use_count) / (1.0 + age_days / 14)
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _insert(self, entry_id, meta, use_count, keep_sorted=False) -> _Doc:
+        fields = tuple(dict.fromkeys(
+            field.lower()
+            for field in (meta.site, meta.domain, meta.username)
+            if field
+        )) or ("",)
+
+        doc = _Doc(fields, meta.last_used, use_count)
+        self._docs[entry_id] = doc
+
+        for gram in self._doc_grams(doc):
+            self._grams.setdefault(gram, set()).add(entry_id)
+
+        for token in self._doc_tokens(doc):
+            if keep_sorted:
+                insort(self._tokens, (token, entry_id))
+            else:
+                self._tokens.append((token, entry_id))
+
+        return doc
+
+    @staticmethod
+    def _doc_grams(doc: _Doc):
+        grams = set()
+        for field in doc.fields:
+            grams |= _trigrams(field)
+        return grams
+
+    @staticmethod
+    def _doc_tokens(doc: _Doc):
+        tokens = set()
+        for field in doc.fields:
+            tokens.add(field)
+            tokens.update(token for token in _TOKEN_SPLIT.split(field) if token)
+        return tokens
+
+    def _unorder(self, entry_id: int, doc: _Doc):
+        i = bisect_left(self._order, (-doc.frecency, entry_id))
+        if i < len(self._order) and self._order[i][1] == entry_id:
+            del self._order[i]
+
+    def _invalidate(self):
+        self._last_query = ""
+        self._last_hits = None
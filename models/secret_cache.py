@@ -0,0 +1,71 @@
+# models/secret_cache.py
+
+import time
+from collections import OrderedDict
+
+from config import SECRET_CACHE_SIZE, SECRET_CACHE_TTL_SECONDS
+
+
+class SecretCache:
+    """
+    Bounded LRU of decrypted EntrySecret objects.
+
+    Misses go through `loader(entry_id)`. Secrets idle for longer than
+    `ttl` seconds are evicted on access and by prune(); clear() on lock.
+    """
+
+    def __init__(
+        self,
+        loader,
+        max_size: int = SECRET_CACHE_SIZE,
+        ttl: float = SECRET_CACHE_TTL_SECONDS,
+    ):
+        self.loader = loader
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, entry_id: int):
+        item = self._items.get(entry_id)
+
+        if item is not None:
+            stamp, secret = item
+            now = time.monotonic()
+            if now - stamp < self.ttl:
+                self._items[entry_id] = (now, secret)
+                self._items.move_to_end(entry_id)
+                return secret
+            del self._items[entry_id]
+
+        secret = self.loader(entry_id)
+        if secret is not None:
+            self.put(entry_id, secret)
+        return secret
+
+    def put(self, entry_id: int, secret):
+        self._items[entry_id] = (time.monotonic(), secret)
+        self._items.move_to_end(entry_id)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, entry_id: int):
+        self._items.pop(entry_id, None)
+
+    def prune(self):
+        """
+        Drop expired secrets. Order tracks last access, so the scan
+        stops at the first live item.
+        """
+        cutoff = time.monotonic() - self.ttl
+        while self._items:
+            entry_id, (stamp, _) = next(iter(self._items.items()))
+            if stamp >= cutoff:
+                break
+            del self._items[entry_id]
+
+    def clear(self):
+        self._items.clear()
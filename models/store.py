@@ -0,0 +1,168 @@
+# models/store.py
+
+from bisect import bisect_left, insort
+
+from models.domains import DomainIndex
+from models.entry import EntryMeta
+
+
+class EntryStore:
+    """
+    In-memory view of the decrypted vault.
+
+    Entry metadata is keyed by storage id (secrets are not held here).
+    Alongside the entries the store keeps:
+    - a lowercased site -> id dictionary (exact-match lookup)
+    - a recency order sorted by (-last_used, id)
+    - a registrable domain -> ids index (URL lookup), built on the
+      first ids_for_url() and updated with the store after that
+
+    Every mutation is applied as a delta and reports the row(s) it
+    touched, so views can patch themselves instead of rebuilding.
+    """
+
+    def __init__(self):
+        self._entries: dict[int, EntryMeta] = {}
+        self._site_ids: dict[str, int] = {}
+        self._order: list[tuple[float, int]] = []
+        self._domains: DomainIndex | None = None
+
+    # ========================
+    # Bulk loading
+    # ========================
+
+    def load(self, pairs):
+        """
+        Replace the contents with (entry_id, entry) pairs.
+        """
+        self.clear()
+
+        for entry_id, entry in pairs:
+            self._entries[entry_id] = entry
+            self._site_ids[entry.site.lower()] = entry_id
+
+        self._order = sorted(
+            self._key(entry_id, entry)
+            for entry_id, entry in self._entries.items()
+        )
+
+    def clear(self):
+        self._entries.clear()
+        self._site_ids.clear()
+        self._order.clear()
+        self._domains = None
+
+    # ========================
+    # Lookups
+    # ========================
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, entry_id: int) -> bool:
+        return entry_id in self._entries
+
+    def __iter__(self):
+        """
+        Yield (entry_id, entry) in recency order.
+        """
+        for _, entry_id in self._order:
+            yield entry_id, self._entries[entry_id]
+
+    def get(self, entry_id: int) -> EntryMeta | None:
+        return self._entries.get(entry_id)
+
+    def id_for_site(self, site: str) -> int | None:
+        return self._site_ids.get(site.lower())
+
+    def ids_for_url(self, url: str) -> list[int]:
+        """
+        Entries for the URL's registrable domain, best match first
+        (see DomainIndex.for_url()).
+        """
+        if self._domains is None:
+            self._domains = DomainIndex()
+            for entry_id, entry in self._entries.items():
+                self._domains.put(entry_id, entry)
+
+        return self._domains.for_url(url, lambda entry_id: self._entries[entry_id].last_used)
+
+    def id_at(self, row: int) -> int:
+        return self._order[row][1]
+
+    def row_of(self, entry_id: int) -> int:
+        return bisect_left(self._order, self._key(entry_id, self._entries[entry_id]))
+
+    def row_for(self, entry_id: int, last_used: float) -> int:
+        """
+        Row a key would be inserted at, given the current order.
+        """
+        return bisect_left(self._order, (-last_used, entry_id))
+
+    # ========================
+    # Deltas
+    # ========================
+
+    def put(self, entry_id: int, entry: EntryMeta):
+        """
+        Insert or replace an entry.
+
+        Returns (old_row, new_row); old_row is None for inserts.
+        """
+        old_row = None
+        previous = self._entries.get(entry_id)
+
+        if previous is not None:
+            old_row = self._unlink(entry_id, previous)
+
+        self._entries[entry_id] = entry
+        self._site_ids[entry.site.lower()] = entry_id
+        if self._domains is not None:
+            self._domains.put(entry_id, entry)
+
+        key = self._key(entry_id, entry)
+        insort(self._order, key)
+        return old_row, bisect_left(self._order, key)
+
+    def remove(self, entry_id: int) -> int | None:
+        """
+        Drop an entry. Returns the row it occupied, or None.
+        """
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return None
+
+        if self._domains is not None:
+            self._domains.remove(entry_id)
+        return self._unlink(entry_id, entry)
+
+    def touch(self, entry_id: int, timestamp: float):
+        """
+        Bump last_used. Returns (old_row, new_row).
+        """
+        entry = self._entries[entry_id]
+        old_row = self.row_of(entry_id)
+        del self._order[old_row]
+
+        entry.last_used = timestamp
+
+        key = self._key(entry_id, entry)
+        insort(self._order, key)
+        return old_row, bisect_left(self._order, key)
+
+    # ========================
+    # Internal
+    # ========================
+
+    @staticmethod
+    def _key(entry_id: int, entry: EntryMeta) -> tuple[float, int]:
+        return (-entry.last_used, entry_id)
+
+    def _unlink(self, entry_id: int, entry: EntryMeta) -> int:
+        site = entry.site.lower()
+        if self._site_ids.get(site) == entry_id:
+            del self._site_ids[site]
+
+        row = bisect_left(self._order, self._key(entry_id, entry))
+        del self._order[row]
+        return row
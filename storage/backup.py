@@ -0,0 +1,166 @@
+# storage/backup.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import NamedTuple
+
+from storage.vault import Account
+
+from config import BACKUP_KEEP, BACKUP_EVERY_CHANGES, BACKUP_PAGES_PER_STEP
+
+_PREFIX = "vault-"
+
+
+class Snapshot(NamedTuple):
+    path: Path
+    created: float
+    size: int
+
+
+class BackupManager:
+    """
+    Rotating snapshots of the vault under <vault dir>/backups.
+
+    Snapshots are taken by the storage engine's backup_to() on a
+    worker thread, BACKUP_PAGES_PER_STEP pages at a time, so the app
+    keeps reading and writing while a copy runs (for SQLite this is
+    the online backup API on its own connection). A snapshot is
+    written as .part, checked, then renamed; the oldest ones beyond
+    `keep` are deleted.
+
+    "Changes" are rows written through the vault (storage.changes)
+    since the last snapshot started.
+    """
+
+    def __init__(
+        self,
+        storage,
+        directory: Path | None = None,
+        keep: int = BACKUP_KEEP,
+        every: int = BACKUP_EVERY_CHANGES,
+    ):
+        self.storage = storage
+        self.directory = Path(directory or storage.path.parent / "backups")
+        self.keep = keep
+        self.every = every
+
+        self._baseline = storage.changes
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._job = None
+        self._lock = threading.Lock()
+
+        self.last_error: str | None = None
+
+    # ========================
+    # Taking snapshots
+    # ========================
+
+    @property
+    def pending_changes(self) -> int:
+        return self.storage.changes - self._baseline
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None and not self._job.done()
+
+    def maybe_start(self):
+        """
+        Start a snapshot once `every` changes have piled up.
+        """
+        if self.pending_changes >= self.every:
+            return self.start()
+        return None
+
+    def start(self):
+        """
+        Snapshot in the background. Returns the Future, or None if a
+        snapshot is already running.
+        """
+        if self.running:
+            return None
+
+        self._baseline = self.storage.changes
+        self._job = self._pool.submit(self._snapshot)
+        return self._job
+
+    def wait(self, timeout: float | None = None):
+        # A failed snapshot is reported through last_error, not here
+        if self._job is not None:
+            wait([self._job], timeout)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    # ========================
+    # Listing / restore
+    # ========================
+
+    def list_snapshots(self) -> list[Snapshot]:
+        """
+        Finished snapshots, newest first.
+        """
+        if not self.directory.exists():
+            return []
+
+        snapshots = []
+        for path in self.directory.glob(f"{_PREFIX}*{self.storage.suffix}"):
+            stat = path.stat()
+            snapshots.append(Snapshot(path, stat.st_mtime, stat.st_size))
+
+        snapshots.sort(key=lambda s: s.path.name, reverse=True)
+        return snapshots
+
+    def read_account(self, path) -> Account | None:
+        """
+        The account row of a snapshot (salt + kdf are needed to derive
+        the key that core.account.check_password() compares against).
+        """
+        return self.storage.read_snapshot_account(path)
+
+    def restore(self, path):
+        """
+        Replace the live vault with a snapshot, in place (the storage
+        object stays valid). The current state is snapshotted first.
+        The caller validates the snapshot with read_account() and
+        core.account.check_password() and locks afterwards.
+        """
+        self.wait()
+
+        # Pruning now could delete the snapshot being restored
+        self._snapshot(prune=False)
+        self.storage.restore_from(path)
+
+        self._baseline = self.storage.changes
+        self._prune()
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _snapshot(self, prune: bool = True) -> Path:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{time.time_ns() // 1000 % 1_000_000:06d}"
+            final = self.directory / f"{_PREFIX}{stamp}{self.storage.suffix}"
+            part = final.with_name(final.name + ".part")
+
+            try:
+                self.storage.backup_to(part, pages=BACKUP_PAGES_PER_STEP, sleep=0.005)
+                part.replace(final)
+            except Exception as e:
+                part.unlink(missing_ok=True)
+                self.last_error = str(e)
+                raise
+
+            self.last_error = None
+            if prune:
+                self._prune()
+            return final
+
+    def _prune(self):
+        for snapshot in self.list_snapshots()[self.keep:]:
+            snapshot.path.unlink(missing_ok=True)
+
@@ -0,0 +1,456 @@
+# storage/conformance.py
+#
+# Behaviour every storage engine must share. Engines see opaque blobs,
+# so the checks need no keys and run against throwaway files.
+#
+#   python -m storage.conformance [engine ...]
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from storage.engines import ENGINES, LogEngine, SqliteEngine, VaultInUse
+
+ACCOUNT = (b"user-hash", b"salt", b"verifier", b"wrapped", "kdf-v1")
+NEW_ACCOUNT = (b"user-hash-2", b"salt-2", b"verifier-2", b"wrapped-2", "kdf-v2")
+
+CHECKS = []
+
+
+def check(fn):
+    CHECKS.append(fn)
+    return fn
+
+
+def _expect(actual, expected, what: str):
+    if actual != expected:
+        raise AssertionError(f"{what}: expected {expected!r}, got {actual!r}")
+
+
+def _fill(engine, count: int) -> list[int]:
+    engine.add_entries((f"meta-{i}".encode(), f"secret-{i}".encode()) for i in range(count))
+    return [entry_id for entry_id, _ in engine.get_all_meta()]
+
+
+# ========================
+# Checks: check(engine_cls, directory)
+# ========================
+
+@check
+def empty_vault(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        _expect(engine.has_account(), False, "has_account")
+        _expect(engine.get_account(), None, "get_account")
+        _expect(engine.count_entries(), 0, "count_entries")
+        _expect(engine.get_all_meta(), [], "get_all_meta")
+        _expect(engine.get_all_usage(), [], "get_all_usage")
+        _expect(engine.get_rekey_journal(), None, "get_rekey_journal")
+        _expect(engine.get_secret(1), None, "get_secret")
+    finally:
+        engine.close()
+
+
+@check
+def account(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        engine.create_account(*ACCOUNT)
+        _expect(engine.has_account(), True, "has_account")
+        _expect(tuple(engine.get_account()), ACCOUNT, "get_account")
+
+        engine.update_account(*NEW_ACCOUNT)
+        _expect(tuple(engine.get_account()), NEW_ACCOUNT, "updated account")
+
+        engine.update_account(b"u", b"s", b"v", None, None)
+        _expect(tuple(engine.get_account()), (b"u", b"s", b"v", None, None), "NULL columns")
+    finally:
+        engine.close()
+
+
+@check
+def entries(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        first = engine.add_entry(b"meta-a", b"secret-a")
+        _expect(engine.add_entries([]), 0, "empty add_entries")
+        _expect(engine.add_entries([(b"meta-b", b"secret-b"), (b"meta-c", b"secret-c")]), 2, "add_entries")
+
+        ids = [entry_id for entry_id, _ in engine.get_all_meta()]
+        _expect(ids[0], first, "first id")
+        _expect(ids, sorted(set(ids)), "ids ascending and unique")
+        _expect(engine.count_entries(), 3, "count_entries")
+        _expect([meta for _, meta in engine.get_all_meta()], [b"meta-a", b"meta-b", b"meta-c"], "metas")
+        _expect(engine.get_secret(ids[1]), b"secret-b", "get_secret")
+        _expect(engine.get_all_entries()[2], (ids[2], b"meta-c", b"secret-c"), "get_all_entries")
+
+        engine.update_entry(ids[0], b"meta-a2", b"secret-a2")
+        engine.update_meta(ids[1], b"meta-b2")
+        _expect(engine.get_all_entries()[:2], [
+            (ids[0], b"meta-a2", b"secret-a2"),
+            (ids[1], b"meta-b2", b"secret-b"),
+        ], "updates")
+
+        engine.update_entry(10_000, b"x", b"y")
+        _expect(engine.count_entries(), 3, "update of a missing id adds nothing")
+
+        _expect(engine.get_legacy_entries(), [], "no legacy rows")
+    finally:
+        engine.close()
+
+
+@check
+def paging(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        ids = _fill(engine, 25)
+        engine.delete_entry(ids[3])
+
+        pages, last_id = [], 0
+        while rows := engine.get_entries_after(last_id, 10):
+            pages.append(len(rows))
+            last_id = rows[-1][0]
+
+        _expect(pages, [10, 10, 4], "page sizes")
+        _expect(last_id, ids[-1], "last id")
+    finally:
+        engine.close()
+
+
+@check
+def delete_drops_usage(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        ids = _fill(engine, 3)
+        engine.put_usage_many([(entry_id, b"usage") for entry_id in ids])
+
+        engine.delete_entry(ids[1])
+        _expect(engine.get_secret(ids[1]), None, "deleted secret")
+        _expect([entry_id for entry_id, _ in engine.get_all_usage()], [ids[0], ids[2]], "usage ids")
+        _expect(engine.count_entries(), 2, "count_entries")
+
+        engine.delete_entry(ids[1])
+    finally:
+        engine.close()
+
+
+@check
+def usage(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        engine.put_usage_many([(2, b"two"), (1, b"one")])
+        engine.put_usage_many([(2, b"two-b")])
+        engine.put_usage_many([])
+        _expect(engine.get_all_usage(), [(1, b"one"), (2, b"two-b")], "usage rows")
+        _expect(engine.get_usage(2), b"two-b", "get_usage")
+        _expect(engine.get_usage(3), None, "missing usage")
+    finally:
+        engine.close()
+
+
+@check
+def rekey_finish(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        engine.create_account(*ACCOUNT)
+        ids = _fill(engine, 5)
+        engine.put_usage_many([(ids[0], b"old-usage")])
+
+        _expect(engine.begin_rekey(*NEW_ACCOUNT), 5, "begin_rekey total")
+        _expect(engine.count_rekey_staged(), 0, "nothing staged")
+
+        engine.stage_rekey_batch([(entry_id, b"new-meta", b"new-secret") for entry_id in ids[:3]], ids[2])
+        _expect(engine.get_rekey_journal(), NEW_ACCOUNT + (ids[2], 5), "journal")
+        _expect(engine.count_rekey_staged(), 3, "staged")
+        _expect(engine.get_secret(ids[0]), b"secret-0", "staging leaves entries alone")
+
+        engine.stage_rekey_batch([(entry_id, b"new-meta", b"new-secret") for entry_id in ids[3:]], ids[-1])
+        engine.finish_rekey([(ids[1], b"new-usage")])
+
+        _expect(tuple(engine.get_account()), NEW_ACCOUNT, "account after rekey")
+        _expect(engine.get_rekey_journal(), None, "journal cleared")
+        _expect({row[1:] for row in engine.get_all_entries()}, {(b"new-meta", b"new-secret")}, "entries swapped")
+        _expect(engine.get_all_usage(), [(ids[1], b"new-usage")], "usage replaced")
+
+        engine.begin_rekey(*ACCOUNT)
+        _expect(engine.count_rekey_staged(), 0, "fresh staging area")
+        engine.abort_rekey()
+    finally:
+        engine.close()
+
+
+@check
+def rekey_abort(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        engine.create_account(*ACCOUNT)
+        ids = _fill(engine, 2)
+
+        engine.begin_rekey(*NEW_ACCOUNT)
+        engine.stage_rekey_batch([(ids[0], b"new-meta", b"new-secret")], ids[0])
+        engine.abort_rekey()
+
+        _expect(engine.get_rekey_journal(), None, "journal cleared")
+        _expect(tuple(engine.get_account()), ACCOUNT, "account kept")
+        _expect(engine.get_secret(ids[0]), b"secret-0", "entry kept")
+    finally:
+        engine.close()
+
+
+@check
+def staged_rows_for_deleted_entries(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        engine.create_account(*ACCOUNT)
+        ids = _fill(engine, 2)
+
+        engine.begin_rekey(*NEW_ACCOUNT)
+        engine.stage_rekey_batch([(entry_id, b"new-meta", b"new-secret") for entry_id in ids], ids[-1])
+        engine.delete_entry(ids[0])
+        engine.finish_rekey([])
+
+        _expect(engine.get_all_entries(), [(ids[1], b"new-meta", b"new-secret")], "entries")
+    finally:
+        engine.close()
+
+
+@check
+def reopen(cls, directory):
+    path = directory / f"vault{cls.SUFFIX}"
+    engine = cls(path)
+    engine.create_account(*ACCOUNT)
+    ids = _fill(engine, 4)
+    engine.delete_entry(ids[0])
+    engine.update_meta(ids[1], b"meta-1b")
+    engine.put_usage_many([(ids[2], b"usage")])
+    engine.begin_rekey(*NEW_ACCOUNT)
+    engine.stage_rekey_batch([(ids[1], b"new-meta", b"new-secret")], ids[1])
+    before = (
+        engine.get_account(),
+        engine.get_all_entries(),
+        engine.get_all_usage(),
+        engine.get_rekey_journal(),
+        engine.count_rekey_staged(),
+    )
+    engine.close()
+
+    engine = cls(path)
+    try:
+        after = (
+            engine.get_account(),
+            engine.get_all_entries(),
+            engine.get_all_usage(),
+            engine.get_rekey_journal(),
+            engine.count_rekey_staged(),
+        )
+        _expect(after, before, "state after reopen")
+
+        # Deleted ids stay unused for the rest of this session at least
+        _expect(engine.add_entry(b"m", b"s") > ids[-1], True, "new id after reopen")
+    finally:
+        engine.close()
+
+
+@check
+def compact(cls, directory):
+    path = directory / f"vault{cls.SUFFIX}"
+    engine = cls(path)
+    try:
+        engine.create_account(*ACCOUNT)
+        ids = _fill(engine, 50)
+        for round_ in range(20):
+            engine.put_usage_many([(entry_id, b"usage-%d" % round_) for entry_id in ids])
+        for entry_id in ids[::2]:
+            engine.delete_entry(entry_id)
+
+        before = (engine.get_account(), engine.get_all_entries(), engine.get_all_usage())
+        size = os.path.getsize(path)
+        engine.compact()
+
+        _expect((engine.get_account(), engine.get_all_entries(), engine.get_all_usage()), before, "state after compact")
+        _expect(os.path.getsize(path) <= size, True, "compact does not grow the file")
+
+        engine.add_entry(b"after", b"compact")
+        _expect(engine.get_all_meta()[-1][1], b"after", "write after compact")
+    finally:
+        engine.close()
+
+
+@check
+def snapshots(cls, directory):
+    engine = cls(directory / f"vault{cls.SUFFIX}")
+    try:
+        engine.create_account(*ACCOUNT)
+        ids = _fill(engine, 30)
+        engine.put_usage_many([(ids[0], b"usage")])
+
+        snapshot = directory / f"snapshot{cls.SUFFIX}"
+        engine.backup_to(snapshot, pages=1)
+        _expect(tuple(cls.read_snapshot_account(snapshot)), ACCOUNT, "snapshot account")
+
+        before = (engine.get_all_entries(), engine.get_all_usage())
+        engine.update_account(*NEW_ACCOUNT)
+        engine.delete_entry(ids[0])
+        engine.begin_rekey(*NEW_ACCOUNT)
+
+        engine.restore_from(snapshot)
+        _expect(tuple(engine.get_account()), ACCOUNT, "restored account")
+        _expect((engine.get_all_entries(), engine.get_all_usage()), before, "restored rows")
+        _expect(engine.get_rekey_journal(), None, "restored journal")
+
+        engine.add_entry(b"after", b"restore")
+        _expect(engine.count_entries(), 31, "write after restore")
+
+        damaged = directory / f"damaged{cls.SUFFIX}"
+        data = snapshot.read_bytes()
+        damaged.write_bytes(data[:len(data) // 2])
+        try:
+            cls.read_snapshot_account(damaged)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("truncated snapshot was accepted")
+    finally:
+        engine.close()
+
+
+# ========================
+# Engine-specific checks
+# ========================
+
+def log_torn_tail(directory):
+    path = directory / "torn.vxlog"
+    engine = LogEngine(path)
+    engine.add_entries([(b"meta-a", b"secret-a"), (b"meta-b", b"secret-b")])
+    size = os.path.getsize(path)
+    engine.add_entry(b"meta-c", b"secret-c")
+    engine.close()
+
+    # A crash halfway through the last append
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 5)
+
+    engine = LogEngine(path)
+    try:
+        _expect([meta for _, meta in engine.get_all_meta()], [b"meta-a", b"meta-b"], "entries before the torn record")
+        _expect(os.path.getsize(path), size, "torn record cut off")
+        engine.add_entry(b"meta-d", b"secret-d")
+    finally:
+        engine.close()
+
+    engine = LogEngine(path)
+    try:
+        _expect(engine.count_entries(), 3, "append after recovery")
+    finally:
+        engine.close()
+
+
+def log_background_compaction(directory):
+    path = directory / "busy.vxlog"
+    engine = LogEngine(path, compact_min_bytes=4096)
+    try:
+        ids = [engine.add_entry(b"m" * 64, b"s" * 64) for _ in range(20)]
+        for round_ in range(200):
+            engine.put_usage_many([(entry_id, b"%d" % round_) for entry_id in ids])
+
+        engine._join_compactor()
+        engine.put_usage_many([(ids[0], b"last")])
+        _expect(os.path.getsize(path) < 64 * 1024, True, "log was compacted")
+        _expect(engine.get_all_usage()[0], (ids[0], b"last"), "latest usage")
+        _expect(len(engine.get_all_entries()), 20, "entries kept")
+        _expect(engine.last_error, None, "compaction error")
+    finally:
+        engine.close()
+
+    engine = LogEngine(path)
+    try:
+        _expect(engine.get_all_usage()[1], (ids[1], b"199"), "usage after reopen")
+    finally:
+        engine.close()
+
+
+def log_single_writer(directory):
+    path = directory / "shared.vxlog"
+    engine = LogEngine(path)
+    try:
+        engine.add_entry(b"meta-a", b"secret-a")
+        try:
+            LogEngine(path).close()
+        except VaultInUse:
+            pass
+        else:
+            raise AssertionError("second writer: opened, expected VaultInUse")
+    finally:
+        engine.close()
+
+    # Released on close
+    engine = LogEngine(path)
+    try:
+        _expect(engine.count_entries(), 1, "entries after reopen")
+    finally:
+        engine.close()
+
+
+def sqlite_data_version(directory):
+    path = directory / "shared.db"
+    engine, other = SqliteEngine(path), SqliteEngine(path)
+    try:
+        version = engine.data_version
+        engine.add_entry(b"meta-a", b"secret-a")
+        _expect(engine.data_version, version, "version after an own write")
+
+        other.add_entry(b"meta-b", b"secret-b")
+        _expect(engine.data_version != version, True, "version changed by another connection")
+    finally:
+        other.close()
+        engine.close()
+
+
+ENGINE_CHECKS = {
+    "log": (log_torn_tail, log_background_compaction, log_single_writer),
+    "sqlite": (sqlite_data_version,),
+}
+
+
+# ========================
+# Runner
+# ========================
+
+def run(names=None) -> int:
+    """
+    Run every check against the named engines (default: all).
+    Returns the number of failures.
+    """
+    failures = 0
+
+    for name in names or ENGINES:
+        cls = ENGINES[name]
+        checks = [(fn.__name__, lambda d, fn=fn: fn(cls, d)) for fn in CHECKS]
+        checks += [(fn.__name__, fn) for fn in ENGINE_CHECKS.get(name, ())]
+
+        for check_name, fn in checks:
+            with tempfile.TemporaryDirectory(prefix="vaultx-conformance-") as tmp:
+                try:
+                    fn(Path(tmp))
+                except Exception as e:
+                    failures += 1
+                    print(f"FAIL {name}.{check_name}: {type(e).__name__}: {e}")
+                else:
+                    print(f"ok   {name}.{check_name}")
+
+    return failures
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    unknown = [name for name in argv if name not in ENGINES]
+    if unknown:
+        sys.exit(f"Unknown engine(s): {', '.join(unknown)}")
+
+    failures = run(argv)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
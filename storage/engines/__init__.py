@@ -0,0 +1,17 @@
+# storage/engines/__init__.py
+
+from storage.engines.base import StorageEngine, VaultInUse
+from storage.engines.log import LogEngine
+from storage.engines.sqlite import SqliteEngine
+
+ENGINES = {
+    "sqlite": SqliteEngine,
+    "log": LogEngine,
+}
+
+
+def engine_class(name: str) -> type[StorageEngine]:
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown storage engine: {name}") from None
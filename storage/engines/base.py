@@ -0,0 +1,197 @@
+# storage/engines/base.py
+
+
+class VaultInUse(OSError):
+    """
+    The vault is open in another process and the engine only allows
+    one (the log engine: its in-memory index must see every write).
+    """
+
+
+class StorageEngine:
+    """
+    Persistence contract behind VaultStorage.
+
+    Engines store opaque blobs (everything sensitive is encrypted
+    before it gets here) in five collections: the single account row,
+    entries (id -> meta, secret, legacy blob), usage (id -> blob), the
+    rekey journal and the rekey staging area. Rows come back as plain
+    tuples; VaultStorage wraps them and owns the policy (aborting a
+    paused rekey on edits, etc).
+
+    Every write method is atomic: it is either fully visible after a
+    crash or not at all. storage/conformance.py checks an engine
+    against this contract.
+    """
+
+    # File suffix for the vault and its snapshots
+    SUFFIX = ""
+
+    def __init__(self, path):
+        self.path = path
+
+    def close(self):
+        raise NotImplementedError
+
+    @property
+    def changes(self) -> int:
+        """
+        Rows written since the engine was opened.
+        """
+        raise NotImplementedError
+
+    @property
+    def data_version(self) -> int:
+        """
+        A value that differs between two reads if another process
+        wrote to the vault in between (writes through this engine do
+        not change it).
+        """
+        raise NotImplementedError
+
+    # ========================
+    # Account
+    # ========================
+
+    def has_account(self) -> bool:
+        raise NotImplementedError
+
+    def create_account(self, username_hash, salt, verifier, wrapped_dek, kdf):
+        raise NotImplementedError
+
+    def get_account(self) -> tuple | None:
+        """
+        (username_hash, salt, verifier, wrapped_dek, kdf) or None.
+        """
+        raise NotImplementedError
+
+    def update_account(self, username_hash, salt, verifier, wrapped_dek, kdf):
+        raise NotImplementedError
+
+    # ========================
+    # Entries
+    # ========================
+
+    def add_entry(self, meta: bytes, secret: bytes) -> int:
+        raise NotImplementedError
+
+    def add_entries(self, rows) -> int:
+        """
+        rows: (meta, secret). Returns the number inserted.
+        """
+        raise NotImplementedError
+
+    def count_entries(self) -> int:
+        raise NotImplementedError
+
+    def get_all_meta(self) -> list[tuple[int, bytes]]:
+        """
+        (id, meta) for every split entry, in id order.
+        """
+        raise NotImplementedError
+
+    def get_secret(self, entry_id: int) -> bytes | None:
+        raise NotImplementedError
+
+    def get_all_entries(self) -> list[tuple[int, bytes, bytes]]:
+        raise NotImplementedError
+
+    def get_entries_after(self, last_id: int, limit: int) -> list[tuple[int, bytes, bytes]]:
+        raise NotImplementedError
+
+    def update_entry(self, entry_id: int, meta: bytes, secret: bytes):
+        raise NotImplementedError
+
+    def update_meta(self, entry_id: int, meta: bytes):
+        raise NotImplementedError
+
+    def delete_entry(self, entry_id: int):
+        """
+        Also drops the entry's usage row.
+        """
+        raise NotImplementedError
+
+    # ========================
+    # Usage
+    # ========================
+
+    def get_all_usage(self) -> list[tuple[int, bytes]]:
+        raise NotImplementedError
+
+    def get_usage(self, entry_id: int) -> bytes | None:
+        raise NotImplementedError
+
+    def put_usage_many(self, rows):
+        raise NotImplementedError
+
+    # ========================
+    # Legacy (single-blob) entries
+    # ========================
+
+    def get_legacy_entries(self) -> list[tuple[int, bytes]]:
+        raise NotImplementedError
+
+    def replace_legacy_entries(self, rows):
+        raise NotImplementedError
+
+    # ========================
+    # Rekey
+    # ========================
+
+    def get_rekey_journal(self) -> tuple | None:
+        """
+        (username_hash, salt, verifier, wrapped_dek, kdf, last_id, total)
+        or None.
+        """
+        raise NotImplementedError
+
+    def begin_rekey(self, username_hash, salt, verifier, wrapped_dek, kdf) -> int:
+        raise NotImplementedError
+
+    def count_rekey_staged(self) -> int:
+        raise NotImplementedError
+
+    def stage_rekey_batch(self, rows, last_id: int):
+        raise NotImplementedError
+
+    def finish_rekey(self, usage_rows):
+        """
+        Staged entries replace their originals, usage is replaced by
+        usage_rows, the journal's credentials become the account, and
+        the journal and staging area are cleared. One atomic write.
+        """
+        raise NotImplementedError
+
+    def abort_rekey(self):
+        raise NotImplementedError
+
+    # ========================
+    # Maintenance
+    # ========================
+
+    def compact(self):
+        """
+        Reclaim space now (blocking).
+        """
+        raise NotImplementedError
+
+    def backup_to(self, path, pages: int = -1, sleep: float = 0.0):
+        """
+        Write a consistent, checked copy to path. Safe to call from a
+        worker thread while the engine is in use.
+        """
+        raise NotImplementedError
+
+    def restore_from(self, path):
+        """
+        Replace the contents with a snapshot made by backup_to().
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def read_snapshot_account(cls, path) -> tuple | None:
+        """
+        Check a snapshot and return its account row, read-only.
+        Raises ValueError if the snapshot is damaged.
+        """
+        raise NotImplementedError
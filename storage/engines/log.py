@@ -0,0 +1,796 @@
+# storage/engines/log.py
+
+import mmap
+import os
+import sys
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right, insort
+from pathlib import Path
+
+from storage.engines.base import StorageEngine, VaultInUse
+
+from config import LOG_COMPACT_MIN_BYTES, LOG_FSYNC
+
+# File layout:
+#   MAGIC
+#   records: <II (payload length, crc32 of payload) + payload
+#
+# A payload is a run of ops, applied together or not at all:
+#   <BBq (op, table, key), and for PUT: <I length + value
+#
+# A value is a list of byte fields: <H count, <i length per field
+# (-1 = None), then the fields back to back.
+MAGIC = b"VXLOG\x01\r\n"
+
+_HEADER = struct.Struct("<II")
+_OP = struct.Struct("<BBq")
+_LEN = struct.Struct("<I")
+_INT = struct.Struct("<q")
+
+PUT, DEL, CLEAR, MERGE = 1, 2, 3, 4
+
+# MERGE points every staged id that still exists in ENTRIES at its
+# staged value, then empties STAGE. Staged values are stored in the
+# entry layout, so finishing a rekey rewrites no entry data.
+ACCOUNT, ENTRIES, USAGE, JOURNAL, STAGE = range(5)
+_TABLES = (ACCOUNT, ENTRIES, USAGE, JOURNAL, STAGE)
+
+# Index bytes counted per live value besides the value itself
+_OVERHEAD = _OP.size + _LEN.size
+
+# Compaction writes records of about this size
+_COMPACT_RECORD = 1 << 20
+
+# backup_to() copies pages * _PAGE bytes per step, like sqlite3's backup
+_PAGE = 4096
+
+
+class LogEngine(StorageEngine):
+    """
+    Append-only record log, read through mmap.
+
+    Every write is one checksummed record appended to the file (and
+    fsynced when LOG_FSYNC is set), so a batch of usage rows or a
+    rekey batch costs one sequential write. Opening the log replays
+    it into an in-memory index of (offset, length) per key; a torn or
+    corrupt tail left by a crash is cut off. Values are the app's
+    AES-GCM blobs; ids and the index layout are plaintext, as they
+    are in SQLite.
+
+    Overwritten values stay in the file until compaction: once the
+    dead bytes exceed max(LOG_COMPACT_MIN_BYTES, live bytes) a worker
+    thread copies the live values into <path>.compact from its own
+    map. Records appended meanwhile are copied over when the new file
+    is swapped in, which waits while a backup is reading the file.
+
+    The index is only valid while this instance is the log's only
+    writer, so opening takes an exclusive lock on <path>.lock (a
+    separate file, as compaction and restores replace the log) and
+    raises VaultInUse if another process holds it.
+    """
+
+    SUFFIX = ".vxlog"
+
+    def __init__(
+        self,
+        path,
+        compact_min_bytes: int = LOG_COMPACT_MIN_BYTES,
+        fsync: bool = LOG_FSYNC,
+    ):
+        super().__init__(Path(path))
+        self.compact_min_bytes = compact_min_bytes
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._compactor: threading.Thread | None = None
+        self._pending = None
+        self._backups = 0
+        self._changes = 0
+
+        self.last_error: str | None = None
+
+        self._lock_file = _lock_exclusive(self.path.with_name(self.path.name + ".lock"))
+        try:
+            # Left behind by a crash mid-compaction
+            self._compact_path.unlink(missing_ok=True)
+            self._open()
+        except BaseException:
+            self._lock_file.close()
+            raise
+
+    @property
+    def _compact_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".compact")
+
+    def close(self):
+        self._join_compactor()
+        with self._lock:
+            if self._pending is not None and not self._backups:
+                self._install()
+            self._pending = None
+            self._compact_path.unlink(missing_ok=True)
+            self._close_files()
+
+        # Closing the file releases the lock
+        self._lock_file.close()
+
+    @property
+    def changes(self) -> int:
+        return self._changes
+
+    @property
+    def data_version(self) -> int:
+        # No other process can write while the lock is held
+        return 0
+
+    # ========================
+    # Account
+    # ========================
+
+    def has_account(self) -> bool:
+        return 0 in self._state.tables[ACCOUNT]
+
+    def create_account(self, username_hash, salt, verifier, wrapped_dek, kdf):
+        with self._lock:
+            if self.has_account():
+                raise ValueError("Account already exists")
+
+            batch = _Batch()
+            batch.put(ACCOUNT, 0, _account_fields(username_hash, salt, verifier, wrapped_dek, kdf))
+            self._commit(batch)
+
+    def get_account(self):
+        fields = self._get(ACCOUNT, 0)
+        return _account_row(fields) if fields else None
+
+    def update_account(self, username_hash, salt, verifier, wrapped_dek, kdf):
+        with self._lock:
+            if not self.has_account():
+                return
+
+            batch = _Batch()
+            batch.put(ACCOUNT, 0, _account_fields(username_hash, salt, verifier, wrapped_dek, kdf))
+            self._commit(batch)
+
+    # ========================
+    # Entries
+    # ========================
+
+    def add_entry(self, meta: bytes, secret: bytes) -> int:
+        with self._lock:
+            entry_id = self._state.next_id
+            batch = _Batch()
+            batch.put(ENTRIES, entry_id, (meta, secret, b""))
+            self._commit(batch)
+            return entry_id
+
+    def add_entries(self, rows) -> int:
+        with self._lock:
+            entry_id = self._state.next_id
+            batch = _Batch()
+            for meta, secret in rows:
+                batch.put(ENTRIES, entry_id, (meta, secret, b""))
+                entry_id += 1
+
+            count = entry_id - self._state.next_id
+            if count:
+                self._commit(batch)
+            return count
+
+    def count_entries(self) -> int:
+        # Log vaults are created split; legacy rows only exist in
+        # SQLite vaults from before the split
+        return len(self._state.ids)
+
+    def get_all_meta(self):
+        with self._lock:
+            return [(entry_id, self._get(ENTRIES, entry_id)[0]) for entry_id in self._state.ids]
+
+    def get_secret(self, entry_id: int) -> bytes | None:
+        fields = self._get(ENTRIES, entry_id)
+        return fields[1] if fields else None
+
+    def get_all_entries(self):
+        with self._lock:
+            return [self._entry_row(entry_id) for entry_id in self._state.ids]
+
+    def get_entries_after(self, last_id: int, limit: int):
+        with self._lock:
+            ids = self._state.ids
+            start = bisect_right(ids, last_id)
+            return [self._entry_row(entry_id) for entry_id in ids[start:start + limit]]
+
+    def update_entry(self, entry_id: int, meta: bytes, secret: bytes):
+        with self._lock:
+            if entry_id not in self._state.tables[ENTRIES]:
+                return
+
+            batch = _Batch()
+            batch.put(ENTRIES, entry_id, (meta, secret, b""))
+            self._commit(batch)
+
+    def update_meta(self, entry_id: int, meta: bytes):
+        with self._lock:
+            fields = self._get(ENTRIES, entry_id)
+            if not fields:
+                return
+
+            batch = _Batch()
+            batch.put(ENTRIES, entry_id, (meta, fields[1], fields[2]))
+            self._commit(batch)
+
+    def delete_entry(self, entry_id: int):
+        with self._lock:
+            batch = _Batch()
+            if entry_id in self._state.tables[ENTRIES]:
+                batch.delete(ENTRIES, entry_id)
+            if entry_id in self._state.tables[USAGE]:
+                batch.delete(USAGE, entry_id)
+
+            if batch:
+                self._commit(batch)
+
+    # ========================
+    # Usage
+    # ========================
+
+    def get_all_usage(self):
+        with self._lock:
+            usage = self._state.tables[USAGE]
+            return [(entry_id, self._get(USAGE, entry_id)[0]) for entry_id in sorted(usage)]
+
+    def get_usage(self, entry_id: int) -> bytes | None:
+        fields = self._get(USAGE, entry_id)
+        return fields[0] if fields else None
+
+    def put_usage_many(self, rows):
+        batch = _Batch()
+        for entry_id, blob in rows:
+            batch.put(USAGE, entry_id, (blob,))
+
+        if batch:
+            self._commit(batch)
+
+    # ========================
+    # Legacy (single-blob) entries
+    # ========================
+
+    def get_legacy_entries(self):
+        return []
+
+    def replace_legacy_entries(self, rows):
+        batch = _Batch()
+        for entry_id, meta, secret in rows:
+            batch.put(ENTRIES, entry_id, (meta, secret, b""))
+
+        if batch:
+            self._commit(batch)
+
+    # ========================
+    # Rekey
+    # ========================
+
+    def get_rekey_journal(self):
+        fields = self._get(JOURNAL, 0)
+        if not fields:
+            return None
+
+        return _account_row(fields[:5]) + (
+            _INT.unpack(fields[5])[0],
+            _INT.unpack(fields[6])[0],
+        )
+
+    def begin_rekey(self, username_hash, salt, verifier, wrapped_dek, kdf) -> int:
+        with self._lock:
+            total = self.count_entries()
+
+            batch = _Batch()
+            batch.clear(STAGE)
+            batch.put(JOURNAL, 0, _account_fields(username_hash, salt, verifier, wrapped_dek, kdf) + (
+                _INT.pack(0),
+                _INT.pack(total),
+            ))
+            self._commit(batch)
+            return total
+
+    def count_rekey_staged(self) -> int:
+        return len(self._state.tables[STAGE])
+
+    def stage_rekey_batch(self, rows, last_id: int):
+        with self._lock:
+            journal = self._get(JOURNAL, 0)
+            if not journal:
+                raise ValueError("No rekey in progress")
+
+            batch = _Batch()
+            for entry_id, meta, secret in rows:
+                batch.put(STAGE, entry_id, (meta, secret, b""))
+            batch.put(JOURNAL, 0, journal[:5] + (_INT.pack(last_id), journal[6]))
+            self._commit(batch)
+
+    def finish_rekey(self, usage_rows):
+        with self._lock:
+            journal = self._get(JOURNAL, 0)
+            if not journal:
+                raise ValueError("No rekey in progress")
+
+            batch = _Batch()
+            batch.clear(USAGE)
+            for entry_id, blob in usage_rows:
+                batch.put(USAGE, entry_id, (blob,))
+            batch.merge()
+            if self.has_account():
+                batch.put(ACCOUNT, 0, journal[:5])
+            batch.delete(JOURNAL, 0)
+            self._commit(batch)
+
+    def abort_rekey(self):
+        with self._lock:
+            batch = _Batch()
+            batch.clear(STAGE)
+            if 0 in self._state.tables[JOURNAL]:
+                batch.delete(JOURNAL, 0)
+            self._commit(batch)
+
+    # ========================
+    # Maintenance
+    # ========================
+
+    def compact(self):
+        self._join_compactor()
+        with self._lock:
+            if self._pending is None:
+                self._start_compaction()
+        self._join_compactor()
+
+    def backup_to(self, path, pages: int = -1, sleep: float = 0.0):
+        # Everything before the committed end is immutable until the
+        # next compaction swap, which waits for self._backups to drop
+        with self._lock:
+            end = self._end
+            self._backups += 1
+
+        try:
+            step = pages * _PAGE if pages > 0 else end
+            with open(self.path, "rb") as source, open(path, "wb") as target:
+                copied = 0
+                while copied < end:
+                    chunk = source.read(min(step, end - copied))
+                    if not chunk:
+                        raise OSError("Log shrank during backup")
+                    target.write(chunk)
+                    copied += len(chunk)
+                    if sleep and copied < end:
+                        time.sleep(sleep)
+
+                target.flush()
+                os.fsync(target.fileno())
+        finally:
+            with self._lock:
+                self._backups -= 1
+
+        self.read_snapshot_account(path)
+
+    def restore_from(self, path):
+        # Check the whole snapshot before touching the live log
+        self.read_snapshot_account(path)
+        self._join_compactor()
+
+        with self._lock:
+            self._pending = None
+            self._compact_path.unlink(missing_ok=True)
+
+            incoming = self.path.with_name(self.path.name + ".restore")
+            with open(path, "rb") as source, open(incoming, "wb") as target:
+                while chunk := source.read(_COMPACT_RECORD):
+                    target.write(chunk)
+                target.flush()
+                os.fsync(target.fileno())
+
+            self._close_files()
+            os.replace(incoming, self.path)
+            self._open()
+
+    @classmethod
+    def read_snapshot_account(cls, path):
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < len(MAGIC):
+                raise ValueError("Snapshot is damaged: file is truncated")
+
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if buf[:len(MAGIC)] != MAGIC:
+                    raise ValueError("Snapshot is damaged: not a VaultX log")
+
+                records, end = _scan(buf, len(MAGIC), size)
+                if end != size:
+                    raise ValueError("Snapshot is damaged: torn or corrupt record")
+
+                state = _Index()
+                for start, stop in records:
+                    state.apply(buf[start:stop], start)
+
+                loc = state.tables[ACCOUNT].get(0)
+                return _account_row(_unpack(buf[loc[0]:loc[0] + loc[1]])) if loc else None
+            finally:
+                buf.close()
+
+    # ========================
+    # Internal: file and index
+    # ========================
+
+    def _open(self):
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            with open(self.path, "wb") as f:
+                f.write(MAGIC)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._close_files()
+            raise ValueError(f"{self.path} is not a VaultX log")
+
+        records, end = _scan(self._map, len(MAGIC), size)
+        self._state = _Index()
+        for start, stop in records:
+            self._state.apply(self._map[start:stop], start)
+
+        if end < size:
+            # Torn tail from a crash mid-write: never acknowledged
+            self._map.close()
+            self._file.truncate(end)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._mapped = len(self._map)
+        self._end = end
+
+    def _close_files(self):
+        self._map.close()
+        self._file.close()
+
+    def _read(self, loc) -> bytes:
+        offset, length = loc
+        if offset + length > self._mapped:
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped = len(self._map)
+        return self._map[offset:offset + length]
+
+    def _get(self, table: int, key: int) -> tuple | None:
+        with self._lock:
+            loc = self._state.tables[table].get(key)
+            return _unpack(self._read(loc)) if loc else None
+
+    def _entry_row(self, entry_id: int) -> tuple:
+        meta, secret, _ = _unpack(self._read(self._state.tables[ENTRIES][entry_id]))
+        return entry_id, meta, secret
+
+    def _commit(self, batch: "_Batch"):
+        payload = batch.payload()
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        with self._lock:
+            offset = self._end
+            self._file.seek(offset)
+            self._file.write(record)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+            self._end = offset + len(record)
+            self._changes += self._state.apply(payload, offset + _HEADER.size)
+            self._maybe_compact()
+
+    # ========================
+    # Internal: compaction
+    # ========================
+
+    def _maybe_compact(self):
+        if self._pending is not None:
+            if not self._backups:
+                self._install()
+        elif self._compactor is None:
+            if self._end - self._state.live > max(self.compact_min_bytes, self._state.live):
+                self._start_compaction()
+
+    def _start_compaction(self):
+        self._compactor = threading.Thread(
+            target=self._compact_worker,
+            args=(self._state.copy(), self._end),
+            name="vaultx-log-compact",
+            daemon=True,
+        )
+        self._compactor.start()
+
+    def _join_compactor(self):
+        thread = self._compactor
+        if thread is not None:
+            thread.join()
+
+    def _compact_worker(self, state: "_Index", end: int):
+        path = self._compact_path
+        try:
+            with open(self.path, "rb") as source_file, open(path, "wb") as target:
+                source = mmap.mmap(source_file.fileno(), end, access=mmap.ACCESS_READ)
+                try:
+                    compacted = _write_compacted(source, state, target)
+                finally:
+                    source.close()
+
+                target.flush()
+                os.fsync(target.fileno())
+        except Exception as e:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.last_error = str(e)
+                self._compactor = None
+            return
+
+        with self._lock:
+            self.last_error = None
+            self._compactor = None
+            self._pending = (compacted, end)
+            if not self._backups:
+                self._install()
+
+    def _install(self):
+        # Caller holds the lock and checked that no backup is reading
+        state, end = self._pending
+        self._pending = None
+
+        # Records committed while the compactor ran
+        tail = self._read((end, self._end - end)) if self._end > end else b""
+
+        with open(self._compact_path, "r+b") as target:
+            base = target.seek(0, os.SEEK_END)
+            target.write(tail)
+            target.flush()
+            os.fsync(target.fileno())
+
+        records, _ = _scan(tail, 0, len(tail))
+        for start, stop in records:
+            state.apply(tail[start:stop], base + start)
+        state.next_id = max(state.next_id, self._state.next_id)
+
+        self._close_files()
+        os.replace(self._compact_path, self.path)
+
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = len(self._map)
+        self._end = base + len(tail)
+        self._state = state
+
+
+class _Index:
+    """
+    Replayed state: table -> {key: (value offset, value length)}, plus
+    the sorted entry ids and the bytes held by live values.
+    """
+
+    def __init__(self):
+        self.tables = {table: {} for table in _TABLES}
+        self.ids: list[int] = []
+        self.next_id = 1
+        self.live = len(MAGIC)
+
+    def copy(self) -> "_Index":
+        other = _Index()
+        other.tables = {table: dict(values) for table, values in self.tables.items()}
+        other.ids = list(self.ids)
+        other.next_id = self.next_id
+        other.live = self.live
+        return other
+
+    def apply(self, payload, base: int) -> int:
+        """
+        Apply one record's ops; base is the file offset of payload[0].
+        Returns the number of rows written.
+        """
+        rows = 0
+        pos = 0
+
+        while pos < len(payload):
+            op, table, key = _OP.unpack_from(payload, pos)
+            pos += _OP.size
+            values = self.tables[table]
+
+            if op == PUT:
+                (length,) = _LEN.unpack_from(payload, pos)
+                pos += _LEN.size
+                self._drop(table, key)
+                values[key] = (base + pos, length)
+                self.live += length + _OVERHEAD
+                if table == ENTRIES:
+                    insort(self.ids, key)
+                    self.next_id = max(self.next_id, key + 1)
+                pos += length
+                rows += 1
+
+            elif op == DEL:
+                rows += self._drop(table, key)
+
+            elif op == CLEAR:
+                for key in list(values):
+                    rows += self._drop(table, key)
+
+            elif op == MERGE:
+                entries = self.tables[ENTRIES]
+                for key, loc in self.tables[STAGE].items():
+                    if key in entries:
+                        self.live -= entries[key][1] + _OVERHEAD
+                        entries[key] = loc
+                        rows += 1
+                    else:
+                        self.live -= loc[1] + _OVERHEAD
+                self.tables[STAGE] = {}
+
+            else:
+                raise ValueError(f"Unknown log op {op}")
+
+        return rows
+
+    def _drop(self, table: int, key: int) -> int:
+        loc = self.tables[table].pop(key, None)
+        if loc is None:
+            return 0
+
+        self.live -= loc[1] + _OVERHEAD
+        if table == ENTRIES:
+            del self.ids[bisect_right(self.ids, key) - 1]
+        return 1
+
+
+class _Batch:
+    """
+    The ops of one record.
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def __bool__(self) -> bool:
+        return bool(self.parts)
+
+    def put(self, table: int, key: int, fields):
+        value = _pack(fields)
+        self.parts.append(_OP.pack(PUT, table, key) + _LEN.pack(len(value)) + value)
+
+    def delete(self, table: int, key: int):
+        self.parts.append(_OP.pack(DEL, table, key))
+
+    def clear(self, table: int):
+        self.parts.append(_OP.pack(CLEAR, table, 0))
+
+    def merge(self):
+        self.parts.append(_OP.pack(MERGE, STAGE, 0))
+
+    def payload(self) -> bytes:
+        return b"".join(self.parts)
+
+
+def _scan(buf, pos: int, end: int) -> tuple[list[tuple[int, int]], int]:
+    """
+    (payload start, payload end) of each intact record from pos, and
+    where the intact records end.
+    """
+    records = []
+
+    while pos + _HEADER.size <= end:
+        length, crc = _HEADER.unpack_from(buf, pos)
+        start = pos + _HEADER.size
+        stop = start + length
+        if stop > end or zlib.crc32(buf[start:stop]) != crc:
+            break
+
+        records.append((start, stop))
+        pos = stop
+
+    return records, pos
+
+
+def _write_compacted(source, state: _Index, target) -> _Index:
+    """
+    Write state's live values from source as a fresh log; returns the
+    index of the new file.
+    """
+    compacted = _Index()
+    target.write(MAGIC)
+    offset = len(MAGIC)
+
+    def flush(batch):
+        payload = batch.payload()
+        target.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        compacted.apply(payload, offset + _HEADER.size)
+        return offset + _HEADER.size + len(payload)
+
+    batch, size = _Batch(), 0
+    for table in _TABLES:
+        for key, (start, length) in sorted(state.tables[table].items()):
+            value = source[start:start + length]
+            batch.parts.append(_OP.pack(PUT, table, key) + _LEN.pack(length) + value)
+            size += length + _OVERHEAD
+
+            if size >= _COMPACT_RECORD:
+                offset = flush(batch)
+                batch, size = _Batch(), 0
+
+    if batch:
+        flush(batch)
+
+    compacted.next_id = state.next_id
+    return compacted
+
+
+def _lock_exclusive(path: Path):
+    """
+    Open `path` and lock it without waiting; the lock lasts until the
+    returned file is closed.
+    """
+    f = open(path, "a+b")
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        raise VaultInUse(f"{path.with_suffix('')} is open in another process") from None
+    return f
+
+
+def _pack(fields) -> bytes:
+    lengths = [-1 if field is None else len(field) for field in fields]
+    return (
+        struct.pack(f"<H{len(lengths)}i", len(lengths), *lengths)
+        + b"".join(field for field in fields if field)
+    )
+
+
+def _unpack(value: bytes) -> tuple:
+    (count,) = struct.unpack_from("<H", value)
+    lengths = struct.unpack_from(f"<{count}i", value, 2)
+
+    fields = []
+    pos = 2 + 4 * count
+    for length in lengths:
+        if length < 0:
+            fields.append(None)
+        else:
+            fields.append(value[pos:pos + length])
+            pos += length
+    return tuple(fields)
+
+
+def _account_fields(username_hash, salt, verifier, wrapped_dek, kdf) -> tuple:
+    return (
+        username_hash,
+        salt,
+        verifier,
+        wrapped_dek,
+        kdf.encode("utf-8") if kdf is not None else None,
+    )
+
+
+def _account_row(fields) -> tuple:
+    username_hash, salt, verifier, wrapped_dek, kdf = fields
+    return (
+        username_hash,
+        salt,
+        verifier,
+        wrapped_dek,
+        kdf.decode("utf-8") if kdf is not None else None,
+    )
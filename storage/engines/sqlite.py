@@ -0,0 +1,411 @@
+# storage/engines/sqlite.py
+
+import sqlite3
+from pathlib import Path
+
+from storage.engines.base import StorageEngine
+
+
+class SqliteEngine(StorageEngine):
+    """
+    The original single-file SQLite vault.
+    """
+
+    SUFFIX = ".db"
+
+    def __init__(self, path):
+        super().__init__(Path(path))
+        self.conn = sqlite3.connect(self.path)
+        self._init_db()
+
+    def _init_db(self):
+        cur = self.conn.cursor()
+
+        # Single local account (hashed username + salt + verifier)
+        #   wrapped_dek -> random data key, encrypted with the
+        #                  password-derived key (NULL on old vaults)
+        #   kdf         -> Argon2 parameters for salt (NULL = defaults)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS account (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                username_hash BLOB NOT NULL,
+                salt BLOB NOT NULL,
+                verifier BLOB NOT NULL,
+                wrapped_dek BLOB,
+                kdf TEXT
+            )
+        """)
+
+        # Encrypted vault entries
+        #   meta   -> EntryMeta (site, username, domain, last_used)
+        #   secret -> EntrySecret (password, notes)
+        #   blob   -> legacy whole-entry record, empty once migrated
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                blob BLOB NOT NULL,
+                meta BLOB,
+                secret BLOB
+            )
+        """)
+
+        # Encrypted usage stats (EntryUsage), kept apart from entries so
+        # browsing never rewrites an entry record
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS usage (
+                id INTEGER PRIMARY KEY,
+                blob BLOB NOT NULL
+            )
+        """)
+
+        # Unfinished master-password rekey (see storage/rekey.py)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS rekey_journal (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                username_hash BLOB NOT NULL,
+                salt BLOB NOT NULL,
+                verifier BLOB NOT NULL,
+                wrapped_dek BLOB,
+                kdf TEXT,
+                last_id INTEGER NOT NULL,
+                total INTEGER NOT NULL
+            )
+        """)
+
+        # Columns added after the first release
+        self._add_missing_columns(cur, "account", {"wrapped_dek": "BLOB", "kdf": "TEXT"})
+        self._add_missing_columns(cur, "entries", {"meta": "BLOB", "secret": "BLOB"})
+        self._add_missing_columns(cur, "rekey_journal", {"wrapped_dek": "BLOB", "kdf": "TEXT"})
+
+        self.conn.commit()
+
+    @staticmethod
+    def _add_missing_columns(cur, table: str, columns: dict):
+        existing = {row[1] for row in cur.execute(f"PRAGMA table_info({table})")}
+        for column, sql_type in columns.items():
+            if column not in existing:
+                cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def changes(self) -> int:
+        return self.conn.total_changes
+
+    @property
+    def data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # ========================
+    # Account management
+    # ========================
+
+    def has_account(self) -> bool:
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM account")
+        return cur.fetchone()[0] > 0
+
+    def create_account(self, username_hash, salt, verifier, wrapped_dek, kdf):
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO account (id, username_hash, salt, verifier, wrapped_dek, kdf)
+            VALUES (1, ?, ?, ?, ?, ?)
+            """,
+            (username_hash, salt, verifier, wrapped_dek, kdf),
+        )
+        self.conn.commit()
+
+    def get_account(self):
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT username_hash, salt, verifier, wrapped_dek, kdf
+            FROM account WHERE id = 1
+            """
+        )
+        return cur.fetchone()
+
+    def update_account(self, username_hash, salt, verifier, wrapped_dek, kdf):
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            UPDATE account
+            SET username_hash = ?, salt = ?, verifier = ?, wrapped_dek = ?, kdf = ?
+            WHERE id = 1
+            """,
+            (username_hash, salt, verifier, wrapped_dek, kdf),
+        )
+        self.conn.commit()
+
+    # ========================
+    # Vault entries
+    # ========================
+
+    def add_entry(self, meta: bytes, secret: bytes) -> int:
+        cur = self.conn.cursor()
+        cur.execute(
+            "INSERT INTO entries (blob, meta, secret) VALUES (X'', ?, ?)",
+            (meta, secret),
+        )
+        self.conn.commit()
+        return cur.lastrowid
+
+    def add_entries(self, rows) -> int:
+        with self.conn:
+            cur = self.conn.executemany(
+                "INSERT INTO entries (blob, meta, secret) VALUES (X'', ?, ?)",
+                rows,
+            )
+        return cur.rowcount
+
+    def count_entries(self) -> int:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT COUNT(*) FROM entries WHERE meta IS NOT NULL"
+        )
+        return cur.fetchone()[0]
+
+    def get_all_meta(self):
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT id, meta FROM entries WHERE meta IS NOT NULL ORDER BY id"
+        )
+        return cur.fetchall()
+
+    def get_secret(self, entry_id: int) -> bytes | None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT secret FROM entries WHERE id = ?",
+            (entry_id,),
+        )
+        row = cur.fetchone()
+        return row[0] if row else None
+
+    def get_all_entries(self):
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT id, meta, secret FROM entries WHERE meta IS NOT NULL ORDER BY id"
+        )
+        return cur.fetchall()
+
+    def get_entries_after(self, last_id: int, limit: int):
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT id, meta, secret FROM entries
+            WHERE id > ? AND meta IS NOT NULL
+            ORDER BY id LIMIT ?
+            """,
+            (last_id, limit),
+        )
+        return cur.fetchall()
+
+    def update_entry(self, entry_id: int, meta: bytes, secret: bytes):
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE entries SET meta = ?, secret = ? WHERE id = ?",
+            (meta, secret, entry_id),
+        )
+        self.conn.commit()
+
+    def update_meta(self, entry_id: int, meta: bytes):
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE entries SET meta = ? WHERE id = ?",
+            (meta, entry_id),
+        )
+        self.conn.commit()
+
+    def delete_entry(self, entry_id: int):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM entries WHERE id = ?",
+                (entry_id,),
+            )
+            self.conn.execute(
+                "DELETE FROM usage WHERE id = ?",
+                (entry_id,),
+            )
+
+    # ========================
+    # Usage
+    # ========================
+
+    def get_all_usage(self):
+        cur = self.conn.cursor()
+        cur.execute("SELECT id, blob FROM usage ORDER BY id")
+        return cur.fetchall()
+
+    def get_usage(self, entry_id: int) -> bytes | None:
+        cur = self.conn.cursor()
+        cur.execute("SELECT blob FROM usage WHERE id = ?", (entry_id,))
+        row = cur.fetchone()
+        return row[0] if row else None
+
+    def put_usage_many(self, rows):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO usage (id, blob) VALUES (?, ?)",
+                rows,
+            )
+
+    # ========================
+    # Legacy (single-blob) entries
+    # ========================
+
+    def get_legacy_entries(self):
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT id, blob FROM entries WHERE meta IS NULL ORDER BY id"
+        )
+        return cur.fetchall()
+
+    def replace_legacy_entries(self, rows):
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE entries SET blob = X'', meta = ?, secret = ? WHERE id = ?",
+                [(meta, secret, entry_id) for entry_id, meta, secret in rows],
+            )
+
+    # ========================
+    # Rekey journal
+    # ========================
+
+    def get_rekey_journal(self):
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT username_hash, salt, verifier, wrapped_dek, kdf, last_id, total
+            FROM rekey_journal WHERE id = 1
+            """
+        )
+        return cur.fetchone()
+
+    def begin_rekey(self, username_hash, salt, verifier, wrapped_dek, kdf) -> int:
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS rekey_stage")
+            self.conn.execute("""
+                CREATE TABLE rekey_stage (
+                    id INTEGER PRIMARY KEY,
+                    meta BLOB NOT NULL,
+                    secret BLOB NOT NULL
+                )
+            """)
+
+            total = self.conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE meta IS NOT NULL"
+            ).fetchone()[0]
+
+            self.conn.execute("DELETE FROM rekey_journal")
+            self.conn.execute(
+                """
+                INSERT INTO rekey_journal
+                    (id, username_hash, salt, verifier, wrapped_dek, kdf, last_id, total)
+                VALUES (1, ?, ?, ?, ?, ?, 0, ?)
+                """,
+                (username_hash, salt, verifier, wrapped_dek, kdf, total),
+            )
+
+        return total
+
+    def count_rekey_staged(self) -> int:
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM rekey_stage")
+        return cur.fetchone()[0]
+
+    def stage_rekey_batch(self, rows, last_id: int):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rekey_stage (id, meta, secret) VALUES (?, ?, ?)",
+                rows,
+            )
+            self.conn.execute(
+                "UPDATE rekey_journal SET last_id = ? WHERE id = 1",
+                (last_id,),
+            )
+
+    def finish_rekey(self, usage_rows):
+        with self.conn:
+            self.conn.execute("DELETE FROM usage")
+            self.conn.executemany(
+                "INSERT INTO usage (id, blob) VALUES (?, ?)",
+                usage_rows,
+            )
+            self.conn.execute("""
+                UPDATE entries
+                SET meta = (SELECT meta FROM rekey_stage s WHERE s.id = entries.id),
+                    secret = (SELECT secret FROM rekey_stage s WHERE s.id = entries.id)
+                WHERE id IN (SELECT id FROM rekey_stage)
+            """)
+            self.conn.execute("""
+                UPDATE account
+                SET username_hash = (SELECT username_hash FROM rekey_journal WHERE id = 1),
+                    salt = (SELECT salt FROM rekey_journal WHERE id = 1),
+                    verifier = (SELECT verifier FROM rekey_journal WHERE id = 1),
+                    wrapped_dek = (SELECT wrapped_dek FROM rekey_journal WHERE id = 1),
+                    kdf = (SELECT kdf FROM rekey_journal WHERE id = 1)
+                WHERE id = 1
+            """)
+            self.conn.execute("DROP TABLE rekey_stage")
+            self.conn.execute("DELETE FROM rekey_journal")
+
+    def abort_rekey(self):
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS rekey_stage")
+            self.conn.execute("DELETE FROM rekey_journal")
+
+    # ========================
+    # Maintenance
+    # ========================
+
+    def compact(self):
+        self.conn.execute("VACUUM")
+
+    def backup_to(self, path, pages: int = -1, sleep: float = 0.0):
+        # Own connections: this runs on a worker thread. Between steps
+        # the app's connection can write; SQLite then restarts the copy.
+        source = sqlite3.connect(self.path)
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target, pages=pages, sleep=sleep)
+            if target.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise sqlite3.DatabaseError("Snapshot failed integrity check")
+        finally:
+            target.close()
+            source.close()
+
+    def restore_from(self, path):
+        # Copy into the open connection, so self.conn stays valid
+        source = _open_readonly(path)
+        try:
+            source.backup(self.conn)
+        finally:
+            source.close()
+
+        # Snapshots from older versions may predate newer columns
+        self._init_db()
+
+    @classmethod
+    def read_snapshot_account(cls, path):
+        conn = _open_readonly(path)
+        try:
+            if conn.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise ValueError("Snapshot is damaged")
+
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(account)")}
+            return conn.execute(
+                "SELECT username_hash, salt, verifier, {}, {} FROM account WHERE id = 1".format(
+                    "wrapped_dek" if "wrapped_dek" in columns else "NULL",
+                    "kdf" if "kdf" in columns else "NULL",
+                )
+            ).fetchone()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Snapshot is damaged: {e}") from e
+        finally:
+            conn.close()
+
+
+def _open_readonly(path) -> sqlite3.Connection:
+    return sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
@@ -0,0 +1,128 @@
+# storage/loader.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from models.entry import EntryMeta, VaultEntry
+
+from config import (
+    DECRYPT_WORKERS,
+    DECRYPT_CHUNK_SIZE,
+    DECRYPT_USE_PROCESSES,
+)
+
+
+def load_entries(
+    rows,
+    session,
+    workers: int = DECRYPT_WORKERS,
+    chunk_size: int = DECRYPT_CHUNK_SIZE,
+    use_processes: bool = DECRYPT_USE_PROCESSES,
+    record_type=EntryMeta,
+):
+    """
+    Decrypt + deserialize (entry_id, blob) rows into record_type.
+
+    Rows are split into chunks. AES-GCM releases the GIL, so chunks are
+    decrypted on a thread pool sharing one CipherSession; JSON parsing
+    optionally moves to a process pool. Results come back in the
+    original row order.
+
+    workers <= 0 means "one per core". Small inputs or workers == 1
+    take the serial path.
+    """
+    rows = list(rows)
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 or len(rows) <= chunk_size:
+        return _decode_chunk(rows, session, record_type)
+
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+    if use_processes:
+        return _load_with_processes(chunks, session, workers, record_type)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for decoded in pool.map(
+            _decode_chunk,
+            chunks,
+            [session] * len(chunks),
+            [record_type] * len(chunks),
+        ):
+            results.extend(decoded)
+
+    return results
+
+
+def _load_with_processes(chunks, session, workers: int, record_type):
+    """
+    Decrypt on threads, parse on processes. The key never leaves
+    this process; only plaintext chunks are shipped to the workers.
+    """
+    # multiprocessing is slow to import and off by default
+    from concurrent.futures import ProcessPoolExecutor
+
+    ids = []
+    parsed = []
+
+    with ThreadPoolExecutor(max_workers=workers) as threads, \
+            ProcessPoolExecutor(max_workers=workers) as processes:
+
+        decrypted = [threads.submit(_decrypt_chunk, chunk, session) for chunk in chunks]
+
+        for future in decrypted:
+            chunk_ids, plaintexts = future.result()
+            ids.append(chunk_ids)
+            parsed.append(processes.submit(_parse_chunk, plaintexts, record_type))
+
+        results = []
+        for chunk_ids, future in zip(ids, parsed):
+            results.extend(zip(chunk_ids, future.result()))
+
+    return results
+
+
+def migrate_legacy_entries(storage, session) -> int:
+    """
+    Split pre-metadata single-blob entries into meta + secret records.
+    Needs the unlocked session, so it runs on unlock. Returns the
+    number of migrated rows.
+    """
+    legacy = storage.get_legacy_entries()
+    if not legacy:
+        return 0
+
+    rows = []
+    for entry_id, entry in load_entries(legacy, session, record_type=VaultEntry):
+        meta, secret = entry.split()
+        rows.append((
+            entry_id,
+            session.encrypt(meta.serialize()),
+            session.encrypt(secret.serialize()),
+        ))
+
+    storage.replace_legacy_entries(rows)
+    return len(rows)
+
+
+# ========================
+# Chunk workers
+# ========================
+
+def _decode_chunk(rows, session, record_type):
+    entry_ids, plaintexts = _decrypt_chunk(rows, session)
+    return list(zip(entry_ids, _parse_chunk(plaintexts, record_type)))
+
+
+def _decrypt_chunk(rows, session):
+    return (
+        [entry_id for entry_id, _ in rows],
+        session.decrypt_many(blob for _, blob in rows),
+    )
+
+
+def _parse_chunk(plaintexts, record_type):
+    return [record_type.deserialize(data) for data in plaintexts]
@@ -0,0 +1,168 @@
+# storage/rekey.py
+
+from crypto.cipher import CipherSession, generate_key, wrap_key, unwrap_key
+from storage.loader import migrate_legacy_entries
+
+from config import REKEY_BATCH_SIZE
+
+
+class RekeyEngine:
+    """
+    Re-encrypts every entry from one cipher session to another.
+
+    Entries are paged out of SQLite by id, re-encrypted a batch at a
+    time and written to a staging table with executemany. Each batch
+    commit also advances the rekey journal, so an interrupted run can
+    resume where it stopped or be rolled back. Nothing visible changes
+    until finish(), which swaps the staged entries and the new account
+    credentials in a single transaction.
+
+    The journal stores the new salt/verifier and the new data key
+    wrapped under the new password-derived key, never a bare key:
+    resuming needs the new master password again.
+    """
+
+    def __init__(
+        self,
+        storage,
+        old_session,
+        new_session,
+        batch_size: int = REKEY_BATCH_SIZE,
+    ):
+        self.storage = storage
+        self.old_session = old_session
+        self.new_session = new_session
+        self.batch_size = batch_size
+
+        self.last_id = 0
+        self.done = 0
+        self.total = 0
+
+    # ========================
+    # Lifecycle
+    # ========================
+
+    def start(
+        self,
+        username_hash: bytes,
+        salt: bytes,
+        verifier: bytes,
+        wrapped_dek: bytes,
+        kdf: str,
+    ):
+        self.total = self.storage.begin_rekey(
+            username_hash, salt, verifier, wrapped_dek, kdf
+        )
+        self.last_id = 0
+        self.done = 0
+
+    def resume(self):
+        journal = self.storage.get_rekey_journal()
+        if journal is None:
+            raise RuntimeError("No rekey in progress")
+
+        self.last_id = journal.last_id
+        self.total = journal.total
+        self.done = self.storage.count_rekey_staged()
+
+    def step(self) -> bool:
+        """
+        Re-encrypt one batch. Returns True once every entry is staged.
+        """
+        rows = self.storage.get_entries_after(self.last_id, self.batch_size)
+        if not rows:
+            return True
+
+        entry_ids = [entry_id for entry_id, _, _ in rows]
+        metas = self.new_session.encrypt_many(
+            self.old_session.decrypt_many(meta for _, meta, _ in rows)
+        )
+        secrets = self.new_session.encrypt_many(
+            self.old_session.decrypt_many(secret for _, _, secret in rows)
+        )
+
+        self.last_id = entry_ids[-1]
+        self.storage.stage_rekey_batch(
+            list(zip(entry_ids, metas, secrets)),
+            self.last_id,
+        )
+
+        self.done += len(rows)
+        return len(rows) < self.batch_size
+
+    def finish(self):
+        # The usage table is small; re-encrypt it inside the swap
+        usage = self.storage.get_all_usage()
+        blobs = self.new_session.encrypt_many(
+            self.old_session.decrypt_many(blob for _, blob in usage)
+        )
+        self.storage.finish_rekey(
+            list(zip((entry_id for entry_id, _ in usage), blobs))
+        )
+
+    def rollback(self):
+        self.storage.abort_rekey()
+
+    def run(self, progress=None):
+        """
+        Blocking helper: step to completion, then finish.
+        progress(done, total) is called after every batch.
+        """
+        while not self.step():
+            if progress:
+                progress(self.done, self.total)
+
+        if progress:
+            progress(self.done, self.total)
+
+        self.finish()
+
+
+def migrate_to_envelope(storage, kek: bytes) -> bytes:
+    """
+    One-time upgrade of a vault whose entries are encrypted directly
+    with the password-derived key: pick a random data key, wrap it,
+    and re-encrypt every entry under it. An interrupted upgrade is
+    resumed on the next login with the same password.
+
+    Returns the data key.
+    """
+    account = storage.get_account()
+    journal = storage.get_rekey_journal()
+    old_session = CipherSession(kek)
+
+    # Entries from before the meta/secret split are still under the kek
+    migrate_legacy_entries(storage, old_session)
+
+    resumed_dek = None
+    if (
+        journal
+        and journal.salt == account.salt
+        and journal.kdf == account.kdf
+        and journal.wrapped_dek
+    ):
+        try:
+            resumed_dek = unwrap_key(kek, journal.wrapped_dek)
+        except Exception:
+            resumed_dek = None
+
+    dek = resumed_dek or generate_key()
+    new_session = CipherSession(dek)
+    engine = RekeyEngine(storage, old_session, new_session)
+
+    if resumed_dek:
+        engine.resume()
+    else:
+        engine.start(
+            account.username_hash,
+            account.salt,
+            account.verifier,
+            wrap_key(kek, dek),
+            account.kdf,
+        )
+
+    engine.run()
+
+    old_session.wipe()
+    new_session.wipe()
+    return dek
@@ -0,0 +1,409 @@
+# storage/transfer.py
+
+import base64
+import csv
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from crypto.cipher import CipherSession
+from crypto.kdf import KdfParams
+from models.entry import EntryMeta, EntrySecret, VaultEntry, normalize_domain
+
+from config import DECRYPT_WORKERS, IMPORT_BATCH_SIZE
+
+# Encrypted export layout:
+#   EXPORT_MAGIC
+#   header line (JSON: version, kdf, salt)
+#   frames: >I length + AES-GCM blob of
+#           >I frame index, B last-frame flag, JSON lines
+EXPORT_MAGIC = b"VAULTX-EXPORT\n"
+EXPORT_VERSION = 1
+
+_FRAME_LEN = struct.Struct(">I")
+_FRAME_HEAD = struct.Struct(">IB")
+
+_READ_SIZE = 64 * 1024
+
+# Header names used by browser and password manager CSV exports
+_CSV_FIELDS = {
+    "site": ("site", "name", "title", "account"),
+    "url": ("url", "login_uri", "web site", "website", "uri", "hostname"),
+    "username": ("username", "login_username", "login name", "login", "user", "email"),
+    "password": ("password", "login_password"),
+    "notes": ("notes", "note", "comments", "extra"),
+}
+
+
+# ========================
+# Readers (generators)
+# ========================
+
+def read_csv(path):
+    """
+    Yield VaultEntry per CSV row. Column names are matched against
+    common export headers, case-insensitively.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        columns = _map_columns(header)
+        if "password" not in columns:
+            raise ValueError("CSV has no password column")
+
+        for row in reader:
+            yield _to_entry({
+                field: row[i] if i < len(row) else ""
+                for field, i in columns.items()
+            })
+
+
+def read_json(path):
+    """
+    Yield VaultEntry from a JSON array of objects or from JSON lines,
+    decoding one object at a time.
+    """
+    for obj in _iter_json(path):
+        if isinstance(obj, dict):
+            yield _to_entry({key.lower(): value for key, value in obj.items()})
+
+
+def read_export_header(path) -> tuple[bytes, KdfParams] | None:
+    """
+    (salt, kdf params) of an encrypted VaultX export, or None if the
+    file is not one.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(EXPORT_MAGIC)) != EXPORT_MAGIC:
+            return None
+        header = json.loads(f.readline())
+
+    if header.get("version") != EXPORT_VERSION:
+        raise ValueError(f"Unsupported export version: {header.get('version')}")
+
+    return base64.b64decode(header["salt"]), KdfParams.decode(header["kdf"])
+
+
+def read_export(path, key: bytes):
+    """
+    Yield VaultEntry from an encrypted export, one frame at a time.
+    key is derived from the export password with the header's salt
+    and parameters.
+    """
+    session = CipherSession(key)
+    try:
+        with open(path, "rb") as f:
+            f.read(len(EXPORT_MAGIC))
+            f.readline()
+
+            index = 0
+            while True:
+                size = f.read(_FRAME_LEN.size)
+                if len(size) < _FRAME_LEN.size:
+                    raise ValueError("Export file is truncated")
+
+                frame = session.decrypt(f.read(_FRAME_LEN.unpack(size)[0]))
+                frame_index, last = _FRAME_HEAD.unpack_from(frame)
+                if frame_index != index:
+                    raise ValueError("Export frames are out of order")
+
+                for line in frame[_FRAME_HEAD.size:].splitlines():
+                    yield VaultEntry(**json.loads(line))
+
+                if last:
+                    return
+                index += 1
+    finally:
+        session.wipe()
+
+
+def open_records(path):
+    """
+    Reader for a plaintext CSV or JSON file, by extension.
+    """
+    if os.fspath(path).lower().endswith(".csv"):
+        return read_csv(path)
+    return read_json(path)
+
+
+# ========================
+# Import
+# ========================
+
+class BulkImporter:
+    """
+    Streams VaultEntry records into the vault.
+
+    Each step() pulls one batch from the reader, drops sites that
+    already exist (in the vault or earlier in the file), encrypts the
+    batch on a thread pool and inserts it in one transaction. Only
+    one batch is held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        storage,
+        session,
+        records,
+        existing_sites,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        workers: int = DECRYPT_WORKERS,
+    ):
+        self.storage = storage
+        self.session = session
+        self.records = iter(records)
+        self.seen = {site.lower() for site in existing_sites}
+        self.batch_size = batch_size
+
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+        self.read = 0
+        self.imported = 0
+        self.skipped = 0
+
+    def step(self) -> bool:
+        """
+        Import one batch. Returns True once the reader is exhausted.
+        """
+        batch = list(islice(self.records, self.batch_size))
+        self.read += len(batch)
+
+        metas, secrets = [], []
+        for entry in batch:
+            key = entry.site.lower()
+            if not entry.password or key in self.seen:
+                self.skipped += 1
+                continue
+
+            self.seen.add(key)
+            meta, secret = entry.split()
+            metas.append(meta.serialize())
+            secrets.append(secret.serialize())
+
+        if metas:
+            self.storage.add_entries(zip(
+                self._encrypt(metas),
+                self._encrypt(secrets),
+            ))
+            self.imported += len(metas)
+
+        return len(batch) < self.batch_size
+
+    def run(self, progress=None):
+        """
+        Blocking helper. progress(read, imported, skipped) per batch.
+        """
+        try:
+            while True:
+                done = self.step()
+                if progress:
+                    progress(self.read, self.imported, self.skipped)
+                if done:
+                    return
+        finally:
+            self.close()
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        close = getattr(self.records, "close", None)
+        if close:
+            close()
+
+    def _encrypt(self, plaintexts) -> list[bytes]:
+        size = -(-len(plaintexts) // self.workers)
+        if self.workers == 1 or size < 64:
+            return self.session.encrypt_many(plaintexts)
+
+        chunks = [plaintexts[i:i + size] for i in range(0, len(plaintexts), size)]
+        out = []
+        for blobs in self.pool.map(self.session.encrypt_many, chunks):
+            out.extend(blobs)
+        return out
+
+
+# ========================
+# Export
+# ========================
+
+class EncryptedExporter:
+    """
+    Streams the vault into an encrypted export, one frame per batch.
+
+    The export has its own key (derived from an export password), so
+    it can be imported into any vault. Entries are paged out of SQLite
+    by id; the file is written as <path>.part and moved into place by
+    finish(), so an interrupted export never looks complete.
+    """
+
+    def __init__(
+        self,
+        storage,
+        session,
+        path,
+        key: bytes,
+        salt: bytes,
+        params: KdfParams,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ):
+        self.storage = storage
+        self.session = session
+        self.path = os.fspath(path)
+        self.export_session = CipherSession(key)
+        self.batch_size = batch_size
+
+        self.last_id = 0
+        self.index = 0
+        self.done = 0
+        self.total = storage.count_entries()
+
+        self.file = open(self.path + ".part", "wb")
+        self.file.write(EXPORT_MAGIC)
+        self.file.write(json.dumps({
+            "version": EXPORT_VERSION,
+            "kdf": params.encode(),
+            "salt": base64.b64encode(salt).decode("ascii"),
+        }).encode("utf-8") + b"\n")
+
+    def step(self) -> bool:
+        """
+        Write one frame. Returns True after the last one.
+        """
+        rows = self.storage.get_entries_after(self.last_id, self.batch_size)
+        last = len(rows) < self.batch_size
+
+        metas = self.session.decrypt_many(meta for _, meta, _ in rows)
+        secrets = self.session.decrypt_many(secret for _, _, secret in rows)
+
+        lines = []
+        for meta_data, secret_data in zip(metas, secrets):
+            meta = EntryMeta.deserialize(meta_data)
+            secret = EntrySecret.deserialize(secret_data)
+            lines.append(json.dumps({
+                "site": meta.site,
+                "username": meta.username,
+                "password": secret.password,
+                "notes": secret.notes,
+                "domain": meta.domain,
+                "last_used": meta.last_used,
+            }).encode("utf-8"))
+
+        frame = _FRAME_HEAD.pack(self.index, last) + b"\n".join(lines)
+        blob = self.export_session.encrypt(frame)
+        self.file.write(_FRAME_LEN.pack(len(blob)) + blob)
+
+        if rows:
+            self.last_id = rows[-1][0]
+        self.index += 1
+        self.done += len(rows)
+        return last
+
+    def run(self, progress=None):
+        """
+        Blocking helper. progress(done, total) per frame.
+        """
+        try:
+            while not self.step():
+                if progress:
+                    progress(self.done, self.total)
+            self.finish()
+        except BaseException:
+            self.abort()
+            raise
+
+    def finish(self):
+        self.file.close()
+        self.export_session.wipe()
+        os.replace(self.path + ".part", self.path)
+
+    def abort(self):
+        self.file.close()
+        self.export_session.wipe()
+        try:
+            os.remove(self.path + ".part")
+        except OSError:
+            pass
+
+
+# ========================
+# Internal
+# ========================
+
+def _map_columns(header) -> dict[str, int]:
+    names = [name.strip().lower() for name in header]
+    columns = {}
+
+    for field, aliases in _CSV_FIELDS.items():
+        for alias in aliases:
+            if alias in names:
+                columns[field] = names.index(alias)
+                break
+
+    return columns
+
+
+def _to_entry(row: dict) -> VaultEntry:
+    url = str(row.get("url") or "").strip()
+    site = str(row.get("site") or "").strip()
+    domain = normalize_domain(url or site)
+
+    return VaultEntry(
+        site=site or domain,
+        username=str(row.get("username") or "").strip(),
+        password=str(row.get("password") or ""),
+        notes=str(row.get("notes") or ""),
+        domain=domain,
+    )
+
+
+def _iter_json(path):
+    """
+    Incremental JSON: a top-level array is decoded element by element,
+    anything else as a stream of concatenated/line-separated values.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, encoding="utf-8-sig") as f:
+        buffer = f.read(_READ_SIZE)
+        pos = _skip(buffer, 0)
+
+        in_array = buffer[pos:pos + 1] == "["
+        if in_array:
+            pos += 1
+
+        while True:
+            pos = _skip(buffer, pos, ",]" if in_array else "")
+
+            if pos >= len(buffer):
+                more = f.read(_READ_SIZE)
+                if not more:
+                    return
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                more = f.read(_READ_SIZE)
+                if not more:
+                    raise
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+
+            yield obj
+            pos = end
+
+
+def _skip(buffer: str, pos: int, extra: str = "") -> int:
+    while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in extra):
+        pos += 1
+    return pos
@@ -0,0 +1,85 @@
+# storage/usage.py
+
+import time
+
+from models.entry import EntryUsage
+from storage.loader import load_entries
+
+
+class UsageTracker:
+    """
+    Write-behind buffer for entry usage (last_used, use_count).
+
+    record() only touches memory. flush() encrypts the entries that
+    changed since the last flush and writes them in one transaction;
+    the owner calls it on a timer, on lock and on exit.
+    """
+
+    def __init__(self, storage, get_session):
+        self.storage = storage
+        self.get_session = get_session
+
+        self.usage: dict[int, EntryUsage] = {}
+        self._dirty: set[int] = set()
+
+    def load(self) -> dict[int, EntryUsage]:
+        # Records not flushed yet are newer than what is stored
+        pending = {entry_id: self.usage[entry_id] for entry_id in self._dirty}
+
+        self.usage = dict(
+            load_entries(
+                self.storage.get_all_usage(),
+                self.get_session(),
+                record_type=EntryUsage,
+            )
+        )
+        self.usage.update(pending)
+        return self.usage
+
+    def load_one(self, entry_id: int) -> EntryUsage | None:
+        """
+        Load a single entry's usage (for short sessions that touch a
+        few entries without load()).
+        """
+        if entry_id not in self.usage:
+            blob = self.storage.get_usage(entry_id)
+            if blob is not None:
+                self.usage[entry_id] = EntryUsage.deserialize(self.get_session().decrypt(blob))
+        return self.usage.get(entry_id)
+
+    def get(self, entry_id: int) -> EntryUsage | None:
+        return self.usage.get(entry_id)
+
+    def record(self, entry_id: int, timestamp: float | None = None) -> EntryUsage:
+        usage = self.usage.setdefault(entry_id, EntryUsage())
+        usage.last_used = time.time() if timestamp is None else timestamp
+        usage.use_count += 1
+
+        self._dirty.add(entry_id)
+        return usage
+
+    def forget(self, entry_id: int):
+        self.usage.pop(entry_id, None)
+        self._dirty.discard(entry_id)
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def flush(self) -> int:
+        session = self.get_session()
+        if not self._dirty or not session:
+            return 0
+
+        entry_ids = sorted(self._dirty)
+        blobs = session.encrypt_many(
+            self.usage[entry_id].serialize() for entry_id in entry_ids
+        )
+        self.storage.put_usage_many(list(zip(entry_ids, blobs)))
+
+        self._dirty.clear()
+        return len(entry_ids)
+
+    def clear(self):
+        self.usage.clear()
+        self._dirty.clear()
@@ -1,131 +1,272 @@
 # storage/vault.py
 
-import sqlite3
 from pathlib import Path
+from typing import NamedTuple
+
+from storage.engines import engine_class
+from utils.trace import trace_methods
+
+from config import STORAGE_ENGINE
 
 VAULT_PATH = Path.home() / ".vaultx"
 DB_FILE = VAULT_PATH / "vault.db"
 
 
+class Account(NamedTuple):
+    username_hash: bytes
+    salt: bytes
+    verifier: bytes
+    wrapped_dek: bytes | None
+    kdf: str | None
+
+    @property
+    def kdf_params(self):
+        from crypto.kdf import KdfParams
+        return KdfParams.decode(self.kdf)
+
+
+class RekeyJournal(NamedTuple):
+    username_hash: bytes
+    salt: bytes
+    verifier: bytes
+    wrapped_dek: bytes | None
+    kdf: str | None
+    last_id: int
+    total: int
+
+    @property
+    def kdf_params(self):
+        from crypto.kdf import KdfParams
+        return KdfParams.decode(self.kdf)
+
+
+@trace_methods("storage")
 class VaultStorage:
-    def __init__(self):
-        VAULT_PATH.mkdir(exist_ok=True)
-        self.conn = sqlite3.connect(DB_FILE)
-        self._init_db()
-
-    def _init_db(self):
-        cur = self.conn.cursor()
-
-        # Single local account (hashed username + salt + verifier)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS account (
-                id INTEGER PRIMARY KEY CHECK (id = 1),
-                username_hash BLOB NOT NULL,
-                salt BLOB NOT NULL,
-                verifier BLOB NOT NULL
-            )
-        """)
-
-        # Encrypted vault entries
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS entries (
-                id INTEGER PRIMARY KEY,
-                blob BLOB NOT NULL
-            )
-        """)
-
-        self.conn.commit()
+    """
+    The vault's persistence API. Rows live in a storage engine
+    (storage/engines); this class wraps them and owns the rules that
+    span calls, like restarting a paused rekey when an entry changes.
+    """
+
+    def __init__(self, path: Path | None = None, engine: str = STORAGE_ENGINE):
+        engine_cls = engine_class(engine)
+        self.path = Path(path) if path else VAULT_PATH / f"vault{engine_cls.SUFFIX}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine = engine_cls(self.path)
+        self._rekey_pending = self.get_rekey_journal() is not None
+
+    def close(self):
+        self.engine.close()
+
+    @property
+    def changes(self) -> int:
+        """
+        Rows written since the vault was opened.
+        """
+        return self.engine.changes
+
+    @property
+    def data_version(self) -> int:
+        """
+        Changes when another process (the app, the CLI, an agent)
+        writes to the vault; see StorageEngine.data_version.
+        """
+        return self.engine.data_version
 
     # ========================
     # Account management
     # ========================
 
     def has_account(self) -> bool:
-        cur = self.conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM account")
-        return cur.fetchone()[0] > 0
-
-    def create_account(self, username_hash: bytes, salt: bytes, verifier: bytes):
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO account (id, username_hash, salt, verifier)
-            VALUES (1, ?, ?, ?)
-            """,
-            (username_hash, salt, verifier),
-        )
-        self.conn.commit()
-
-    def get_account(self):
-        """
-        Returns (username_hash, salt, verifier) or None
-        """
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT username_hash, salt, verifier FROM account WHERE id = 1"
-        )
-        return cur.fetchone()
+        return self.engine.has_account()
+
+    def create_account(
+        self,
+        username_hash: bytes,
+        salt: bytes,
+        verifier: bytes,
+        wrapped_dek: bytes,
+        kdf: str,
+    ):
+        self.engine.create_account(username_hash, salt, verifier, wrapped_dek, kdf)
+
+    def get_account(self) -> Account | None:
+        row = self.engine.get_account()
+        return Account(*row) if row else None
 
     def update_account(
         self,
         username_hash: bytes,
         salt: bytes,
         verifier: bytes,
+        wrapped_dek: bytes,
+        kdf: str,
     ):
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            UPDATE account
-            SET username_hash = ?, salt = ?, verifier = ?
-            WHERE id = 1
-            """,
-            (username_hash, salt, verifier),
-        )
-        self.conn.commit()
+        self.engine.update_account(username_hash, salt, verifier, wrapped_dek, kdf)
 
     # ========================
     # Crypto helpers (internal)
     # ========================
 
-    def encrypt_blob(self, plaintext: bytes, key: bytes) -> bytes:
-        from crypto.cipher import encrypt
-        return encrypt(key, plaintext)
+    def encrypt_blob(self, plaintext: bytes, session) -> bytes:
+        return session.encrypt(plaintext)
 
-    def decrypt_blob(self, blob: bytes, key: bytes) -> bytes:
-        from crypto.cipher import decrypt
-        return decrypt(key, blob)
+    def decrypt_blob(self, blob: bytes, session) -> bytes:
+        return session.decrypt(blob)
 
     # ========================
     # Vault entries
     # ========================
 
-    def add_entry(self, blob: bytes):
-        cur = self.conn.cursor()
-        cur.execute(
-            "INSERT INTO entries (blob) VALUES (?)",
-            (blob,),
-        )
-        self.conn.commit()
+    def add_entry(self, meta: bytes, secret: bytes) -> int:
+        self._entries_changed()
+        return self.engine.add_entry(meta, secret)
+
+    def add_entries(self, rows) -> int:
+        """
+        rows: (meta, secret). Inserted in one transaction.
+        """
+        self._entries_changed()
+        return self.engine.add_entries(rows)
+
+    def get_all_meta(self):
+        return self.engine.get_all_meta()
+
+    def count_entries(self) -> int:
+        return self.engine.count_entries()
+
+    def get_secret(self, entry_id: int) -> bytes | None:
+        return self.engine.get_secret(entry_id)
 
     def get_all_entries(self):
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT id, blob FROM entries"
-        )
-        return cur.fetchall()
-
-    def update_entry(self, entry_id: int, blob: bytes):
-        cur = self.conn.cursor()
-        cur.execute(
-            "UPDATE entries SET blob = ? WHERE id = ?",
-            (blob, entry_id),
-        )
-        self.conn.commit()
+        return self.engine.get_all_entries()
+
+    def get_entries_after(self, last_id: int, limit: int):
+        """
+        Next page of (id, meta, secret) rows in id order.
+        """
+        return self.engine.get_entries_after(last_id, limit)
+
+    def update_entry(self, entry_id: int, meta: bytes, secret: bytes):
+        self._entries_changed()
+        self.engine.update_entry(entry_id, meta, secret)
+
+    def update_meta(self, entry_id: int, meta: bytes):
+        self._entries_changed()
+        self.engine.update_meta(entry_id, meta)
 
     def delete_entry(self, entry_id: int):
-        cur = self.conn.cursor()
-        cur.execute(
-            "DELETE FROM entries WHERE id = ?",
-            (entry_id,),
-        )
-        self.conn.commit()
+        self._entries_changed()
+        self.engine.delete_entry(entry_id)
+
+    # ========================
+    # Usage
+    # ========================
+
+    def get_all_usage(self):
+        return self.engine.get_all_usage()
+
+    def get_usage(self, entry_id: int) -> bytes | None:
+        return self.engine.get_usage(entry_id)
+
+    def put_usage_many(self, rows):
+        """
+        rows: (entry_id, blob). One transaction for the whole batch.
+        """
+        self.engine.put_usage_many(rows)
+
+    # ========================
+    # Legacy (single-blob) entries
+    # ========================
+
+    def get_legacy_entries(self):
+        return self.engine.get_legacy_entries()
+
+    def replace_legacy_entries(self, rows):
+        """
+        rows: (entry_id, meta, secret). Written in one transaction.
+        """
+        self.engine.replace_legacy_entries(rows)
+
+    # ========================
+    # Rekey journal
+    # ========================
+
+    def _entries_changed(self):
+        # Staged rows of a paused rekey would overwrite this edit when
+        # the rekey finishes, so a paused rekey restarts from scratch.
+        if self._rekey_pending:
+            self.abort_rekey()
+
+    def get_rekey_journal(self) -> RekeyJournal | None:
+        row = self.engine.get_rekey_journal()
+        return RekeyJournal(*row) if row else None
+
+    def begin_rekey(
+        self,
+        username_hash: bytes,
+        salt: bytes,
+        verifier: bytes,
+        wrapped_dek: bytes,
+        kdf: str,
+    ) -> int:
+        """
+        Start a fresh rekey journal + staging area. Returns the
+        number of entries to re-encrypt.
+        """
+        total = self.engine.begin_rekey(username_hash, salt, verifier, wrapped_dek, kdf)
+        self._rekey_pending = True
+        return total
+
+    def count_rekey_staged(self) -> int:
+        return self.engine.count_rekey_staged()
+
+    def stage_rekey_batch(self, rows, last_id: int):
+        """
+        Store one batch of re-encrypted (id, meta, secret) rows and
+        advance the journal, in one commit.
+        """
+        self.engine.stage_rekey_batch(rows, last_id)
+
+    def finish_rekey(self, usage_rows):
+        """
+        Swap staged entries, the re-encrypted usage rows and the
+        journal's account credentials in a single transaction.
+        """
+        self.engine.finish_rekey(usage_rows)
+        self._rekey_pending = False
+
+    def abort_rekey(self):
+        self.engine.abort_rekey()
+        self._rekey_pending = False
+
+    # ========================
+    # Maintenance
+    # ========================
+
+    @property
+    def suffix(self) -> str:
+        return self.engine.SUFFIX
+
+    def compact(self):
+        self.engine.compact()
+
+    def backup_to(self, path, pages: int = -1, sleep: float = 0.0):
+        """
+        Write a checked snapshot to path. Safe from a worker thread.
+        """
+        self.engine.backup_to(path, pages, sleep)
+
+    def restore_from(self, path):
+        """
+        Overwrite the vault with a snapshot from backup_to().
+        """
+        self.engine.restore_from(path)
+        self._rekey_pending = self.get_rekey_journal() is not None
+
+    def read_snapshot_account(self, path) -> Account | None:
+        """
+        Account row of a snapshot (raises ValueError if damaged).
+        """
+        row = self.engine.read_snapshot_account(path)
+        return Account(*row) if row else None
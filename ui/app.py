@@ -1,7 +1,6 @@
 # ui/app.py
 
-import hmac
-import hashlib
+import time
 
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -13,21 +12,30 @@ from PySide6.QtGui import QIcon
 from PySide6.QtCore import QTimer, QEvent
 
 from ui.login import LoginView
-from ui.vault_view import VaultView
-from storage.vault import VaultStorage
-from crypto.kdf import generate_salt, derive_key
-from utils.hotkey import GlobalHotkey
+from ui.kdf_worker import KdfWorker
 
 from config import (
     TITLE_TEXT,
     TITLE_SCROLL_SPEED_MS,
     AUTO_LOCK_MINUTES,
     LOCK_ON_BLUR,
+    KDF_RETUNE_IDLE_SECONDS,
+    KDF_RETUNE_DEADLINE_SECONDS,
 )
 
 
 class PasswordManagerApp(QMainWindow):
-    def __init__(self):
+    """
+    Main window: login, then the vault view.
+
+    Only the login view is built before the window first paints.
+    Storage, backups, the title scroll, the launcher popup, the global
+    hotkey and the crypto backends are set up by _finish_startup()
+    right after that paint, and the vault UI is imported while the
+    login key derives.
+    """
+
+    def __init__(self, profile=None):
         super().__init__()
 
         # ------------------------
@@ -41,11 +49,20 @@ class PasswordManagerApp(QMainWindow):
         # Core state
         # ------------------------
 
-        self.storage = VaultStorage()
-        self.master_key: bytes | None = None
+        # Set up by _finish_startup()
+        self.storage = None
+        self.backups = None
+        self.hotkey = None
+        self.launcher = None
+        self.session = None
+
+        self.profile = profile
+        self._painted = False
+        self._started = False
 
         self.base_title = TITLE_TEXT
         self.scroll_index = 0
+        self.setWindowTitle(self.base_title)
 
         # ------------------------
         # UI stack
@@ -55,20 +72,70 @@ class PasswordManagerApp(QMainWindow):
         self.setCentralWidget(self.stack)
 
         self.login_view = LoginView(self.login)
+        self.login_view.installEventFilter(self)
         self.stack.addWidget(self.login_view)
 
+        self.kdf_worker = KdfWorker(self)
+        # Only unlock attempts show on the login screen, not a retune
+        # or an export's derivation
+        self.kdf_worker.busy_changed.connect(
+            lambda tag, busy: self.login_view.set_busy(busy and tag == "login")
+        )
+
+        # Host calibration waits for the app to go quiet after unlock
+        self.retune_timer = QTimer(self)
+        self.retune_timer.setSingleShot(True)
+        self.retune_timer.timeout.connect(self._retune_when_idle)
+        self._pending_retune = None
+        self._retune_deadline = 0.0
+
         # ------------------------
         # Init helpers
         # ------------------------
 
-        self._init_title_scroll()
         self._init_idle_lock()
-        self._init_hotkey()
 
     # ==========================================================
     # Initialization helpers
     # ==========================================================
 
+    def _finish_startup(self):
+        """
+        Everything the login screen does not need to paint. Runs
+        once, from the event loop just after the first paint (or
+        from login() if a submit somehow gets there first).
+        """
+        if self._started:
+            return
+        self._started = True
+
+        from storage.engines import VaultInUse
+        from storage.vault import VaultStorage
+        from storage.backup import BackupManager
+
+        try:
+            self.storage = VaultStorage()
+        except VaultInUse as e:
+            QMessageBox.critical(self, "Vault in use", str(e))
+            QTimer.singleShot(0, QApplication.quit)
+            return
+
+        self.backups = BackupManager(self.storage)
+
+        self._init_title_scroll()
+        self._init_launcher()
+        self._init_hotkey()
+        self._init_backups()
+
+        # Load cryptography and argon2 now rather than on submit
+        import core.account
+
+        if self.profile:
+            self.profile.mark("deferred startup done")
+            self.profile.uninstall()
+            self.profile.report()
+            QTimer.singleShot(0, QApplication.quit)
+
     def _init_title_scroll(self):
         self.title_timer = QTimer(self)
         self.title_timer.timeout.connect(self.scroll_title)
@@ -82,9 +149,34 @@ class PasswordManagerApp(QMainWindow):
         self.reset_idle_timer()
         self.installEventFilter(self)
 
+    def _init_backups(self):
+        # Snapshot once enough rows have changed (see BACKUP_EVERY_CHANGES)
+        self.backup_timer = QTimer(self)
+        self.backup_timer.timeout.connect(self._backup_due)
+        self.backup_timer.start(15 * 1000)
+
+    def _backup_due(self):
+        # Locks instead if another process changed the vault's key
+        if hasattr(self, "vault_view") and not self.vault_view.check_storage():
+            return
+        self.backups.maybe_start()
+
+    def _init_launcher(self):
+        # Built hidden now so the hotkey only has to show it. No
+        # parent: it must not follow the main window when that is
+        # minimized.
+        from ui.launcher import LauncherPopup
+
+        self.launcher = LauncherPopup()
+        self.launcher.installEventFilter(self)
+        self.launcher.query.installEventFilter(self)
+
     def _init_hotkey(self):
+        # pynput is slow to import and starts a listener thread
+        from utils.hotkey import GlobalHotkey
+
         # NOTE: Should be toggleable in Settings later
-        self.hotkey = GlobalHotkey(self.show_launcher)
+        self.hotkey = GlobalHotkey(self.show_launcher, self)
         self.hotkey.start()
 
     # ==========================================================
@@ -96,15 +188,19 @@ class PasswordManagerApp(QMainWindow):
         self.scroll_index = (self.scroll_index + 1) % len(t)
         self.setWindowTitle(t[self.scroll_index:] + t[:self.scroll_index])
 
-    def show_launcher(self):
+    def show_launcher(self, pressed_at: float | None = None):
+        """
+        Hotkey (GUI thread): the launcher popup while unlocked,
+        otherwise the login window.
+        """
+        if self.launcher and hasattr(self, "vault_view"):
+            self.launcher.popup(pressed_at)
+            return
+
         self.show()
         self.raise_()
         self.activateWindow()
 
-        if hasattr(self, "vault_view"):
-            self.stack.setCurrentWidget(self.vault_view)
-            self.vault_view.search.setFocus()
-
     # ==========================================================
     # Auto-lock logic
     # ==========================================================
@@ -113,93 +209,109 @@ class PasswordManagerApp(QMainWindow):
         self.idle_timer.start(AUTO_LOCK_MINUTES * 60 * 1000)
 
     def eventFilter(self, obj, event):
+        if obj is self.login_view and event.type() == QEvent.Type.Paint and not self._painted:
+            self._painted = True
+            if self.profile:
+                self.profile.mark("first paint")
+
+            # Runs after this paint has been flushed to the screen
+            QTimer.singleShot(0, self._finish_startup)
+
+        # Leaving the app from the launcher is a blur too
+        if (
+            LOCK_ON_BLUR
+            and obj is self.launcher
+            and event.type() == QEvent.Type.ActivationChange
+            and QApplication.activeWindow() is None
+        ):
+            self.lock()
+
         if event.type() in (
             QEvent.Type.MouseMove,
             QEvent.Type.KeyPress,
         ):
             self.reset_idle_timer()
+            if self.retune_timer.isActive():
+                self._arm_retune()
 
         return super().eventFilter(obj, event)
 
     def changeEvent(self, event):
+        # Focus moving to the launcher or to one of this window's
+        # dialogs is not a blur
         if (
             LOCK_ON_BLUR
             and event.type() == QEvent.Type.ActivationChange
             and not self.isActiveWindow()
+            and not self._owns(QApplication.activeWindow())
         ):
             self.lock()
 
         super().changeEvent(event)
 
+    def _owns(self, window) -> bool:
+        if window is not None and window is self.launcher:
+            return True
+        while window is not None:
+            if window is self:
+                return True
+            window = window.parentWidget()
+        return False
+
+    def closeEvent(self, event):
+        if self.launcher:
+            self.launcher.detach()
+
+        if hasattr(self, "vault_view"):
+            self.vault_view.flush_usage()
+
+        # Let a running snapshot finish before the process goes away
+        if self.backups:
+            self.backups.wait()
+
+        super().closeEvent(event)
+
     # ==========================================================
     # Vault lifecycle
     # ==========================================================
 
     def login(self, username: str, password: str):
-        try:
-            # ------------------------
-            # First run: create account
-            # ------------------------
+        """
+        Start key derivation in the background. A newer submit
+        supersedes this one; the result lands in _unlock().
+        """
+        self._finish_startup()
+        if self.storage is None:
+            return
 
-            if not self.storage.has_account():
-                salt = generate_salt()
-                key = derive_key(password, salt)
+        from core.account import unlock_params
 
-                username_hash = hmac.new(
-                    key,
-                    username.encode("utf-8"),
-                    hashlib.sha256,
-                ).digest()
+        account, salt, params = unlock_params(self.storage)
 
-                verifier = hmac.new(
-                    key,
-                    b"vaultx-check",
-                    hashlib.sha256,
-                ).digest()
+        self.kdf_worker.derive(
+            [(password, salt, params)],
+            lambda keys: self._unlock(username, password, account, salt, keys[0]),
+            self._unlock_failed,
+            tag="login",
+        )
 
-                self.storage.create_account(
-                    username_hash=username_hash,
-                    salt=salt,
-                    verifier=verifier,
-                )
+        # The vault UI imports while the key derives
+        import ui.vault_view
 
-                self.master_key = key
+    def _unlock(self, username: str, password: str, account, salt: bytes, key: bytes):
+        from core.account import InvalidLogin, open_vault
+        from crypto.cipher import CipherSession
+        from ui.vault_view import VaultView
 
-            # ------------------------
-            # Normal login
-            # ------------------------
+        try:
+            # Creates the account on first run
+            try:
+                dek = open_vault(self.storage, username, key, account, salt)
+            except InvalidLogin as e:
+                QMessageBox.warning(self, "Invalid login", str(e))
+                return
 
-            else:
-                stored_username_hash, salt, stored_verifier = (
-                    self.storage.get_account()
-                )
-
-                key = derive_key(password, salt)
-
-                calc_username_hash = hmac.new(
-                    key,
-                    username.encode("utf-8"),
-                    hashlib.sha256,
-                ).digest()
-
-                calc_verifier = hmac.new(
-                    key,
-                    b"vaultx-check",
-                    hashlib.sha256,
-                ).digest()
-
-                if not (
-                    hmac.compare_digest(calc_username_hash, stored_username_hash)
-                    and hmac.compare_digest(calc_verifier, stored_verifier)
-                ):
-                    QMessageBox.warning(
-                        self,
-                        "Invalid login",
-                        "Invalid username or master password",
-                    )
-                    return
-
-                self.master_key = key
+            self.session = CipherSession(dek)
 
             # ------------------------
             # Open vault
@@ -207,28 +319,145 @@ class PasswordManagerApp(QMainWindow):
 
             self.vault_view = VaultView(
                 self.storage,
-                lambda: self.master_key,
+                lambda: self.session,
                 self.lock,
+                self.set_session,
+                self.kdf_worker,
+                self.backups,
             )
 
             self.stack.addWidget(self.vault_view)
             self.stack.setCurrentWidget(self.vault_view)
+            self.launcher.attach(self.vault_view)
 
             self.reset_idle_timer()
 
         except Exception:
-            QMessageBox.critical(self, "Error", "Failed to unlock vault")
-            self.master_key = None
+            self._unlock_failed()
+            return
+
+        self._pending_retune = (username, password, key, self.storage.get_account().salt)
+        self._retune_deadline = time.monotonic() + KDF_RETUNE_DEADLINE_SECONDS
+        self._arm_retune()
+
+    def _unlock_failed(self, message: str = ""):
+        QMessageBox.critical(self, "Error", "Failed to unlock vault")
+        self.drop_session()
+
+    def _arm_retune(self):
+        # Input pushes the retune back, but not past the deadline
+        remaining = self._retune_deadline - time.monotonic()
+        delay = max(0.0, min(KDF_RETUNE_IDLE_SECONDS, remaining))
+        self.retune_timer.start(int(delay * 1000))
+
+    def _retune_when_idle(self):
+        """
+        Start the re-tune once KDF_RETUNE_IDLE_SECONDS pass without
+        input, so calibration is not timed against unlock, a backup or
+        another derivation, and at KDF_RETUNE_DEADLINE_SECONDS at the
+        latest. While those run it waits another round; past the
+        deadline it is dropped (the next unlock tries again), so the
+        master password is not held for the rest of the session.
+        """
+        if self._pending_retune is None:
+            return
+
+        username, password, key, salt = self._pending_retune
+
+        # Skip if the master password changed in the meantime
+        account = self.storage.get_account()
+        if not account or account.salt != salt:
+            self._pending_retune = None
+            return
+
+        if self.kdf_worker.busy or (self.backups and self.backups.running):
+            if time.monotonic() < self._retune_deadline:
+                self._arm_retune()
+            else:
+                self._pending_retune = None
+            return
+
+        self._retune_kdf(username, password, key)
+
+    def _retune_kdf(self, username: str, password: str, key: bytes):
+        """
+        Benchmark this host in the background and, if the vault's Argon2
+        parameters are off target, re-wrap the data key under a fresh
+        salt with the calibrated ones.
+        """
+        from core.account import retuned_account
+
+        account = self.storage.get_account()
+
+        def job():
+            return retuned_account(account, username, password, key)
+
+        def apply(update):
+            self._pending_retune = None
+
+            # Skip if the master password changed in the meantime
+            current = self.storage.get_account()
+            if update and current and current.salt == account.salt:
+                self.storage.update_account(**update)
+                if hasattr(self, "vault_view"):
+                    self.vault_view.note_account()
+
+        def failed(message):
+            self._pending_retune = None
+
+        def cancelled():
+            # Superseded by another derivation: try again after it
+            if self._pending_retune is not None:
+                self._arm_retune()
+
+        self.kdf_worker.submit(job, apply, failed, cancelled)
+
+    def set_session(self, session):
+        """
+        Swap in a new cipher session (after a data key rotation).
+        """
+        self.drop_session()
+        self.session = session
+
+    def drop_session(self):
+        if self.session:
+            self.session.wipe()
+        self.session = None
 
     def lock(self):
         """
         Hard lock:
-        - Drop master key
+        - Wipe cipher session (key + AEAD context)
+        - Flush buffered usage, drop decrypted entries and secrets
+          (and memoized strength estimates)
         - Clear clipboard
         - Return to login view
         """
 
-        self.master_key = None
+        # Abandon a background re-tune of the vault just closed
+        self.retune_timer.stop()
+        self._pending_retune = None
+        if self.session:
+            self.kdf_worker.cancel()
+
+        if self.launcher:
+            self.launcher.detach()
+
+        # Flushes buffered usage, so it runs while the session is live
+        if hasattr(self, "vault_view"):
+            self.vault_view.clear()
+            self.stack.removeWidget(self.vault_view)
+            self.vault_view.deleteLater()
+            del self.vault_view
+
+        self.drop_session()
+
+        # Memoized strength results hold passwords typed in the editor
+        from utils import strength
+        strength.clear_cache()
+
+        if self.backups and self.backups.pending_changes:
+            self.backups.start()
 
         try:
             clipboard = QApplication.clipboard()
@@ -1,10 +1,16 @@
 # ui/change_master_dialog.py
 
 
-import hmac
-import hashlib
-
-from crypto.kdf import derive_key, generate_salt
+from core.account import (
+    check_password,
+    change_password,
+    rotation_params,
+    resumes,
+    start_rotation,
+)
+from crypto.kdf import generate_salt
+from crypto.cipher import CipherSession, unwrap_key
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -13,14 +19,30 @@ from PySide6.QtWidgets import (
     QPushButton,
     QMessageBox,
     QInputDialog,
+    QProgressDialog,
+    QCheckBox,
 )
 
 
 class ChangeMasterPasswordDialog(QDialog):
-    def __init__(self, storage, get_key):
-        super().__init__()
+    """
+    Master password change, optionally with a new data key.
+
+    A rotation calls hold_usage() before re-encrypting (buffered usage
+    must reach disk under the old key, where finish() re-encrypts it,
+    and nothing may be written in between) and set_session(new) right
+    after finish(), before any other event is processed. It does not
+    start if the vault locked while the dialog was open.
+    """
+
+    def __init__(self, storage, get_session, kdf_worker, hold_usage, set_session, parent=None):
+        super().__init__(parent)
         self.storage = storage
-        self.get_key = get_key
+        self.get_session = get_session
+        self.kdf_worker = kdf_worker
+        self.hold_usage = hold_usage
+        self.set_session = set_session
+        self.new_session: CipherSession | None = None
 
         self.setWindowTitle("Change Master Password")
         self.setModal(True)
@@ -43,9 +65,16 @@ class ChangeMasterPasswordDialog(QDialog):
         self.confirm.setEchoMode(QLineEdit.Password)
         layout.addWidget(self.confirm)
 
-        btn = QPushButton("Change Password")
-        btn.clicked.connect(self.apply)
-        layout.addWidget(btn)
+        self.rotate = QCheckBox("Also re-encrypt all entries with a new data key")
+        layout.addWidget(self.rotate)
+
+        self.change_btn = QPushButton("Change Password")
+        self.change_btn.clicked.connect(self.apply)
+        layout.addWidget(self.change_btn)
+
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: #6272a4;")
+        layout.addWidget(self.status)
 
     def apply(self):
         if self.new.text() != self.confirm.text():
@@ -57,16 +86,6 @@ class ChangeMasterPasswordDialog(QDialog):
             QMessageBox.critical(self, "Error", "No account found.")
             return
 
-        stored_username_hash, salt, verifier = account
-
-        # Verify current password
-        old_key = derive_key(self.current.text(), salt)
-        check = hmac.new(old_key, b"vaultx-check", hashlib.sha256).digest()
-
-        if not hmac.compare_digest(check, verifier):
-            QMessageBox.warning(self, "Error", "Current password is incorrect.")
-            return
-
         # Ask user for username again (required for re-hash)
         username, ok = QInputDialog.getText(
             self,
@@ -78,41 +97,166 @@ class ChangeMasterPasswordDialog(QDialog):
         if not ok or not username.strip():
             return
 
-        # Derive new key
-        new_salt = generate_salt()
-        new_key = derive_key(self.new.text(), new_salt)
+        journal, new_salt, new_params = rotation_params(
+            self.storage, account, self.rotate.isChecked()
+        )
 
-        # Re-hash username with NEW key
-        new_username_hash = hmac.new(
-            new_key,
-            username.strip().encode("utf-8"),
-            hashlib.sha256,
-        ).digest()
+        # Both keys in one background job
+        self._derive(
+            [
+                (self.current.text(), account.salt, account.kdf_params),
+                (self.new.text(), new_salt, new_params),
+            ],
+            lambda keys: self._on_keys(
+                account, username.strip(), new_salt, journal, *keys
+            ),
+        )
+
+    def done(self, result):
+        # Don't let a late key derivation call back into a closed dialog
+        if self.kdf_worker.busy:
+            self.kdf_worker.cancel()
+        super().done(result)
+
+    def _derive(self, jobs, on_done):
+        self.set_busy(True)
+
+        def done(keys):
+            self.set_busy(False)
+            on_done(keys)
+
+        self.kdf_worker.derive(jobs, done, self._kdf_failed)
+
+    def _kdf_failed(self, message: str):
+        self.set_busy(False)
+        QMessageBox.critical(self, "Error", "Key derivation failed.")
+
+    def set_busy(self, busy: bool):
+        self.change_btn.setEnabled(not busy)
+        self.status.setText("Deriving keys..." if busy else "")
+
+    def _on_keys(self, account, username, new_salt, journal, old_key, new_key):
+        if not check_password(account, old_key):
+            QMessageBox.warning(self, "Error", "Current password is incorrect.")
+            return
+
+        if self.rotate.isChecked():
+            self._rotate_data_key(
+                account, username, new_salt, journal, old_key, new_key
+            )
+            return
+
+        # Re-wrap the data key (entries untouched)
+        change_password(self.storage, account, username, new_salt, old_key, new_key)
 
-        new_verifier = hmac.new(
+        QMessageBox.information(self, "Success", "Master password changed.")
+        self.accept()
+
+    def _rotate_data_key(self, account, username, new_salt, journal, old_key, new_key):
+        """
+        Password change plus a fresh data key: every entry is
+        re-encrypted through the RekeyEngine.
+        """
+        # ------------------------
+        # Resume or discard an interrupted rekey
+        # ------------------------
+
+        if journal and not resumes(journal, username, new_key):
+            # Different new password: start over under a fresh salt
+            self.storage.abort_rekey()
+            fresh_salt = generate_salt()
+            self._derive(
+                [(self.new.text(), fresh_salt, account.kdf_params)],
+                lambda keys: self._rotate_data_key(
+                    account, username, fresh_salt, None, old_key, keys[0]
+                ),
+            )
+            return
+
+        # ------------------------
+        # Re-encrypt entries under the old data key, unwrapped here
+        # rather than taken from the app's session
+        # ------------------------
+
+        if not self.get_session():
+            QMessageBox.warning(
+                self,
+                "Vault locked",
+                "The vault was locked. Unlock it and change the master password again.",
+            )
+            self.reject()
+            return
+
+        self.hold_usage()
+
+        # Checked before every batch: a lock (or a lock and unlock)
+        # replaces it, and nothing may be committed after that
+        self.app_session = self.get_session()
+        self.old_session = CipherSession(unwrap_key(old_key, account.wrapped_dek))
+        self.engine, self.new_session = start_rotation(
+            self.storage,
+            account,
+            username,
+            new_salt,
+            journal,
             new_key,
-            b"vaultx-check",
-            hashlib.sha256,
-        ).digest()
-
-        # Re-encrypt entries
-        entries = self.storage.get_all_entries()
-        updated = []
-
-        for entry_id, blob in entries:
-            plaintext = self.storage.decrypt_blob(blob, old_key)
-            new_blob = self.storage.encrypt_blob(plaintext, new_key)
-            updated.append((entry_id, new_blob))
-
-        # Commit account update
-        self.storage.update_account(
-            username_hash=new_username_hash,
-            salt=new_salt,
-            verifier=new_verifier,
+            self.old_session,
         )
 
-        for entry_id, blob in updated:
-            self.storage.update_entry(entry_id, blob)
+        self.progress = QProgressDialog(
+            "Re-encrypting vault...", "Pause", 0, max(self.engine.total, 1), self
+        )
+        self.progress.setWindowModality(Qt.WindowModal)
+        self.progress.setMinimumDuration(0)
+        self.progress.setValue(self.engine.done)
+
+        QTimer.singleShot(0, self._rekey_step)
+
+    def _rekey_step(self):
+        """
+        One batch per event-loop turn keeps the dialog responsive.
+        """
+        if self.get_session() is not self.app_session:
+            self._pause("The vault was locked. Re-encryption paused.")
+            return
+
+        if self.progress.wasCanceled():
+            self._pause("Re-encryption paused.")
+            return
+
+        done = self.engine.step()
+        self.progress.setValue(self.engine.done)
+
+        if not done:
+            QTimer.singleShot(0, self._rekey_step)
+            return
+
+        self.engine.finish()
+        self.old_session.wipe()
+
+        # Nothing may run under the old key from here on (a usage
+        # flush would write rows finish() no longer re-encrypts)
+        if self.get_session():
+            self.set_session(self.new_session)
+        else:
+            # Locked meanwhile; the next unlock uses the new key
+            self.new_session.wipe()
+        self.new_session = None
+
+        self.progress.close()
 
         QMessageBox.information(self, "Success", "Master password changed.")
         self.accept()
+
+    def _pause(self, reason: str):
+        self.old_session.wipe()
+        self.new_session.wipe()
+        self.new_session = None
+        self.progress.close()
+        QMessageBox.information(
+            self,
+            "Paused",
+            f"{reason} Change the master password again with the same "
+            "new password and data key rotation to resume.",
+        )
+        self.reject()
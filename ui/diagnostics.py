@@ -0,0 +1,127 @@
+# ui/diagnostics.py
+
+from PySide6.QtWidgets import (
+    QGroupBox,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QFileDialog,
+    QMessageBox,
+)
+from PySide6.QtCore import Qt, QTimer
+
+from utils.trace import ENABLED, BUCKETS_MS, tracer
+
+_BARS = " ▁▂▃▄▅▆▇█"
+
+_COLUMNS = ("Span", "Calls", "p50 ms", "p99 ms", "Max ms", "Recent")
+
+
+def _sparkline(buckets) -> str:
+    peak = max(buckets)
+    if not peak:
+        return ""
+    return "".join(
+        _BARS[0] if not n else _BARS[max(1, round(n / peak * (len(_BARS) - 1)))]
+        for n in buckets
+    )
+
+
+class DiagnosticsPanel(QGroupBox):
+    """
+    Rolling view of the tracing spans (last TRACE_WINDOW calls each),
+    refreshed once a second while visible.
+    """
+
+    def __init__(self):
+        super().__init__("Diagnostics")
+
+        layout = QVBoxLayout(self)
+
+        if not ENABLED:
+            info = QLabel(
+                "Tracing is off. Start VaultX with VAULTX_TRACE=1 "
+                "to collect timings."
+            )
+            info.setWordWrap(True)
+            layout.addWidget(info)
+            return
+
+        self.table = QTableWidget(0, len(_COLUMNS))
+        self.table.setHorizontalHeaderLabels(_COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeaderItem(len(_COLUMNS) - 1).setToolTip(
+            "Histogram, buckets up to "
+            + ", ".join(f"{ms:g}" for ms in BUCKETS_MS)
+            + " ms and above"
+        )
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+
+        json_btn = QPushButton("Export JSON")
+        json_btn.clicked.connect(lambda: self.export("JSON (*.json)", ".json"))
+        buttons.addWidget(json_btn)
+
+        prom_btn = QPushButton("Export Prometheus")
+        prom_btn.clicked.connect(lambda: self.export("Prometheus text (*.prom)", ".prom"))
+        buttons.addWidget(prom_btn)
+
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        buttons.addWidget(reset_btn)
+
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_table)
+        self.timer.start(1000)
+
+    def update_table(self):
+        if not self.isVisible():
+            return
+
+        spans = tracer.snapshot()
+        self.table.setRowCount(len(spans))
+
+        for row, (name, snap) in enumerate(spans.items()):
+            recent = snap["recent"]
+            values = (
+                name,
+                str(snap["count"]),
+                f"{recent['p50_ms']:.3f}",
+                f"{recent['p99_ms']:.3f}",
+                f"{recent['max_ms']:.3f}",
+                _sparkline(recent["buckets"]),
+            )
+
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if 0 < col < len(values) - 1:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def reset(self):
+        tracer.reset()
+        self.update_table()
+
+    def export(self, file_filter: str, suffix: str):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export diagnostics", "vaultx-trace" + suffix, file_filter
+        )
+        if not path:
+            return
+
+        if not path.endswith(suffix):
+            path += suffix
+
+        try:
+            tracer.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export failed", str(e))
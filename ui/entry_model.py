@@ -0,0 +1,203 @@
+# ui/entry_model.py
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QColor
+
+# Entries whose password is in the breach corpus
+_BREACHED_COLOR = QColor("#ff5555")
+
+
+class EntryListModel(QAbstractListModel):
+    """
+    List model over an EntryStore.
+
+    Unfiltered, rows are the store's recency order and are read
+    straight from it. With a filter, rows are the ranked ids passed to
+    set_ids(). Store mutations go through put/remove/touch so the view
+    gets row-level signals instead of a reset.
+
+    Entries whose password was found in the breach corpus
+    (set_breached / mark_breached) are drawn in red, with the count in
+    the tooltip.
+    """
+
+    EntryIdRole = Qt.UserRole
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+
+        self.store = store
+
+        self._ids: list[int] | None = None
+        self._rows: dict[int, int] = {}
+        self._breached: dict[int, int] = {}
+
+    # ========================
+    # Qt model interface
+    # ========================
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self._ids is None:
+            return len(self.store)
+        return len(self._ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        entry_id = self._id_at(index.row())
+
+        if role == self.EntryIdRole:
+            return entry_id
+
+        if role == Qt.DisplayRole:
+            return self.store.get(entry_id).site
+
+        if role == Qt.ToolTipRole:
+            username = self.store.get(entry_id).username
+            seen = self._breached.get(entry_id)
+            if seen:
+                breach = f"Password seen {seen:,} times in breaches"
+                return f"{username}\n{breach}" if username else breach
+            return username or None
+
+        if role == Qt.ForegroundRole and entry_id in self._breached:
+            return _BREACHED_COLOR
+
+        return None
+
+    # ========================
+    # Rows <-> ids
+    # ========================
+
+    @property
+    def filtered(self) -> bool:
+        return self._ids is not None
+
+    def set_ids(self, ids: list[int] | None):
+        """
+        Show ranked ids, or the whole store in recency order (None).
+        """
+        self.beginResetModel()
+        self._ids = ids
+        self._rows = {} if ids is None else {
+            entry_id: row for row, entry_id in enumerate(ids)
+        }
+        self.endResetModel()
+
+    def entry_id(self, index) -> int | None:
+        if not index.isValid():
+            return None
+        return self._id_at(index.row())
+
+    def index_of(self, entry_id: int) -> QModelIndex:
+        row = self._row_of(entry_id)
+        if row is None:
+            return QModelIndex()
+        return self.index(row)
+
+    # ========================
+    # Breached passwords
+    # ========================
+
+    def set_breached(self, counts: dict[int, int]):
+        """
+        entry_id -> times seen, for a whole-vault check.
+        """
+        self._breached = dict(counts)
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1))
+
+    def mark_breached(self, entry_id: int, count: int):
+        """
+        One entry re-checked after an edit (count 0: not found).
+        """
+        if count:
+            self._breached[entry_id] = count
+        elif self._breached.pop(entry_id, None) is None:
+            return
+        self._changed(entry_id)
+
+    # ========================
+    # Store deltas
+    # ========================
+
+    def put(self, entry_id: int, meta):
+        if self.filtered:
+            self.store.put(entry_id, meta)
+            self._changed(entry_id)
+            return
+
+        if entry_id in self.store:
+            self._move(entry_id, meta.last_used, lambda: self.store.put(entry_id, meta))
+            return
+
+        row = self.store.row_for(entry_id, meta.last_used)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.put(entry_id, meta)
+        self.endInsertRows()
+
+    def remove(self, entry_id: int):
+        self._breached.pop(entry_id, None)
+        row = self._row_of(entry_id)
+
+        if row is None:
+            self.store.remove(entry_id)
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.store.remove(entry_id)
+
+        if self.filtered:
+            del self._ids[row]
+            self._rows = {i: r for r, i in enumerate(self._ids)}
+
+        self.endRemoveRows()
+
+    def touch(self, entry_id: int, timestamp: float):
+        # Ranked rows keep their place until the next search
+        if self.filtered:
+            self.store.touch(entry_id, timestamp)
+            return
+
+        self._move(entry_id, timestamp, lambda: self.store.touch(entry_id, timestamp))
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _id_at(self, row: int) -> int:
+        if self._ids is None:
+            return self.store.id_at(row)
+        return self._ids[row]
+
+    def _row_of(self, entry_id: int) -> int | None:
+        if self._ids is not None:
+            return self._rows.get(entry_id)
+        if entry_id not in self.store:
+            return None
+        return self.store.row_of(entry_id)
+
+    def _move(self, entry_id: int, last_used: float, apply):
+        """
+        Re-key an existing entry in the recency order. Qt wants the
+        destination in pre-move numbering (insert before that row).
+        """
+        old_row = self.store.row_of(entry_id)
+        dest = self.store.row_for(entry_id, last_used)
+
+        if dest in (old_row, old_row + 1):
+            apply()
+            self._changed(entry_id)
+            return
+
+        self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), dest)
+        apply()
+        self.endMoveRows()
+
+    def _changed(self, entry_id: int):
+        index = self.index_of(entry_id)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
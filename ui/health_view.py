@@ -0,0 +1,139 @@
+# ui/health_view.py
+
+import time
+
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QGroupBox,
+    QListWidget,
+    QListWidgetItem,
+)
+from PySide6.QtCore import Qt
+
+from config import HEALTH_LIST_LIMIT, HEALTH_STALE_DAYS
+
+
+class HealthView(QWidget):
+    """
+    Health tab: reused, weak and stale passwords from a HealthAudit.
+
+    The lists are rebuilt by show_audit() (the owner calls it while the
+    tab is shown) and hold at most HEALTH_LIST_LIMIT rows each.
+    Activating a row calls open_entry_cb(entry_id).
+    """
+
+    def __init__(self, open_entry_cb):
+        super().__init__()
+
+        self.open_entry_cb = open_entry_cb
+        self._counts = ""
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(16)
+
+        title = QLabel("Vault Health")
+        title.setStyleSheet("font-size: 22px; font-weight: bold;")
+        layout.addWidget(title)
+
+        self.summary = QLabel("Open this tab to audit the vault.")
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
+
+        self.reused = self._section(layout, "Reused passwords")
+        self.weak = self._section(layout, "Weak passwords")
+        self.stale = self._section(layout, f"Not used in {HEALTH_STALE_DAYS} days")
+
+    def _section(self, layout, title) -> QListWidget:
+        box = QGroupBox(title)
+        box_layout = QVBoxLayout(box)
+
+        rows = QListWidget()
+        rows.setUniformItemSizes(True)
+        rows.itemActivated.connect(self._activated)
+        box_layout.addWidget(rows)
+
+        layout.addWidget(box)
+        return rows
+
+    # ========================
+    # Results
+    # ========================
+
+    def show_audit(self, audit, store):
+        """
+        Rebuild the lists from `audit`, with sites and usernames from
+        the EntryStore.
+        """
+        reused = audit.reused()
+        weak = audit.weak()
+        stale = audit.stale()
+
+        def name(entry_id):
+            meta = store.get(entry_id)
+            return f"{meta.site} ({meta.username})" if meta.username else meta.site
+
+        shared = {entry_id: len(group) for group in reused for entry_id in group}
+
+        self._fill(
+            self.reused,
+            list(shared),
+            lambda entry_id: f"{name(entry_id)}  ·  shared by {shared[entry_id]}",
+        )
+        self._fill(self.weak, weak, name)
+        self._fill(
+            self.stale,
+            stale,
+            lambda entry_id: f"{name(entry_id)}  ·  last used {_date(audit.last_used(entry_id))}",
+        )
+
+        self._counts = (
+            f"{len(audit):,} entries: {len(shared):,} "
+            f"share a password, {len(weak):,} weak, {len(stale):,} stale."
+        )
+        self.show_progress(audit)
+
+    def show_progress(self, audit):
+        """
+        Update the summary line with the passwords left to score,
+        keeping the counts of the last show_audit() (cheap enough for
+        every scoring step).
+        """
+        pending = audit.pending()
+        if pending:
+            self.summary.setText(f"{self._counts} Scoring strength, {pending:,} passwords left...")
+        else:
+            self.summary.setText(self._counts)
+
+    def clear(self):
+        self.summary.setText("Open this tab to audit the vault.")
+        self.reused.clear()
+        self.weak.clear()
+        self.stale.clear()
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _fill(self, rows: QListWidget, ids: list[int], text):
+        rows.clear()
+
+        for entry_id in ids[:HEALTH_LIST_LIMIT]:
+            item = QListWidgetItem(text(entry_id))
+            item.setData(Qt.UserRole, entry_id)
+            rows.addItem(item)
+
+        if len(ids) > HEALTH_LIST_LIMIT:
+            more = QListWidgetItem(f"... and {len(ids) - HEALTH_LIST_LIMIT:,} more")
+            more.setFlags(Qt.NoItemFlags)
+            rows.addItem(more)
+
+    def _activated(self, item):
+        entry_id = item.data(Qt.UserRole)
+        if entry_id is not None:
+            self.open_entry_cb(entry_id)
+
+
+def _date(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
@@ -0,0 +1,140 @@
+# ui/kdf_worker.py
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class _TaskSignals(QObject):
+    done = Signal(int, object)
+    error = Signal(int, str)
+
+
+class _KdfTask(QRunnable):
+    def __init__(self, request_id: int, fn):
+        super().__init__()
+        self.request_id = request_id
+        self.fn = fn
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as exc:
+            self.signals.error.emit(self.request_id, str(exc))
+            return
+
+        self.signals.done.emit(self.request_id, result)
+
+
+class KdfWorker(QObject):
+    """
+    Runs Argon2 key derivation off the Qt main thread.
+
+    derive() queues a list of (password, salt, params) jobs and returns
+    a request id; submit() runs any other KDF-heavy callable (e.g. a
+    re-tune). Results are delivered on the main thread through Qt
+    signals and only for the latest request: a newer request (or
+    cancel()) supersedes anything still queued or running. A running
+    Argon2 call cannot be interrupted; its result is simply dropped.
+
+    busy_changed(tag, busy) carries the tag the job was submitted
+    with, so a view can follow its own jobs only.
+    """
+
+    busy_changed = Signal(str, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+
+        self._current = 0
+        self._callbacks = None
+        self._tag = ""
+        self._tasks = {}
+
+    @property
+    def busy(self) -> bool:
+        return self._callbacks is not None
+
+    def derive(self, jobs, on_done, on_error=None, tag: str = "") -> int:
+        # argon2 is loaded after the login window paints
+        from crypto.kdf import derive_key
+
+        jobs = list(jobs)
+        return self.submit(
+            lambda: [
+                derive_key(password, salt, params)
+                for password, salt, params in jobs
+            ],
+            on_done,
+            on_error,
+            tag=tag,
+        )
+
+    def submit(self, fn, on_done, on_error=None, on_cancel=None, tag: str = "") -> int:
+        """
+        Run fn() on the pool. on_cancel() is called if a newer request
+        or cancel() supersedes this one.
+        """
+        self.cancel()
+
+        self._current += 1
+        self._callbacks = (on_done, on_error, on_cancel)
+        self._tag = tag
+
+        task = _KdfTask(self._current, fn)
+        task.setAutoDelete(False)
+        task.signals.done.connect(self._on_done)
+        task.signals.error.connect(self._on_error)
+
+        # Keep the Python wrapper alive until its signal arrives
+        self._tasks[self._current] = task
+        self.pool.start(task)
+
+        self.busy_changed.emit(tag, True)
+        return self._current
+
+    def cancel(self):
+        """
+        Drop queued derivations and ignore any in-flight result.
+        """
+        for request_id, task in list(self._tasks.items()):
+            if self.pool.tryTake(task):
+                del self._tasks[request_id]
+
+        self._current += 1
+
+        if self._callbacks is not None:
+            on_cancel = self._callbacks[2]
+            self._callbacks = None
+            self.busy_changed.emit(self._tag, False)
+            if on_cancel:
+                on_cancel()
+
+    # ------------------------
+    # Result delivery (main thread)
+    # ------------------------
+
+    @Slot(int, object)
+    def _on_done(self, request_id: int, keys):
+        callbacks = self._take(request_id)
+        if callbacks:
+            callbacks[0](keys)
+
+    @Slot(int, str)
+    def _on_error(self, request_id: int, message: str):
+        callbacks = self._take(request_id)
+        if callbacks and callbacks[1]:
+            callbacks[1](message)
+
+    def _take(self, request_id: int):
+        self._tasks.pop(request_id, None)
+
+        if request_id != self._current or self._callbacks is None:
+            return None
+
+        callbacks = self._callbacks
+        self._callbacks = None
+        self.busy_changed.emit(self._tag, False)
+        return callbacks
@@ -0,0 +1,220 @@
+# ui/launcher.py
+
+import time
+from itertools import islice
+
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLineEdit,
+    QListWidget,
+    QApplication,
+)
+from PySide6.QtGui import QCursor
+from PySide6.QtCore import Qt, QEvent
+
+from utils.trace import ENABLED as TRACE_ENABLED, tracer
+
+from config import LAUNCHER_RESULTS
+
+
+class LauncherPopup(QWidget):
+    """
+    Frameless search-and-copy popup for the global hotkey.
+
+    Built once (hidden) at startup and pointed at the unlocked
+    VaultView with attach(), so showing it costs no widget creation.
+    Every keystroke queries the view's SearchIndex directly (no
+    debounce) and shows the top LAUNCHER_RESULTS; Enter copies the
+    selected entry's password through VaultView.copy_entry() and
+    hides the popup, Esc or focus loss just hides it.
+
+    Two latencies are measured, each up to the paint that shows the
+    result, and should both stay under about 50 ms: hotkey press ->
+    popup painted, and keystroke -> results painted. The last values
+    are kept in last_show_ms and last_keystroke_ms, and recorded as
+    the launcher.show and launcher.keystroke spans when tracing is on
+    (see Settings -> Diagnostics).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(
+            parent,
+            Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint,
+        )
+        self.setObjectName("launcher")
+        self.setFixedWidth(560)
+
+        self.view = None
+        self.ids: list[int] = []
+
+        self.last_show_ms: float | None = None
+        self.last_keystroke_ms: float | None = None
+        self._show_started: float | None = None
+        self._keystroke_started: float | None = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(6)
+
+        self.query = QLineEdit()
+        self.query.setPlaceholderText("Search vault, Enter copies the password")
+        self.query.textEdited.connect(self._on_edited)
+        self.query.installEventFilter(self)
+        layout.addWidget(self.query)
+
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        self.results.setFocusPolicy(Qt.NoFocus)
+        self.results.itemActivated.connect(lambda _: self.copy_selected())
+        self.results.viewport().installEventFilter(self)
+        layout.addWidget(self.results)
+
+        # Room for exactly LAUNCHER_RESULTS rows
+        row = self.results.fontMetrics().height() + 8
+        self.results.setFixedHeight(row * LAUNCHER_RESULTS + 2 * self.results.frameWidth())
+
+        # Create the native window now rather than on the first hotkey
+        self.adjustSize()
+        self.winId()
+
+    # ========================
+    # Source
+    # ========================
+
+    def attach(self, view):
+        """
+        Search `view` (an unlocked VaultView) from now on.
+        """
+        self.view = view
+
+    def detach(self):
+        """
+        Vault locked: hide and drop everything shown.
+        """
+        self.hide()
+        self.view = None
+        self.ids = []
+        self.query.clear()
+        self.results.clear()
+
+    # ========================
+    # Show / hide
+    # ========================
+
+    def popup(self, pressed_at: float | None = None):
+        """
+        Show with an empty query and the most recent entries.
+        pressed_at is the hotkey's perf_counter() time.
+        """
+        if self.view is None:
+            return
+
+        self._show_started = pressed_at or time.perf_counter()
+
+        self.query.clear()
+        self._update("")
+
+        screen = QApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
+        area = screen.availableGeometry()
+        self.move(
+            area.x() + (area.width() - self.width()) // 2,
+            area.y() + area.height() // 4,
+        )
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.query.setFocus()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.ActivationChange and not self.isActiveWindow():
+            self.hide()
+
+        super().changeEvent(event)
+
+    # ========================
+    # Actions
+    # ========================
+
+    def copy_selected(self):
+        row = max(self.results.currentRow(), 0)
+        if self.view is None or row >= len(self.ids):
+            return
+
+        self.view.copy_entry(self.ids[row])
+        self.hide()
+
+    def eventFilter(self, obj, event):
+        if obj is self.query and event.type() == QEvent.Type.KeyPress:
+            return self._on_key(event.key())
+
+        if obj is self.results.viewport() and event.type() == QEvent.Type.Paint:
+            self._painted()
+
+        return super().eventFilter(obj, event)
+
+    # ========================
+    # Internal
+    # ========================
+
+    def _on_key(self, key) -> bool:
+        if key in (Qt.Key_Return, Qt.Key_Enter):
+            self.copy_selected()
+            return True
+
+        if key == Qt.Key_Escape:
+            self.hide()
+            return True
+
+        if key in (Qt.Key_Down, Qt.Key_Up) and self.ids:
+            step = 1 if key == Qt.Key_Down else -1
+            row = max(self.results.currentRow(), 0) + step
+            self.results.setCurrentRow(min(max(row, 0), len(self.ids) - 1))
+            return True
+
+        return False
+
+    def _on_edited(self, text: str):
+        self._keystroke_started = time.perf_counter()
+        self._update(text)
+
+    def _update(self, query: str):
+        view = self.view
+
+        # Same rules as the vault list: a URL lists its site's entries,
+        # an empty query the most recent ones
+        ids = view.store.ids_for_url(query) if "://" in query else None
+        if not ids:
+            ids = view.index.search(query)
+        if ids is None:
+            ids = [entry_id for entry_id, _ in islice(view.store, LAUNCHER_RESULTS)]
+
+        self.ids = ids[:LAUNCHER_RESULTS]
+
+        self.results.clear()
+        for entry_id in self.ids:
+            meta = view.store.get(entry_id)
+            label = f"{meta.site}  —  {meta.username}" if meta.username else meta.site
+            self.results.addItem(label)
+
+        if self.ids:
+            self.results.setCurrentRow(0)
+
+    def _painted(self):
+        now = time.perf_counter()
+
+        if self._show_started is not None:
+            self.last_show_ms = (now - self._show_started) * 1000
+            self._show_started = None
+            _record("launcher.show", self.last_show_ms)
+
+        if self._keystroke_started is not None:
+            self.last_keystroke_ms = (now - self._keystroke_started) * 1000
+            self._keystroke_started = None
+            _record("launcher.keystroke", self.last_keystroke_ms)
+
+
+def _record(name: str, ms: float):
+    if TRACE_ENABLED:
+        tracer.stats(name).record(ms)
@@ -7,6 +7,7 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QMessageBox,
+    QProgressBar,
 )
 from PySide6.QtCore import Qt
 
@@ -74,6 +75,22 @@ class LoginView(QWidget):
         self.login_btn.clicked.connect(self.submit)
         layout.addWidget(self.login_btn)
 
+        # ------------------------
+        # Busy indicator (key derivation runs in the background)
+        # ------------------------
+
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setMaximumHeight(6)
+        self.busy_bar.hide()
+        layout.addWidget(self.busy_bar)
+
+        self.status = QLabel("")
+        self.status.setAlignment(Qt.AlignCenter)
+        self.status.setStyleSheet("color: #6272a4;")
+        layout.addWidget(self.status)
+
         # Enter key support
         self.username.returnPressed.connect(self.submit)
         self.password.returnPressed.connect(self.submit)
@@ -109,3 +126,11 @@ class LoginView(QWidget):
     def clear(self):
         self.username.clear()
         self.password.clear()
+
+    def set_busy(self, busy: bool):
+        """
+        Inputs stay enabled: submitting again supersedes the
+        in-flight unlock attempt.
+        """
+        self.busy_bar.setVisible(busy)
+        self.status.setText("Unlocking..." if busy else "")
@@ -10,9 +10,11 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from ui.diagnostics import DiagnosticsPanel
+
 
 class SettingsView(QWidget):
-    def __init__(self, change_master_cb):
+    def __init__(self, change_master_cb, breach_cb, import_cb, export_cb, backup_cb, restore_cb):
         super().__init__()
 
         layout = QVBoxLayout(self)
@@ -30,8 +32,40 @@ class SettingsView(QWidget):
         change_btn.clicked.connect(change_master_cb)
         sec_layout.addWidget(change_btn)
 
+        breach_btn = QPushButton("Check for Breached Passwords")
+        breach_btn.clicked.connect(breach_cb)
+        sec_layout.addWidget(breach_btn)
+
         layout.addWidget(security)
 
+        # --- Data ---
+        data = QGroupBox("Import / Export")
+        data_layout = QVBoxLayout(data)
+
+        import_btn = QPushButton("Import CSV / JSON / VaultX Export")
+        import_btn.clicked.connect(import_cb)
+        data_layout.addWidget(import_btn)
+
+        export_btn = QPushButton("Export Encrypted Backup")
+        export_btn.clicked.connect(export_cb)
+        data_layout.addWidget(export_btn)
+
+        layout.addWidget(data)
+
+        # --- Backups ---
+        backups = QGroupBox("Backups")
+        backup_layout = QVBoxLayout(backups)
+
+        backup_btn = QPushButton("Back Up Now")
+        backup_btn.clicked.connect(backup_cb)
+        backup_layout.addWidget(backup_btn)
+
+        restore_btn = QPushButton("Restore Snapshot")
+        restore_btn.clicked.connect(restore_cb)
+        backup_layout.addWidget(restore_btn)
+
+        layout.addWidget(backups)
+
         # --- Behavior ---
         behavior = QGroupBox("Behavior")
         beh_layout = QVBoxLayout(behavior)
@@ -44,4 +78,7 @@ class SettingsView(QWidget):
 
         layout.addWidget(behavior)
 
+        # --- Diagnostics ---
+        layout.addWidget(DiagnosticsPanel())
+
         layout.addStretch()
@@ -1,54 +1,126 @@
 # ui/vault_view.py
 
+import sqlite3
+import time
+
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
     QPushButton,
-    QListWidget,
+    QListView,
     QLineEdit,
     QTextEdit,
     QMessageBox,
     QTabWidget,
     QGroupBox,
+    QFileDialog,
+    QInputDialog,
+    QProgressDialog,
 )
-
-import time
+from PySide6.QtCore import Qt, QTimer
+import shiboken6
 
 from models.entry import VaultEntry
-from crypto.cipher import encrypt, decrypt
+from models.health import HealthAudit
+from models.store import EntryStore
+from models.search import SearchIndex
+from models.secret_cache import SecretCache
+from core.account import check_password
+from core.entries import (
+    load_metas,
+    load_passwords,
+    password_digests,
+    read_secret,
+    save_entry,
+)
+from crypto.kdf import DEFAULT_PARAMS, generate_salt
+from storage.transfer import (
+    BulkImporter,
+    EncryptedExporter,
+    open_records,
+    read_export,
+    read_export_header,
+)
+from storage.usage import UsageTracker
+from utils.breach import DEFAULT_PATH as BREACH_CORPUS_PATH, BreachCorpus, digest
 from utils.clipboard import copy_with_timeout
-from utils.password_gen import generate_password, password_strength
+from utils.password_gen import generate_password
+from utils.strength import dictionary_words, estimate
+from utils.trace import traced
+from ui.entry_model import EntryListModel
+from ui.health_view import HealthView
 from ui.settings_view import SettingsView
 from ui.change_master_dialog import ChangeMasterPasswordDialog
 
+from config import (
+    USAGE_FLUSH_SECONDS,
+    FILTER_DEBOUNCE_MS,
+    BREACH_CHECK_BATCH,
+    HEALTH_SCORE_BATCH,
+)
+
 
 
 class VaultView(QWidget):
-    def __init__(self, storage, get_key, lock_callback):
+    def __init__(
+        self,
+        storage,
+        get_session,
+        lock_callback,
+        set_session,
+        kdf_worker,
+        backups,
+    ):
         super().__init__()
 
         self.storage = storage
-        self.get_key = get_key
+        self.get_session = get_session
         self.lock_callback = lock_callback
-
-        self.entries = []
-        self.entry_ids = []
+        self.set_session = set_session
+        self.kdf_worker = kdf_worker
+        self.backups = backups
+
+        self.store = EntryStore()
+        self.index = SearchIndex()
+        self.secrets = SecretCache(self._load_secret)
+        self.usage = UsageTracker(storage, get_session)
+
+        # Built when the Health tab is first shown (it decrypts every
+        # password), then kept up to date per edit
+        self.audit: HealthAudit | None = None
+
+        # Opened now when present, so edits are checked as they are typed
+        self.breach_corpus = None
+        try:
+            self._open_breach_corpus()
+        except (OSError, ValueError):
+            pass
 
         root = QVBoxLayout(self)
 
         # ======================
         # Tabs
         # ======================
-        tabs = QTabWidget()
-        root.addWidget(tabs)
+        self.tabs = QTabWidget()
+        root.addWidget(self.tabs)
 
         vault_tab = QWidget()
-        settings_tab = SettingsView(self.change_master_password)
+        self.health_view = HealthView(self.open_entry)
+        settings_tab = SettingsView(
+            self.change_master_password,
+            self.check_breaches,
+            self.import_entries,
+            self.export_entries,
+            self.backup_now,
+            self.restore_backup,
+        )
 
-        tabs.addTab(vault_tab, "Vault")
-        tabs.addTab(settings_tab, "Settings")
+        self.tabs.addTab(vault_tab, "Vault")
+        self.tabs.addTab(self.health_view, "Health")
+        self.tabs.addTab(settings_tab, "Settings")
+        self.tabs.currentChanged.connect(self._tab_changed)
 
         vault_layout = QHBoxLayout(vault_tab)
 
@@ -59,11 +131,21 @@ class VaultView(QWidget):
 
         self.search = QLineEdit()
         self.search.setPlaceholderText("Search vault")
-        self.search.textChanged.connect(self.apply_filter)
         left.addWidget(self.search)
 
-        self.list = QListWidget()
-        self.list.itemClicked.connect(self.show_entry)
+        # Filter once typing pauses, not per keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.search.textChanged.connect(self.filter_timer.start)
+
+        self.model = EntryListModel(self.store, self)
+
+        self.list = QListView()
+        self.list.setModel(self.model)
+        self.list.setUniformItemSizes(True)
+        self.list.clicked.connect(self.show_entry)
         left.addWidget(self.list)
 
         vault_layout.addLayout(left, 2)
@@ -87,6 +169,10 @@ class VaultView(QWidget):
 
         self.strength_label = QLabel("Strength: —")
         self.strength_label.setStyleSheet("color: #6272a4; font-weight: bold;")
+        self.strength_label.setToolTip(
+            f"An estimate against {dictionary_words():,} dictionary words. "
+            "Passphrases made of other words can score higher than they should."
+        )
         middle.addWidget(self.strength_label)
 
         gen_btn = QPushButton("Generate Strong Password")
@@ -127,51 +213,153 @@ class VaultView(QWidget):
         # Signals
         self.pwd.textChanged.connect(self.update_strength)
 
+        # Expire idle decrypted secrets
+        self.secret_timer = QTimer(self)
+        self.secret_timer.timeout.connect(self.secrets.prune)
+        self.secret_timer.start(15 * 1000)
+
+        # The account's key as of unlock (see check_storage())
+        self._data_version = None
+        self._account_key = None
+
+        # Write-behind for last_used / use_count
+        self.usage_timer = QTimer(self)
+        self.usage_timer.timeout.connect(self._usage_due)
+        self.usage_timer.start(USAGE_FLUSH_SECONDS * 1000)
+
         self.refresh()
 
     # ------------------------
     # Vault logic
     # ------------------------
 
+    @traced("vault_view.refresh")
     def refresh(self):
-        self.list.clear()
-        self.entries.clear()
-        self.entry_ids.clear()
-
-        key = self.get_key()
-        if not key:
+        """
+        Full reload from storage. Only needed on unlock; mutations
+        after that are applied to the store as deltas.
+        """
+        self.store.clear()
+        self.index.clear()
+        self.secrets.clear()
+        self.audit = None
+
+        session = self.get_session()
+        if not session:
+            self.model.set_ids(None)
+            self.health_view.clear()
             return
 
-        for entry_id, blob in self.storage.get_all_entries():
-            decrypted = decrypt(key, blob)
-            entry = VaultEntry.deserialize(decrypted)
-            self.entries.append(entry)
-            self.entry_ids.append(entry_id)
+        self.note_account()
+        usage = self.usage.load()
+        metas = load_metas(self.storage, session, usage)
+
+        self.store.load(metas)
+        self.index.build(
+            (entry_id, meta, usage[entry_id].use_count if entry_id in usage else 0)
+            for entry_id, meta in metas
+        )
+        self.apply_filter()
+
+        if self._health_shown():
+            self.audit_health()
+        else:
+            self.health_view.clear()
+
+    def flush_usage(self):
+        # Not under a key another process has replaced
+        if not self._key_changed():
+            self.usage.flush()
+
+    def _usage_due(self):
+        if self.check_storage():
+            self.usage.flush()
+
+    def note_account(self):
+        """
+        Record the account's key as current. Called on unlock and after
+        this process changes the account (its own writes leave
+        data_version as it is).
+        """
+        account = self.storage.get_account()
+        self._data_version = self.storage.data_version
+        self._account_key = (account.salt, account.wrapped_dek) if account else None
+
+    def check_storage(self) -> bool:
+        """
+        Before writing: False, and the vault locks, if another process
+        changed the master password or data key since unlock. This
+        session's key may no longer be the vault's, and whatever it
+        encrypts now could not be read back.
+        """
+        if not self._key_changed():
+            return True
+
+        # clear() drops buffered usage rather than writing it
+        window = self.window()
+        self.lock_callback()
+        QMessageBox.warning(
+            window,
+            "Vault locked",
+            "The master password or data key was changed in another "
+            "process. Unlock the vault again.",
+        )
+        return False
+
+    def _key_changed(self) -> bool:
+        version = self.storage.data_version
+        if self._account_key is None or version == self._data_version:
+            return False
+
+        account = self.storage.get_account()
+        if account is None or (account.salt, account.wrapped_dek) != self._account_key:
+            return True
+
+        self._data_version = version
+        return False
+
+    def clear(self):
+        """
+        Persist buffered usage, then drop everything decrypted
+        (called on lock, before the session is wiped).
+        """
+        self.flush_usage()
+        self.usage_timer.stop()
+        self.secret_timer.stop()
+        self.filter_timer.stop()
+        self.usage.clear()
+        self.store.clear()
+        self.index.clear()
+        self.secrets.clear()
+        self.model.set_ids(None)
+        self.model.set_breached({})
+        self.audit = None
+        self.health_view.clear()
+        self.clear_fields()
 
-        combined = list(zip(self.entries, self.entry_ids))
-        combined.sort(key=lambda x: x[0].last_used, reverse=True)
+        if self.breach_corpus is not None:
+            self.breach_corpus.close()
+            self.breach_corpus = None
 
-        if combined:
-            self.entries, self.entry_ids = zip(*combined)
-            self.entries = list(self.entries)
-            self.entry_ids = list(self.entry_ids)
+    def _load_secret(self, entry_id):
+        session = self.get_session()
+        if not session:
+            return None
 
-        for entry in self.entries:
-            self.list.addItem(entry.site)
+        return read_secret(self.storage, session, entry_id)
 
-    def find_existing_index(self, site: str):
-        site = site.lower()
-        for i, entry in enumerate(self.entries):
-            if entry.site.lower() == site:
-                return i
-        return None
+    def current_entry_id(self):
+        return self.model.entry_id(self.list.currentIndex())
 
     def add_or_update_entry(self):
-        key = self.get_key()
-        if not key:
+        session = self.get_session()
+        if not session:
             QMessageBox.warning(self, "Locked", "Vault is locked.")
             return
 
+        if not self.check_storage():
+            return
+
         if not self.site.text() or not self.pwd.text():
             QMessageBox.warning(self, "Missing data", "Site and password required.")
             return
@@ -183,70 +371,126 @@ class VaultView(QWidget):
             notes=self.notes.toPlainText(),
         )
 
-        blob = encrypt(key, entry.serialize())
-        idx = self.find_existing_index(entry.site)
+        entry_id = self.store.id_for_site(entry.site)
 
-        if idx is not None:
-            self.storage.update_entry(self.entry_ids[idx], blob)
-        else:
-            self.storage.add_entry(blob)
+        # Editing keeps the entry's place in the recency order
+        last_used = None
+        if entry_id is not None:
+            last_used = self.store.get(entry_id).last_used
 
-        self.refresh()
+        entry_id, meta, secret = save_entry(
+            self.storage, session, entry, entry_id, last_used
+        )
+
+        usage = self.usage.get(entry_id)
+        self.index.add(entry_id, meta, usage.use_count if usage else 0)
+
+        self.secrets.put(entry_id, secret)
+        self.model.put(entry_id, meta)
+
+        if self.breach_corpus is not None:
+            self.model.mark_breached(entry_id, self.breach_corpus.count(digest(secret.password)))
+
+        if self.audit is not None:
+            self.audit.put(entry_id, secret.password, meta.last_used)
+            self._show_health()
+
+        # The edit may change which entries match the query
+        if self.model.filtered:
+            self.apply_filter()
+
+        self._select(entry_id)
         self.clear_fields()
 
     def delete_entry(self):
-        row = self.list.currentRow()
-        if row < 0:
+        entry_id = self.current_entry_id()
+        if entry_id is None or not self.check_storage():
             return
 
-        self.storage.delete_entry(self.entry_ids[row])
-        self.refresh()
+        self.storage.delete_entry(entry_id)
+        self.secrets.invalidate(entry_id)
+        self.usage.forget(entry_id)
+        self.index.remove(entry_id)
+        self.model.remove(entry_id)
+
+        if self.audit is not None:
+            self.audit.remove(entry_id)
+            self._show_health()
+
         self.clear_fields()
 
     def show_entry(self):
-        row = self.list.currentRow()
-        if row < 0:
+        entry_id = self.current_entry_id()
+        if entry_id is None:
             return
 
-        entry = self.entries[row]
-
-        entry.touch()  # update last_used on view
+        meta = self.store.get(entry_id)
+        secret = self.secrets.get(entry_id)
+        if secret is None:
+            return
 
-        blob = encrypt(self.get_key(), entry.serialize())
-        self.storage.update_entry(self.entry_ids[row], blob)
+        # update last_used on view
+        self._touch(entry_id)
 
-        self.site.setText(entry.site)
-        self.user.setText(entry.username)
-        self.pwd.setText(entry.password)
-        self.notes.setText(entry.notes)
+        self.site.setText(meta.site)
+        self.user.setText(meta.username)
+        self.pwd.setText(secret.password)
+        self.notes.setText(secret.notes)
 
         self.update_strength()
 
     def copy_password(self):
-        key = self.get_key()
-        if not key:
+        entry_id = self.current_entry_id()
+        if entry_id is None:
             return
 
-        row = self.list.currentRow()
-        if row < 0:
-            return
+        self.copy_entry(entry_id)
 
-        entry = self.entries[row]
-        entry.last_used = time.time()
+    def copy_entry(self, entry_id):
+        """
+        Copy an entry's password (cleared after a timeout) and count
+        the use. Also called by the launcher popup.
+        """
+        session = self.get_session()
+        if not session:
+            return
 
-        blob = encrypt(key, entry.serialize())
-        self.storage.update_entry(self.entry_ids[row], blob)
+        secret = self.secrets.get(entry_id)
+        if secret is None:
+            return
 
-        copy_with_timeout(entry.password)
-        self.refresh()
+        self._touch(entry_id)
+        copy_with_timeout(secret.password)
 
+    @traced("vault_view.apply_filter")
     def apply_filter(self):
-        q = self.search.text().lower()
-        self.list.clear()
+        self.filter_timer.stop()
+        selected = self.current_entry_id()
+
+        query = self.search.text()
 
-        for entry in self.entries:
-            if q in entry.site.lower() or q in entry.domain:
-                self.list.addItem(entry.site)
+        # A pasted URL lists its site's entries, best match first
+        ids = self.store.ids_for_url(query) if "://" in query else None
+
+        # Ranked ids, or None when there is no query (recency order)
+        self.model.set_ids(ids or self.index.search(query))
+
+        if selected is not None:
+            self._select(selected)
+
+    def _touch(self, entry_id):
+        # Memory only; the usage tracker persists it on its next flush
+        usage = self.usage.record(entry_id)
+        self.model.touch(entry_id, usage.last_used)
+        self.index.touch(entry_id, usage.last_used, usage.use_count)
+        if self.audit is not None:
+            self.audit.touch(entry_id, usage.last_used)
+
+    def _select(self, entry_id):
+        index = self.model.index_of(entry_id)
+        if index.isValid():
+            self.list.setCurrentIndex(index)
+            self.list.scrollTo(index)
 
     def clear_fields(self):
         self.site.clear()
@@ -273,8 +517,18 @@ class VaultView(QWidget):
             self.strength_label.style().polish(self.strength_label)
             return
 
-        strength = password_strength(pwd)
-        self.strength_label.setText(f"Strength: {strength}")
+        # Memoized, and well under a millisecond, so every keystroke
+        result = estimate(pwd)
+        strength = result.label
+        text = f"Strength: {strength} ({result.crack_time} to crack)"
+
+        # A breached password is weak however it scores
+        seen = self.breach_corpus.count(digest(pwd)) if self.breach_corpus else 0
+        if seen:
+            strength = "Weak"
+            text += f", seen {seen:,} times in breaches"
+
+        self.strength_label.setText(text)
 
         mapping = {
             "Weak": "weak",
@@ -293,6 +547,465 @@ class VaultView(QWidget):
     # ------------------------
 
     def change_master_password(self):
-        dlg = ChangeMasterPasswordDialog(self.storage, self.get_key)
+        dlg = ChangeMasterPasswordDialog(
+            self.storage,
+            self.get_session,
+            self.kdf_worker,
+            self._hold_usage,
+            self.set_session,
+            parent=self.window(),
+        )
         dlg.exec()
 
+        # Held during a data key rotation. A lock while the dialog was
+        # open deletes this view.
+        if shiboken6.isValid(self) and self.get_session():
+            self.note_account()
+            self.usage_timer.start(USAGE_FLUSH_SECONDS * 1000)
+
+    def _hold_usage(self):
+        # Written now under the old data key, then nothing until the
+        # rotation's new session is in place
+        if not shiboken6.isValid(self) or not self.get_session():
+            return
+        self.flush_usage()
+        self.usage_timer.stop()
+
+
+    # ------------------------
+    # Vault health
+    # ------------------------
+
+    @traced("vault_view.audit_health")
+    def audit_health(self):
+        """
+        Full audit: every password is decrypted once, hashed into the
+        HealthAudit and dropped. Reuse and stale entries are known
+        right away; strength is scored afterwards, HEALTH_SCORE_BATCH
+        passwords per event-loop turn.
+        """
+        session = self.get_session()
+        if not session:
+            return
+
+        audit = HealthAudit()
+        audit.load(
+            (entry_id, password, self.store.get(entry_id).last_used)
+            for entry_id, password in load_passwords(self.storage, session)
+        )
+        self.audit = audit
+
+        self._show_health()
+        if audit.pending():
+            QTimer.singleShot(0, lambda: self._score_step(audit))
+
+    def _score_step(self, audit):
+        # Stops when the audit is replaced or dropped (refresh, lock)
+        if audit is not self.audit or not self.get_session():
+            return
+
+        if audit.score_pending(self._read_password, HEALTH_SCORE_BATCH):
+            if self._health_shown():
+                self.health_view.show_progress(audit)
+            QTimer.singleShot(0, lambda: self._score_step(audit))
+            return
+
+        self._show_health()
+
+    def _read_password(self, entry_id):
+        # Straight from storage: scoring reads each password once, and
+        # going through the secret cache would evict recent entries
+        session = self.get_session()
+        if not session:
+            return None
+
+        secret = read_secret(self.storage, session, entry_id)
+        return secret.password if secret else None
+
+    def _show_health(self):
+        if self.audit is not None and self._health_shown():
+            self.health_view.show_audit(self.audit, self.store)
+
+    def _health_shown(self) -> bool:
+        return self.tabs.currentWidget() is self.health_view
+
+    def _tab_changed(self):
+        if not self._health_shown():
+            return
+
+        if self.audit is None:
+            self.audit_health()
+        else:
+            self._show_health()
+
+    def open_entry(self, entry_id):
+        """
+        Show an entry from the Health tab in the Vault tab.
+        """
+        if self.store.get(entry_id) is None:
+            return
+
+        if self.model.filtered:
+            self.search.clear()
+            self.apply_filter()
+
+        self.tabs.setCurrentIndex(0)
+        self._select(entry_id)
+        self.show_entry()
+
+    # ------------------------
+    # Breached passwords
+    # ------------------------
+
+    def check_breaches(self):
+        """
+        Look every entry's password up in the local breach corpus
+        (see utils.breach) and mark the ones found in the list.
+        Hashes are looked up in sorted order, BREACH_CHECK_BATCH per
+        event-loop turn.
+        """
+        session = self.get_session()
+        if not session:
+            return
+
+        try:
+            corpus = self._open_breach_corpus()
+        except FileNotFoundError:
+            QMessageBox.information(
+                self,
+                "Breach check",
+                f"No breached-password file at {BREACH_CORPUS_PATH}.\n\n"
+                "Download the Pwned Passwords SHA-1 dump and convert it once with:\n"
+                "python -m utils.breach --convert FILE",
+            )
+            return
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Breach check", str(e))
+            return
+
+        digests = sorted(
+            password_digests(self.storage, session).items(),
+            key=lambda item: item[1],
+        )
+
+        progress = QProgressDialog(
+            "Checking passwords...", "Cancel", 0, max(len(digests), 1), self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        QTimer.singleShot(0, lambda: self._breach_step(corpus, digests, 0, {}, progress))
+
+    def _breach_step(self, corpus, digests, done, found, progress):
+        if progress.wasCanceled() or not self.get_session():
+            progress.close()
+            return
+
+        batch = digests[done:done + BREACH_CHECK_BATCH]
+        counts = corpus.counts(sha1 for _, sha1 in batch)
+        for entry_id, sha1 in batch:
+            if sha1 in counts:
+                found[entry_id] = counts[sha1]
+
+        done += len(batch)
+        progress.setValue(done)
+
+        if done < len(digests):
+            QTimer.singleShot(0, lambda: self._breach_step(corpus, digests, done, found, progress))
+            return
+
+        progress.close()
+        self.model.set_breached(found)
+
+        if found:
+            message = (
+                f"{len(found)} of {len(digests)} passwords appear in known breaches. "
+                "Those entries are shown in red; change their passwords."
+            )
+        else:
+            message = f"None of the {len(digests)} passwords appear in known breaches."
+        QMessageBox.information(self, "Breach check", message)
+
+    def _open_breach_corpus(self) -> BreachCorpus:
+        if self.breach_corpus is None:
+            self.breach_corpus = BreachCorpus(BREACH_CORPUS_PATH)
+        return self.breach_corpus
+
+    # ------------------------
+    # Import / export
+    # ------------------------
+
+    def import_entries(self):
+        if not self.get_session():
+            return
+
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import entries",
+            "",
+            "Credentials (*.csv *.json *.jsonl *.vaultx);;All files (*)",
+        )
+        if not path:
+            return
+
+        try:
+            header = read_export_header(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Import failed", str(e))
+            return
+
+        if header is None:
+            self._start_import(open_records(path))
+            return
+
+        password, ok = QInputDialog.getText(
+            self, "Import", "Export password:", QLineEdit.Password
+        )
+        if not ok or not password:
+            return
+
+        salt, params = header
+        self.kdf_worker.derive(
+            [(password, salt, params)],
+            lambda keys: self._start_import(read_export(path, keys[0])),
+            self._transfer_failed,
+        )
+
+    def export_entries(self):
+        if not self.get_session():
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export encrypted backup",
+            "vaultx-export.vaultx",
+            "VaultX export (*.vaultx)",
+        )
+        if not path:
+            return
+
+        password, ok = QInputDialog.getText(
+            self, "Export", "Export password:", QLineEdit.Password
+        )
+        if not ok or not password:
+            return
+
+        confirm, ok = QInputDialog.getText(
+            self, "Export", "Confirm export password:", QLineEdit.Password
+        )
+        if not ok:
+            return
+        if confirm != password:
+            QMessageBox.warning(self, "Export", "Passwords do not match.")
+            return
+
+        # Defaults, not this host's calibration: the export may be
+        # opened on a slower machine
+        salt = generate_salt()
+        self.kdf_worker.derive(
+            [(password, salt, DEFAULT_PARAMS)],
+            lambda keys: self._start_export(path, keys[0], salt),
+            self._transfer_failed,
+        )
+
+    def _start_import(self, records):
+        session = self.get_session()
+        if not session or not self.check_storage():
+            return
+
+        importer = BulkImporter(
+            self.storage,
+            session,
+            records,
+            (meta.site for _, meta in self.store),
+        )
+
+        # Streaming input: the total is unknown, so show counts only
+        progress = QProgressDialog("Importing...", "Stop", 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        QTimer.singleShot(0, lambda: self._import_step(importer, progress))
+
+    def _import_step(self, importer, progress):
+        """
+        One batch (one transaction) per event-loop turn. Batches that
+        were written stay written when the import stops early.
+        """
+        stopped = progress.wasCanceled() or not self.get_session() or not self.check_storage()
+
+        try:
+            done = stopped or importer.step()
+        except Exception as e:
+            importer.close()
+            progress.close()
+            self._reload()
+            QMessageBox.warning(
+                self,
+                "Import failed",
+                f"{str(e) or 'Wrong export password or damaged file.'}\n\n"
+                f"{importer.imported} entries were imported before the error.",
+            )
+            return
+
+        progress.setLabelText(
+            f"Imported {importer.imported}, skipped {importer.skipped}..."
+        )
+
+        if not done:
+            QTimer.singleShot(0, lambda: self._import_step(importer, progress))
+            return
+
+        importer.close()
+        progress.close()
+        self._reload()
+
+        QMessageBox.information(
+            self,
+            "Import stopped" if stopped else "Import complete",
+            f"Imported {importer.imported} entries, "
+            f"skipped {importer.skipped} duplicates or rows without a password.",
+        )
+
+    def _start_export(self, path, key, salt):
+        session = self.get_session()
+        if not session:
+            return
+
+        try:
+            exporter = EncryptedExporter(
+                self.storage, session, path, key, salt, DEFAULT_PARAMS
+            )
+        except OSError as e:
+            QMessageBox.warning(self, "Export failed", str(e))
+            return
+
+        progress = QProgressDialog(
+            "Exporting...", "Cancel", 0, max(exporter.total, 1), self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        QTimer.singleShot(0, lambda: self._export_step(exporter, progress))
+
+    def _export_step(self, exporter, progress):
+        if progress.wasCanceled() or not self.get_session():
+            exporter.abort()
+            return
+
+        try:
+            done = exporter.step()
+            if done:
+                exporter.finish()
+        except Exception as e:
+            exporter.abort()
+            progress.close()
+            QMessageBox.warning(self, "Export failed", str(e))
+            return
+
+        progress.setValue(exporter.done)
+
+        if not done:
+            QTimer.singleShot(0, lambda: self._export_step(exporter, progress))
+            return
+
+        progress.close()
+        QMessageBox.information(
+            self, "Export complete", f"Exported {exporter.done} entries."
+        )
+
+    def _transfer_failed(self, message):
+        QMessageBox.warning(self, "Key derivation failed", message)
+
+    def _reload(self):
+        # refresh() reloads usage from storage; persist buffered use first
+        self.flush_usage()
+        self.refresh()
+
+    # ------------------------
+    # Backups
+    # ------------------------
+
+    def backup_now(self):
+        self.flush_usage()
+
+        if self.backups.start() is None:
+            QMessageBox.information(self, "Backup", "A backup is already running.")
+            return
+
+        QMessageBox.information(
+            self,
+            "Backup",
+            f"Backing up to {self.backups.directory} in the background.",
+        )
+
+    def restore_backup(self):
+        snapshots = self.backups.list_snapshots()
+        if not snapshots:
+            QMessageBox.information(self, "Restore", "No snapshots yet.")
+            return
+
+        labels = [
+            f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s.created))}"
+            f"  ({s.size // 1024} KiB)"
+            for s in snapshots
+        ]
+        label, ok = QInputDialog.getItem(
+            self, "Restore", "Snapshot:", labels, 0, False
+        )
+        if not ok:
+            return
+
+        snapshot = snapshots[labels.index(label)]
+
+        try:
+            account = self.backups.read_account(snapshot.path)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            QMessageBox.warning(self, "Restore", f"Unreadable snapshot: {e}")
+            return
+
+        if account is None:
+            QMessageBox.warning(self, "Restore", "Snapshot has no account.")
+            return
+
+        # The snapshot may predate a master password change
+        password, ok = QInputDialog.getText(
+            self,
+            "Restore",
+            "Master password for this snapshot:",
+            QLineEdit.Password,
+        )
+        if not ok or not password:
+            return
+
+        self.kdf_worker.derive(
+            [(password, account.salt, account.kdf_params)],
+            lambda keys: self._restore_verified(snapshot, label, account, keys[0]),
+            self._transfer_failed,
+        )
+
+    def _restore_verified(self, snapshot, label, account, key):
+        if not check_password(account, key):
+            QMessageBox.warning(
+                self, "Restore", "Wrong master password for this snapshot."
+            )
+            return
+
+        answer = QMessageBox.question(
+            self,
+            "Restore",
+            f"Replace the vault with the snapshot from {label}?\n\n"
+            "The current vault is backed up first. VaultX locks afterwards.",
+        )
+        if answer != QMessageBox.Yes:
+            return
+
+        self.flush_usage()
+
+        try:
+            self.backups.restore(snapshot.path)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            QMessageBox.warning(self, "Restore failed", str(e))
+            return
+
+        self.lock_callback()
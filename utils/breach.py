@@ -0,0 +1,349 @@
+# utils/breach.py
+#
+# Offline breached-password check against a local copy of the Pwned
+# Passwords SHA-1 corpus (https://haveibeenpwned.com/Passwords), so no
+# password or hash prefix ever leaves the machine.
+#
+# The published text dump ("SHA1HEX:COUNT" per line) is converted once
+# into a sorted binary file:
+#
+#   python -m utils.breach --convert pwned-passwords-sha1.txt [OUT]
+#
+# OUT defaults to ~/.vaultx/breached-passwords.bin. Either ordering of
+# the dump works (by hash or by prevalence); unsorted input is sorted
+# in runs on disk next to OUT and merged.
+#
+# Layout, integers little-endian:
+#
+#   header   magic "VXHB", version (u16), reserved (u16), records (u64)
+#   fan-out  65537 x u64: index of the first record per 2-byte prefix
+#   records  18 bytes of hash after the prefix + count (u32), sorted
+#
+# At 22 bytes a record, the fan-out table narrows a lookup to one
+# prefix bucket (about 13k records for the full corpus), which is
+# then binary-searched in the mapped file.
+
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from storage.vault import VAULT_PATH
+
+DEFAULT_PATH = VAULT_PATH / "breached-passwords.bin"
+
+_MAGIC = b"VXHB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+_FANOUT = 65537
+
+_TAIL = 18
+_RECORD = _TAIL + 4
+_COUNT = struct.Struct("<I")
+
+# Records sorted in memory per run while converting (24 bytes each)
+_RUN_RECORDS = 4_000_000
+
+
+def digest(password: str) -> bytes:
+    """
+    SHA-1 of the password's UTF-8 bytes, as the corpus stores it.
+    """
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+class BreachCorpus:
+    """
+    The converted corpus, memory-mapped read-only.
+
+    count() looks up one hash: the fan-out table gives its bucket and
+    a binary search over the mapped records finds it, touching a
+    handful of pages. counts() looks up a batch in sorted order, so
+    the pages are visited front to back and each search starts where
+    the previous one ended.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size + 8 * _FANOUT:
+            self._mm.close()
+            raise ValueError(f"{self.path} is truncated")
+
+        magic, version, _, records = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a converted breach corpus")
+
+        self._fanout = _u64(self._mm, _HEADER.size, _FANOUT)
+        self._records = _Records(self._mm, _HEADER.size + 8 * _FANOUT, records)
+
+        if len(self._mm) < _HEADER.size + 8 * _FANOUT + _RECORD * records:
+            self.close()
+            raise ValueError(f"{self.path} is truncated")
+
+        # Lookups jump between buckets; read-ahead would only waste I/O
+        if hasattr(self._mm, "madvise") and hasattr(mmap, "MADV_RANDOM"):
+            self._mm.madvise(mmap.MADV_RANDOM)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def close(self):
+        # The fan-out view pins the mapping until released
+        if isinstance(self._fanout, memoryview):
+            self._fanout.release()
+        self._fanout = None
+        self._records = None
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def count(self, sha1: bytes) -> int:
+        """
+        Times the hash was seen in breaches, 0 if never.
+        """
+        return self._find(sha1, 0)[0]
+
+    def counts(self, digests) -> dict[bytes, int]:
+        """
+        {digest: count} for the digests found, looked up in sorted
+        order.
+        """
+        found = {}
+        start = 0
+
+        for sha1 in sorted(set(digests)):
+            count, start = self._find(sha1, start)
+            if count:
+                found[sha1] = count
+
+        return found
+
+    def _find(self, sha1: bytes, start: int) -> tuple[int, int]:
+        """
+        (count, position) of sha1, searching from record `start` on.
+        The position is where a larger hash would start its search.
+        """
+        prefix = (sha1[0] << 8) | sha1[1]
+        lo = max(self._fanout[prefix], start)
+        hi = self._fanout[prefix + 1]
+
+        records = self._records
+        tail = sha1[2:]
+        pos = bisect_left(records, tail, lo, hi)
+
+        if pos < hi and records[pos] == tail:
+            return records.count(pos), pos
+        return 0, pos
+
+
+class _Records:
+    """
+    Hash tails of the mapped records, as a sequence for bisect.
+    """
+
+    def __init__(self, mm, base: int, size: int):
+        self._mm = mm
+        self._base = base
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i: int) -> bytes:
+        offset = self._base + i * _RECORD
+        return self._mm[offset:offset + _TAIL]
+
+    def count(self, i: int) -> int:
+        return _COUNT.unpack_from(self._mm, self._base + i * _RECORD + _TAIL)[0]
+
+
+# ========================
+# Conversion
+# ========================
+
+def convert(lines, out_path=DEFAULT_PATH, progress=None) -> int:
+    """
+    Build the binary corpus from the dump's lines (text or bytes).
+    Hashes listed twice have their counts added. The file is written
+    next to out_path and moved into place when complete. Returns the
+    number of records. progress(lines_read) is called every million
+    lines.
+    """
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="vaultx-breach-", dir=out_path.parent) as tmp:
+        runs = _write_runs(lines, Path(tmp), progress)
+
+        partial = out_path.with_name(out_path.name + ".partial")
+        try:
+            records = _merge_runs(runs, partial)
+            os.replace(partial, out_path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    return records
+
+
+def _write_runs(lines, directory: Path, progress) -> list[Path]:
+    """
+    Parse the dump into sorted runs of 24-byte records (hash + count,
+    big-endian so bytes order by hash) on disk.
+    """
+    runs = []
+    run = []
+
+    def flush():
+        run.sort()
+        path = directory / f"run-{len(runs)}"
+        with open(path, "wb") as f:
+            f.write(b"".join(run))
+        runs.append(path)
+        run.clear()
+
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, str):
+            line = line.encode("ascii")
+
+        line = line.strip()
+        if not line:
+            continue
+
+        hex_hash, _, count = line.partition(b":")
+        if len(hex_hash) != 40:
+            raise ValueError(f"Line {number}: expected SHA1HEX:COUNT, got {line[:60]!r}")
+
+        run.append(bytes.fromhex(hex_hash.decode("ascii")) + min(int(count or 1), 0xFFFFFFFF).to_bytes(4, "big"))
+
+        if len(run) >= _RUN_RECORDS:
+            flush()
+        if progress and number % 1_000_000 == 0:
+            progress(number)
+
+    if run or not runs:
+        flush()
+    return runs
+
+
+def _merge_runs(runs: list[Path], out_path: Path) -> int:
+    """
+    Merge the sorted runs into the corpus file; returns the record
+    count.
+    """
+    files = [open(path, "rb") for path in runs]
+    try:
+        merged = heapq.merge(*(_read_run(f) for f in files))
+
+        sizes = array("Q", bytes(8 * (_FANOUT - 1)))
+        records = 0
+
+        with open(out_path, "wb") as out:
+            out.write(bytes(_HEADER.size + 8 * _FANOUT))
+
+            pending = None
+            for record in merged:
+                if pending is not None and record[:20] == pending[:20]:
+                    total = int.from_bytes(pending[20:], "big") + int.from_bytes(record[20:], "big")
+                    pending = pending[:20] + min(total, 0xFFFFFFFF).to_bytes(4, "big")
+                    continue
+
+                if pending is not None:
+                    _write_record(out, pending, sizes)
+                    records += 1
+                pending = record
+
+            if pending is not None:
+                _write_record(out, pending, sizes)
+                records += 1
+
+            fanout = array("Q", [0])
+            for size in sizes:
+                fanout.append(fanout[-1] + size)
+            if sys.byteorder != "little":
+                fanout.byteswap()
+
+            out.seek(0)
+            out.write(_HEADER.pack(_MAGIC, _VERSION, 0, records))
+            out.write(fanout.tobytes())
+
+            out.flush()
+            os.fsync(out.fileno())
+
+        return records
+    finally:
+        for f in files:
+            f.close()
+
+
+def _read_run(f):
+    while True:
+        chunk = f.read(24 * 65536)
+        if not chunk:
+            return
+        for offset in range(0, len(chunk), 24):
+            yield chunk[offset:offset + 24]
+
+
+def _write_record(out, record: bytes, sizes):
+    sizes[(record[0] << 8) | record[1]] += 1
+    out.write(record[2:20])
+    out.write(_COUNT.pack(int.from_bytes(record[20:], "big")))
+
+
+# ========================
+# Internal
+# ========================
+
+def _u64(mm, pos: int, count: int):
+    view = memoryview(mm)[pos:pos + 8 * count]
+    if sys.byteorder == "little":
+        return view.cast("Q")
+    values = array("Q", view)
+    values.byteswap()
+    return values
+
+
+# ========================
+# Entry point
+# ========================
+
+def main(argv=None) -> int:
+    """
+    --convert DUMP [OUT]: build the binary corpus from a Pwned
+    Passwords SHA-1 text dump.
+    """
+    args = sys.argv[1:] if argv is None else argv
+
+    if args[:1] != ["--convert"] or len(args) not in (2, 3):
+        print("usage: python -m utils.breach --convert DUMP [OUT]", file=sys.stderr)
+        return 2
+
+    out_path = Path(args[2]) if len(args) == 3 else DEFAULT_PATH
+
+    def progress(count):
+        print(f"\r{count:,} lines", end="", file=sys.stderr, flush=True)
+
+    with open(args[1], "rb") as f:
+        records = convert(f, out_path, progress)
+
+    print(f"\rWrote {records:,} hashes to {out_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
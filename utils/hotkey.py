@@ -1,21 +1,42 @@
 # utils/hotkey.py
 
+import time
+
+from PySide6.QtCore import QObject, Signal
+
 try:
     from pynput import keyboard
 except Exception:
     keyboard = None
 
 
-class GlobalHotkey:
-    def __init__(self, callback):
-        self.callback = callback
+class GlobalHotkey(QObject):
+    """
+    Ctrl+Alt+V anywhere on the desktop.
+
+    pynput calls back on its own listener thread, where touching Qt
+    widgets is unsafe. The press is re-emitted as `triggered`, which
+    Qt queues to the thread this object lives in (the GUI thread),
+    carrying the perf_counter() time of the press for latency
+    measurements.
+    """
+
+    triggered = Signal(float)
+
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self.triggered.connect(callback)
         self.listener = None
 
         if keyboard:
             self.listener = keyboard.GlobalHotKeys({
-                "<ctrl>+<alt>+v": self.callback
+                "<ctrl>+<alt>+v": self._pressed
             })
 
     def start(self):
         if self.listener:
             self.listener.start()
+
+    def _pressed(self):
+        # Listener thread: only emit
+        self.triggered.emit(time.perf_counter())
@@ -3,6 +3,8 @@
 import secrets
 import string
 
+from utils.strength import estimate
+
 
 UPPER = string.ascii_uppercase
 LOWER = string.ascii_lowercase
@@ -54,27 +56,8 @@ def generate_password(
 
 
 def password_strength(pwd: str) -> str:
-    score = 0
-
-    if len(pwd) >= 18:
-        score += 2
-    elif len(pwd) >= 12:
-        score += 1
-
-    if any(c.islower() for c in pwd):
-        score += 1
-    if any(c.isupper() for c in pwd):
-        score += 1
-    if any(c.isdigit() for c in pwd):
-        score += 1
-    if any(not c.isalnum() for c in pwd):
-        score += 1
-
-    if score <= 2:
-        return "Weak"
-    elif score <= 4:
-        return "Okay"
-    elif score <= 6:
-        return "Strong"
-    else:
-        return "Very Strong"
+    """
+    "Weak", "Okay", "Strong" or "Very Strong", from the guess
+    estimate in utils.strength.
+    """
+    return estimate(pwd).label
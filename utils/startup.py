@@ -0,0 +1,116 @@
+# utils/startup.py
+#
+# --profile-startup support: per-module import times (like
+# python -X importtime, but switchable from main()) and named
+# startup milestones, reported once the app is up.
+
+import sys
+import time
+
+# Modules listed in the report
+_TOP_IMPORTS = 25
+
+
+class _TimedLoader:
+    """
+    Wraps a module's loader to time create_module + exec_module.
+    Everything else is passed through.
+    """
+
+    def __init__(self, loader, profile):
+        self._loader = loader
+        self._profile = profile
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        if create is None:
+            return None
+
+        # Extension modules do their work here
+        with self._profile.timing(spec.name + " (load)"):
+            return create(spec)
+
+    def exec_module(self, module):
+        with self._profile.timing(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _Timing:
+    def __init__(self, profile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        # [name, start, time spent in nested imports]
+        self.frame = [self.name, time.perf_counter(), 0.0]
+        self.profile._stack.append(self.frame)
+
+    def __exit__(self, *exc):
+        profile = self.profile
+        profile._stack.pop()
+
+        total = time.perf_counter() - self.frame[1]
+        if profile._stack:
+            profile._stack[-1][2] += total
+        profile.imports.append((self.name, total - self.frame[2], total))
+
+
+class StartupProfile:
+    """
+    Import finder that times every module imported after install(),
+    plus mark() for milestones (ms since the process started).
+
+    Only installed when --profile-startup is given; normal startup
+    runs without it.
+    """
+
+    def __init__(self, started: float):
+        self.started = started
+        self.marks: list[tuple[str, float]] = []
+
+        # (module, self seconds, cumulative seconds)
+        self.imports: list[tuple[str, float, float]] = []
+        self._stack = []
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+
+        return None
+
+    def timing(self, name: str) -> _Timing:
+        return _Timing(self, name)
+
+    def mark(self, name: str):
+        self.marks.append((name, (time.perf_counter() - self.started) * 1000))
+
+    def report(self, out=None):
+        out = out or sys.stderr
+
+        print("Startup (ms since process start)", file=out)
+        for name, ms in self.marks:
+            print(f"  {ms:9.1f}  {name}", file=out)
+
+        print(f"\nSlowest imports (of {len(self.imports)}; ms)", file=out)
+        print(f"  {'self':>9}  {'cumulative':>10}  module", file=out)
+
+        by_total = sorted(self.imports, key=lambda row: row[2], reverse=True)
+        for name, own, total in by_total[:_TOP_IMPORTS]:
+            print(f"  {own * 1000:9.1f}  {total * 1000:10.1f}  {name}", file=out)
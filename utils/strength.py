@@ -0,0 +1,941 @@
+# utils/strength.py
+#
+# Password strength as an estimate of guesses, in the manner of
+# zxcvbn: the password is split into the cheapest sequence of patterns
+# an attacker would try (dictionary words, plain, reversed or l33t;
+# keyboard walks; sequences; repeats; dates; anything else is brute
+# force), and the guesses for that sequence give the score and the
+# crack time.
+#
+# strength.bin holds the word lists, compiled once and memory-mapped
+# on first use, so nothing is parsed at startup and the pages are
+# shared between processes. It is built from frequency lists (one
+# word per line, most common first) in strength_lists/. These are
+# starter lists of about 1,400 words, far smaller than an attacker's:
+# passphrases of words not on them score as brute force, and too high.
+# Rebuild after editing them, or from larger lists, with:
+#
+#   python -m utils.strength --compile utils/strength_lists
+#
+# The directory holds any of passwords.txt, english.txt, names.txt and
+# surnames.txt, and optionally common.txt, a longer list of leaked
+# passwords that only goes into the bloom filter (passwords.txt is
+# used if it is missing). Longer lists, e.g. zxcvbn's data/*.txt, can
+# be compiled the same way.
+#
+# Layout, all integers little-endian uint32 unless noted:
+#
+#   header      magic "VXPW", version (u16), dictionaries (u16),
+#               words, bloom items, bloom bits, bloom hashes,
+#               bloom max length
+#   names       16 bytes per dictionary, NUL padded
+#   fan-out     257 entries: index of the first word per first byte
+#   pairs       65536-bit bitmap of the first two bytes of words
+#               longer than one byte
+#   offsets     words + 1 entries into the word bytes
+#   ranks       words x dictionaries, 0 = not in that dictionary
+#   word bytes  UTF-8, sorted, then padding to 4 bytes
+#   bloom       bloom bits / 8 bytes
+
+import hashlib
+import math
+import mmap
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from functools import lru_cache
+from itertools import islice, product
+from pathlib import Path
+
+from config import STRENGTH_GUESSES_PER_SECOND
+
+_DATA_FILE = Path(__file__).with_name("strength.bin")
+
+_MAGIC = b"VXPW"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHHIIIII")
+_NAME_SIZE = 16
+_PAIRS_BYTES = 65536 // 8
+
+# Dictionaries in rank-column order, and the bloom filter's target
+# false positive rate
+_DICTIONARIES = ("passwords", "english", "names", "surnames")
+_BLOOM_ERROR = 1e-4
+
+# Passwords are matched this many characters at a time
+_MAX_ANALYZED = 64
+
+# Score boundaries in log10(guesses): 0-1 are guessable online, 4 is
+# out of reach offline
+_SCORE_LOG10 = tuple(math.log10(g + 5) for g in (1e3, 1e6, 1e8, 1e10))
+_LABELS = ("Weak", "Weak", "Okay", "Strong", "Very Strong")
+
+# Loaded on first use
+_DATA = None
+
+
+class Strength:
+    """
+    Estimate for one password.
+
+    guesses_log10 is log10 of the guesses needed; score runs 0-4 and
+    label names it; crack_time is the time at
+    STRENGTH_GUESSES_PER_SECOND, for display. patterns lists what the
+    password was matched as, in order ("english", "date",
+    "bruteforce", ...).
+    """
+
+    def __init__(self, guesses_log10: float, patterns: tuple):
+        self.guesses_log10 = guesses_log10
+        self.patterns = patterns
+        self.score = bisect_right(_SCORE_LOG10, guesses_log10)
+
+        seconds_log10 = guesses_log10 - math.log10(STRENGTH_GUESSES_PER_SECOND)
+        self.crack_seconds = 10 ** min(seconds_log10, 300)
+        self.crack_time = _display_time(self.crack_seconds)
+
+    @property
+    def label(self) -> str:
+        return _LABELS[self.score]
+
+
+@lru_cache(maxsize=1024)
+def estimate(password: str) -> Strength:
+    """
+    Score `password`. Results, and the dictionary lookups behind them,
+    are memoized, so re-scoring while the password is typed only
+    matches what the new character adds.
+    """
+    # Longer passwords are scored in pieces of _MAX_ANALYZED, from the
+    # last one back, each suffix scoring as its first piece plus the
+    # rest unless it is one long repeat
+    starts = range(0, len(password), _MAX_ANALYZED) if password else (0,)
+    guesses_log10, patterns = 0.0, ()
+    for start in reversed(starts):
+        piece_log10, piece_patterns = _estimate_piece(password[start : start + _MAX_ANALYZED])
+        if start + _MAX_ANALYZED >= len(password):
+            guesses_log10, patterns = piece_log10, piece_patterns
+            continue
+
+        guesses_log10 = piece_log10 + guesses_log10
+        patterns = piece_patterns + patterns
+
+        suffix = password[start:]
+        repeat = _REPEAT_LAZY.fullmatch(suffix)
+        if repeat:
+            base = repeat.group(1)
+            repeat_log10 = estimate(base).guesses_log10 + math.log10(len(suffix) // len(base))
+            if repeat_log10 < guesses_log10:
+                guesses_log10, patterns = repeat_log10, ("repeat",)
+
+    return Strength(guesses_log10, patterns)
+
+
+def dictionary_words() -> int:
+    """
+    Distinct words across the dictionaries in strength.bin.
+    """
+    return len(_data().words)
+
+
+def clear_cache():
+    """
+    Drop memoized results, which hold passwords and parts of them.
+    """
+    estimate.cache_clear()
+    _lookup.cache_clear()
+
+
+# ========================
+# Dictionaries
+# ========================
+
+class _Words:
+    """
+    The sorted words in the mapped file, as a sequence for bisect.
+    """
+
+    def __init__(self, mm, offsets, base: int, count: int):
+        self._mm = mm
+        self._offsets = offsets
+        self._base = base
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._mm[self._base + self._offsets[i]:self._base + self._offsets[i + 1]]
+
+
+class _Data:
+    """
+    strength.bin, memory-mapped read-only.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic, version, dictionaries, words,
+            self.bloom_items, self.bloom_bits, self.bloom_hashes, self.bloom_max_length,
+        ) = _HEADER.unpack_from(self.mm, 0)
+
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a version {_VERSION} strength file")
+
+        pos = _HEADER.size
+        self.names = [
+            self.mm[pos + i * _NAME_SIZE:pos + (i + 1) * _NAME_SIZE].rstrip(b"\0").decode("ascii")
+            for i in range(dictionaries)
+        ]
+        pos = _align(pos + dictionaries * _NAME_SIZE)
+
+        self.fanout = _u32(self.mm, pos, 257)
+        pos += 4 * 257
+
+        # The ASCII pairs as strings, to test slices of the password
+        self.pairs = frozenset(
+            chr(pair >> 8) + chr(pair & 0xFF)
+            for byte, bits in enumerate(self.mm[pos:pos + _PAIRS_BYTES]) if bits
+            for pair in range(byte << 3, (byte + 1) << 3)
+            if bits & (1 << (pair & 7)) and pair & 0x8080 == 0
+        )
+        pos += _PAIRS_BYTES
+
+        offsets = _u32(self.mm, pos, words + 1)
+        pos += 4 * (words + 1)
+
+        self.ranks = _u32(self.mm, pos, words * dictionaries)
+        pos += 4 * words * dictionaries
+
+        self.words = _Words(self.mm, offsets, pos, words)
+        self.bloom_offset = _align(pos + offsets[words])
+        self.dictionaries = dictionaries
+
+    def word_ranks(self, index: int) -> tuple:
+        """
+        ((dictionary name, rank), ...) for the word at `index`.
+        """
+        start = index * self.dictionaries
+        return tuple(
+            (self.names[d], rank)
+            for d, rank in enumerate(self.ranks[start:start + self.dictionaries])
+            if rank
+        )
+
+    def is_common(self, word: str) -> bool:
+        """
+        Bloom filter test: False means `word` is not on the common
+        list, True that it is with probability 1 - _BLOOM_ERROR.
+        """
+        if not self.bloom_bits or len(word) > self.bloom_max_length:
+            return False
+
+        h1, h2 = _bloom_hashes(word.encode("utf-8"))
+        for k in range(self.bloom_hashes):
+            bit = (h1 + k * h2) % self.bloom_bits
+            if not self.mm[self.bloom_offset + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+
+def _data() -> _Data:
+    global _DATA
+    if _DATA is None:
+        _DATA = _Data(_DATA_FILE)
+    return _DATA
+
+
+@lru_cache(maxsize=8192)
+def _lookup(prefix: str) -> tuple:
+    """
+    (lo, hi, ranks): a range of words holding every word that starts
+    with `prefix` (empty if there are none, and starting at the first
+    such word), and word_ranks() if `prefix` is itself a word. Each
+    call narrows the memoized range of prefix[:-1], and hi is left as
+    that range's end: one bisect per character.
+    """
+    data = _data()
+    key = prefix.encode("utf-8")
+
+    if len(prefix) == 1:
+        lo, hi = data.fanout[key[0]], data.fanout[key[0] + 1]
+    else:
+        lo, hi, _ = _lookup(prefix[:-1])
+
+    if lo >= hi:
+        return lo, lo, ()
+
+    words = data.words
+    lo = bisect_left(words, key, lo, hi)
+    if lo >= hi:
+        return lo, lo, ()
+
+    first = words[lo]
+    if not first.startswith(key):
+        return lo, lo, ()
+
+    ranks = data.word_ranks(lo) if first == key else ()
+    return lo, hi, ranks
+
+
+# ========================
+# Matchers
+# ========================
+#
+# Each returns [(start, end, log10 guesses, pattern), ...] over
+# password[start:end].
+
+# l33t character -> the letters it may stand for
+_L33T = {
+    "4": "a", "@": "a", "8": "b", "(": "c", "{": "c", "[": "c", "<": "c",
+    "3": "e", "6": "g", "9": "g", "1": "il", "!": "i", "|": "il",
+    "7": "lt", "0": "o", "$": "s", "5": "s", "+": "t", "%": "x", "2": "z",
+}
+_L33T_MAX_VARIANTS = 16
+
+
+def _dictionary_matches(password: str, lower: str) -> list:
+    n = len(lower)
+    matches = []
+
+    # The whole password on the common list
+    if _data().is_common(lower):
+        guesses = _data().bloom_items * _case_variations(password)
+        matches.append((0, n, math.log10(guesses), "common"))
+
+    pairs = _data().pairs
+
+    # Single characters are left to brute force, which scores them
+    # the same (_MIN_GUESSES_LOG10), so words start at two characters
+    variants = [(lower, None)] + _l33t_variants(lower)
+    for word, subs in variants:
+        for reverse in (False, True):
+            text = word[::-1] if reverse else word
+
+            # Most starts end here, on the pair bitmap. Pairs outside
+            # ASCII are not in it and are always looked up
+            if text.isascii():
+                starts = [i for i in range(n - 1) if text[i:i + 2] in pairs]
+            else:
+                starts = [i for i in range(n - 1) if text[i:i + 2] in pairs or not text[i:i + 2].isascii()]
+
+            for i in starts:
+                for j in range(i + 2, n + 1):
+                    lo, hi, ranks = _lookup(text[i:j])
+                    if lo >= hi:
+                        break
+                    if not ranks:
+                        continue
+
+                    start, end = (n - j, n - i) if reverse else (i, j)
+                    token = password[start:end]
+
+                    guesses = min(rank for _, rank in ranks) * _case_variations(token)
+                    if subs is not None:
+                        used = {c: subs[c] for c in set(lower[start:end]) if c in subs}
+                        if not used:
+                            # Same as the plain match
+                            continue
+                        guesses *= _l33t_variations(lower[start:end], used)
+                    if reverse:
+                        guesses *= 2
+
+                    name = min(ranks, key=lambda r: r[1])[0]
+                    matches.append((start, end, math.log10(guesses), name))
+
+    return matches
+
+
+def _l33t_variants(lower: str) -> list:
+    """
+    [(unsubstituted word, {l33t char: letter}), ...] for each reading
+    of the l33t characters in `lower`.
+    """
+    present = sorted({c for c in lower if c in _L33T})
+    if not present:
+        return []
+
+    variants = []
+    for letters in islice(product(*(_L33T[c] for c in present)), _L33T_MAX_VARIANTS):
+        subs = dict(zip(present, letters))
+        variants.append(("".join(subs.get(c, c) for c in lower), subs))
+    return variants
+
+
+def _case_variations(token: str) -> int:
+    upper = sum(c.isupper() for c in token)
+    if not upper:
+        return 1
+
+    lower = sum(c.islower() for c in token)
+    if not lower or (upper == 1 and (token[0].isupper() or token[-1].isupper())):
+        return 2
+    return sum(math.comb(upper + lower, k) for k in range(1, min(upper, lower) + 1))
+
+
+def _l33t_variations(token: str, subs: dict) -> int:
+    variations = 1
+    for char, letter in subs.items():
+        subbed = token.count(char)
+        unsubbed = token.count(letter)
+        if not unsubbed:
+            variations *= 2
+        else:
+            variations *= sum(math.comb(subbed + unsubbed, k) for k in range(1, min(subbed, unsubbed) + 1))
+    return variations
+
+
+class _Keyboard:
+    """
+    A layout as key positions on a grid of half-key columns. Slanted
+    layouts (typewriter rows, each offset from the one above) give
+    each key 6 neighbours; aligned ones (keypads) 8.
+    """
+
+    def __init__(self, rows, offsets, slanted: bool):
+        self.keys = {}
+        positions = set()
+
+        for y, (row, offset) in enumerate(zip(rows, offsets)):
+            for column, key in enumerate(row):
+                if not key:
+                    continue
+                x = offset + 2 * column
+                positions.add((x, y))
+                for shifted, char in enumerate(key):
+                    self.keys[char] = (x, y, bool(shifted))
+
+        if slanted:
+            self.steps = {(-2, 0), (2, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)}
+        else:
+            self.steps = {(dx, dy) for dx in (-2, 0, 2) for dy in (-1, 0, 1) if dx or dy}
+
+        degrees = [
+            sum((x + dx, y + dy) in positions for dx, dy in self.steps)
+            for x, y in positions
+        ]
+        self.starts = len(positions)
+        self.degree = sum(degrees) / len(degrees)
+
+    def guesses_log10(self, length: int, turns: int, shifted: int) -> float:
+        guesses = 0
+        for i in range(2, length + 1):
+            for t in range(1, min(turns, i - 1) + 1):
+                guesses += math.comb(i - 1, t - 1) * self.starts * self.degree ** t
+
+        if shifted:
+            unshifted = length - shifted
+            if not unshifted:
+                guesses *= 2
+            else:
+                guesses *= sum(math.comb(length, k) for k in range(1, min(shifted, unshifted) + 1))
+
+        return math.log10(guesses)
+
+
+_KEYBOARDS = (
+    _Keyboard(
+        (
+            "`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+".split(),
+            "qQ wW eE rR tT yY uU iI oO pP [{ ]} \\|".split(),
+            "aA sS dD fF gG hH jJ kK lL ;: '\"".split(),
+            "zZ xX cC vV bB nN mM ,< .> /?".split(),
+        ),
+        (0, 3, 4, 5),
+        slanted=True,
+    ),
+    _Keyboard(
+        (
+            ("", "/", "*", "-"),
+            ("7", "8", "9", "+"),
+            ("4", "5", "6"),
+            ("1", "2", "3"),
+            ("0", "", "."),
+        ),
+        (0, 0, 0, 0, 0),
+        slanted=False,
+    ),
+)
+
+
+def _spatial_matches(password: str) -> list:
+    n = len(password)
+    matches = []
+
+    for keyboard in _KEYBOARDS:
+        keys = keyboard.keys
+        i = 0
+        while i < n - 2:
+            key = keys.get(password[i])
+            j = i + 1
+            turns = 0
+            shifted = 1 if key and key[2] else 0
+            direction = None
+
+            while key and j < n:
+                following = keys.get(password[j])
+                if not following:
+                    break
+                step = (following[0] - key[0], following[1] - key[1])
+                if step not in keyboard.steps:
+                    break
+                if step != direction:
+                    turns += 1
+                    direction = step
+                if following[2]:
+                    shifted += 1
+                key = following
+                j += 1
+
+            if j - i >= 3:
+                matches.append((i, j, keyboard.guesses_log10(j - i, turns, shifted), "spatial"))
+            i = j
+
+    return matches
+
+
+_SEQUENCE_MAX_DELTA = 5
+
+
+def _sequence_matches(password: str) -> list:
+    n = len(password)
+    matches = []
+
+    i = 0
+    while i < n - 2:
+        delta = ord(password[i + 1]) - ord(password[i])
+        if delta and abs(delta) <= _SEQUENCE_MAX_DELTA:
+            j = i + 1
+            while j + 1 < n and ord(password[j + 1]) - ord(password[j]) == delta:
+                j += 1
+
+            if j - i >= 2:
+                token = password[i:j + 1]
+                first = token[0]
+                if first in "aAzZ019":
+                    base = 4
+                elif first.isdigit():
+                    base = 10
+                else:
+                    base = 26
+                if delta < 0:
+                    base *= 2
+
+                matches.append((i, j + 1, math.log10(base * len(token)), "sequence"))
+                # The next sequence may start where this one ends
+                i = j
+                continue
+        i += 1
+
+    return matches
+
+
+_REPEAT_GREEDY = re.compile(r"(.+)\1+", re.S)
+_REPEAT_LAZY = re.compile(r"(.+?)\1+", re.S)
+
+
+def _repeat_matches(password: str) -> list:
+    matches = []
+
+    pos = 0
+    while pos < len(password):
+        greedy = _REPEAT_GREEDY.search(password, pos)
+        if not greedy:
+            break
+        lazy = _REPEAT_LAZY.search(password, pos)
+
+        # "abcabc" repeats "abc", "aabaab" repeats "aab" not "a"
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            match = greedy
+            base = _REPEAT_LAZY.fullmatch(greedy.group(0)).group(1)
+        else:
+            match = lazy
+            base = lazy.group(1)
+
+        start, end = match.span()
+        count = (end - start) // len(base)
+        # The base is scored as a password of its own (memoized)
+        guesses_log10 = estimate(base).guesses_log10 + math.log10(count)
+
+        matches.append((start, end, guesses_log10, "repeat"))
+        pos = end
+
+    return matches
+
+
+_REFERENCE_YEAR = date.today().year
+_DATE_MIN_YEAR = 1000
+_DATE_MAX_YEAR = 2050
+_MIN_YEAR_SPACE = 20
+
+_DATE_SEPARATED = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+_YEAR = re.compile(r"19\d\d|20\d\d")
+_DIGITS = frozenset("0123456789")
+
+# Digit-only dates by length: where to split into three numbers
+_DATE_SPLITS = {
+    4: ((1, 2), (2, 3)),
+    5: ((1, 3), (2, 3)),
+    6: ((1, 2), (2, 4), (4, 5)),
+    7: ((1, 3), (2, 3), (4, 5), (4, 6)),
+    8: ((2, 4), (4, 6)),
+}
+
+
+def _date_matches(password: str) -> list:
+    n = len(password)
+    matches = []
+
+    for i in range(n - 3):
+        for j in range(i + 1, min(i + 8, n) + 1):
+            if password[j - 1] not in _DIGITS:
+                break
+            if j - i < 4:
+                continue
+
+            token = password[i:j]
+            years = [
+                year
+                for a, b in _DATE_SPLITS[j - i]
+                if (year := _date_year(int(token[:a]), int(token[a:b]), int(token[b:]))) is not None
+            ]
+            if years:
+                year = min(years, key=lambda y: abs(y - _REFERENCE_YEAR))
+                matches.append((i, j, _date_guesses_log10(year, False), "date"))
+
+    for match in _DATE_SEPARATED.finditer(password):
+        year = _date_year(int(match.group(1)), int(match.group(3)), int(match.group(4)))
+        if year is not None:
+            matches.append((*match.span(), _date_guesses_log10(year, True), "date"))
+
+    for match in _YEAR.finditer(password):
+        space = max(abs(int(match.group(0)) - _REFERENCE_YEAR), _MIN_YEAR_SPACE)
+        matches.append((*match.span(), math.log10(space), "year"))
+
+    return matches
+
+
+def _date_year(first: int, second: int, third: int) -> int | None:
+    """
+    The year, if the three numbers read as a day, month and year in
+    some order (year first or last).
+    """
+    if second > 31 or second <= 0:
+        return None
+
+    over_12 = over_31 = under_1 = 0
+    for value in (first, second, third):
+        if 99 < value < _DATE_MIN_YEAR or value > _DATE_MAX_YEAR:
+            return None
+        over_31 += value > 31
+        over_12 += value > 12
+        under_1 += value <= 0
+    if over_31 >= 2 or over_12 == 3 or under_1 >= 2:
+        return None
+
+    candidates = ((third, first, second), (first, second, third))
+
+    for year, a, b in candidates:
+        if _DATE_MIN_YEAR <= year <= _DATE_MAX_YEAR:
+            return year if _is_day_month(a, b) else None
+
+    for year, a, b in candidates:
+        if _is_day_month(a, b):
+            # Two digits: 51-99 -> 1900s, 00-50 -> 2000s
+            return year + (1900 if year > 50 else 2000)
+
+    return None
+
+
+def _is_day_month(a: int, b: int) -> bool:
+    return (1 <= a <= 31 and 1 <= b <= 12) or (1 <= b <= 31 and 1 <= a <= 12)
+
+
+def _date_guesses_log10(year: int, separated: bool) -> float:
+    guesses = max(abs(year - _REFERENCE_YEAR), _MIN_YEAR_SPACE) * 365
+    if separated:
+        guesses *= 4
+    return math.log10(guesses)
+
+
+# ========================
+# Search
+# ========================
+
+# zxcvbn's floors for a match that is only part of the password, and
+# its penalty for every further pattern in the sequence
+_MIN_GUESSES_LOG10 = (1.0, math.log10(50))
+_PATTERN_PENALTY_LOG10 = 4.0
+
+# log10(k!) for every pattern count a sequence can reach
+_FACTORIAL_LOG10 = [math.lgamma(k + 1) / math.log(10) for k in range(_MAX_ANALYZED + 2)]
+
+
+def _estimate_piece(analyzed: str) -> tuple:
+    """
+    (log10 guesses, patterns) for up to _MAX_ANALYZED characters.
+    """
+    matches = (
+        _dictionary_matches(analyzed, _lower(analyzed))
+        + _spatial_matches(analyzed)
+        + _sequence_matches(analyzed)
+        + _repeat_matches(analyzed)
+        + _date_matches(analyzed)
+    )
+    return _cheapest(len(analyzed), matches)
+
+
+def _cheapest(n: int, matches: list) -> tuple:
+    """
+    (log10 guesses, patterns) for the cheapest way to cover n
+    characters with matches and brute force (10 guesses a character).
+
+    Guesses for a sequence of k patterns are
+    k! * product(guesses) + 10000 ** (k - 1). Positions keep one best
+    partial sequence ending in a match and one ending in brute force,
+    so a brute-force run counts as a single pattern.
+    """
+    if not n:
+        return 0.0, ()
+    if not matches:
+        # One brute-force run: 1! * 10**n + 10000**0
+        return math.log10(10 ** n + 1), ("bruteforce",)
+
+    ends = [[] for _ in range(n + 1)]
+    for start, end, guesses_log10, pattern in matches:
+        if end - start < n:
+            guesses_log10 = max(guesses_log10, _MIN_GUESSES_LOG10[end - start > 1])
+        ends[end].append((start, guesses_log10, pattern))
+
+    # best[pos][in_bruteforce] = (total, product, count, back pos, back state, pattern)
+    best = [[None, None] for _ in range(n + 1)]
+    best[0][0] = (0.0, 0.0, 0, -1, 0, None)
+
+    for end in range(1, n + 1):
+        cell = best[end]
+
+        for state in (0, 1):
+            previous = best[end - 1][state]
+            if previous:
+                count = previous[2] + (0 if state else 1)
+                _offer(cell, 1, previous[1] + 1.0, count, end - 1, state, "bruteforce")
+
+        for start, guesses_log10, pattern in ends[end]:
+            for state in (0, 1):
+                previous = best[start][state]
+                if previous:
+                    _offer(cell, 0, previous[1] + guesses_log10, previous[2] + 1, start, state, pattern)
+
+    state = min((0, 1), key=lambda s: best[n][s][0] if best[n][s] else math.inf)
+    total = best[n][state][0]
+
+    patterns = []
+    pos = n
+    while pos > 0:
+        _, _, _, back, back_state, pattern = best[pos][state]
+        # A brute-force run is listed once, at its first character
+        if not (pattern == "bruteforce" and back_state == 1):
+            patterns.append(pattern)
+        pos, state = back, back_state
+
+    return total, tuple(reversed(patterns))
+
+
+def _offer(cell: list, state: int, product_log10: float, count: int, back: int, back_state: int, pattern: str):
+    a = product_log10 + _FACTORIAL_LOG10[count]
+    b = _PATTERN_PENALTY_LOG10 * (count - 1)
+    # log10(10**a + 10**b); the smaller term vanishes past 16 digits
+    gap = abs(a - b)
+    total = max(a, b) + (math.log10(1 + 10 ** -gap) if gap < 16 else 0.0)
+
+    current = cell[state]
+    if current is None or total < current[0]:
+        cell[state] = (total, product_log10, count, back, back_state, pattern)
+
+
+# ========================
+# Internal
+# ========================
+
+_TIME_UNITS = (
+    ("year", 31557600),
+    ("month", 2629800),
+    ("day", 86400),
+    ("hour", 3600),
+    ("minute", 60),
+    ("second", 1),
+)
+
+
+def _display_time(seconds: float) -> str:
+    if seconds < 1:
+        return "less than a second"
+    if seconds >= 100 * _TIME_UNITS[0][1]:
+        return "centuries"
+
+    for unit, size in _TIME_UNITS:
+        if seconds >= size:
+            count = round(seconds / size)
+            return f"{count} {unit}{'' if count == 1 else 's'}"
+
+
+def _lower(password: str) -> str:
+    lower = password.lower()
+    if len(lower) == len(password):
+        return lower
+    # Keep positions aligned where lowercasing changes the length ("İ")
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in password)
+
+
+def _bloom_hashes(data: bytes) -> tuple:
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+def _align(pos: int) -> int:
+    return (pos + 3) & ~3
+
+
+def _u32(mm, pos: int, count: int):
+    view = memoryview(mm)[pos:pos + 4 * count]
+    if sys.byteorder == "little":
+        return view.cast("I")
+    values = array("I", view)
+    values.byteswap()
+    return values
+
+
+# ========================
+# Compiler
+# ========================
+
+def compile_lists(directory) -> bytes:
+    """
+    Build strength.bin from the frequency lists in `directory`.
+    """
+    directory = Path(directory)
+
+    names = []
+    ranks: dict[bytes, list[int]] = {}
+    for name in _DICTIONARIES:
+        path = directory / f"{name}.txt"
+        if not path.exists():
+            continue
+
+        column = len(names)
+        names.append(name)
+        for rank, word in enumerate(_read_list(path), start=1):
+            ranks.setdefault(word.encode("utf-8"), [0] * len(_DICTIONARIES))[column] = rank
+
+    words = sorted(ranks)
+
+    common_path = directory / "common.txt"
+    if not common_path.exists():
+        common_path = directory / "passwords.txt"
+    common = list(_read_list(common_path)) if common_path.exists() else []
+
+    # Bloom filter sized for _BLOOM_ERROR
+    bits = 0
+    hashes = 0
+    if common:
+        bits = _align(math.ceil(-len(common) * math.log(_BLOOM_ERROR) / math.log(2) ** 2 / 8)) * 8
+        hashes = max(1, round(bits / len(common) * math.log(2)))
+    bloom = bytearray(bits // 8)
+    for word in common:
+        h1, h2 = _bloom_hashes(word.encode("utf-8"))
+        for k in range(hashes):
+            bit = (h1 + k * h2) % bits
+            bloom[bit >> 3] |= 1 << (bit & 7)
+
+    fanout = [bisect_left(words, bytes([b])) for b in range(256)] + [len(words)]
+
+    pairs = bytearray(_PAIRS_BYTES)
+    for word in words:
+        if len(word) > 1:
+            pair = (word[0] << 8) | word[1]
+            pairs[pair >> 3] |= 1 << (pair & 7)
+
+    offsets = [0]
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+
+    columns = [
+        ranks[word][_DICTIONARIES.index(name)]
+        for word in words
+        for name in names
+    ]
+
+    out = bytearray(_HEADER.pack(
+        _MAGIC, _VERSION, len(names), len(words),
+        len(common), bits, hashes, max(map(len, common), default=0),
+    ))
+    for name in names:
+        out += name.encode("ascii").ljust(_NAME_SIZE, b"\0")
+    out += bytes(_align(len(out)) - len(out))
+
+    for values in (fanout, pairs, offsets, columns):
+        if isinstance(values, bytearray):
+            out += values
+            continue
+        table = array("I", values)
+        if sys.byteorder != "little":
+            table.byteswap()
+        out += table.tobytes()
+
+    out += b"".join(words)
+    out += bytes(_align(len(out)) - len(out))
+    out += bloom
+    return bytes(out)
+
+
+def _read_list(path):
+    """
+    Unique lowercased words of a list, in order. Lines may carry a
+    count after the word ("password 3861"), which is ignored.
+    """
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            word = fields[0].lower()
+            if word not in seen:
+                seen.add(word)
+                yield word
+
+
+# ========================
+# Entry point
+# ========================
+
+def main(argv=None) -> int:
+    """
+    --compile DIR: rebuild strength.bin from the lists in DIR.
+    Otherwise print the estimate for each argument.
+    """
+    args = sys.argv[1:] if argv is None else argv
+
+    if args[:1] == ["--compile"] and len(args) == 2:
+        _DATA_FILE.write_bytes(compile_lists(args[1]))
+        print(f"Wrote {_DATA_FILE}")
+        return 0
+
+    for password in args:
+        result = estimate(password)
+        print(
+            f"{password}\t{result.label} ({result.score})\t"
+            f"10^{result.guesses_log10:.1f} guesses\t{result.crack_time}\t"
+            f"{' + '.join(result.patterns)}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# utils/trace.py
+#
+# Timing spans around the hot paths. Tracing is decided once, at
+# import: when it is off, traced() and trace_methods() hand back the
+# original functions, so there is no wrapper on the call path at all.
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+
+from config import TRACE_ENABLED, TRACE_WINDOW
+
+ENABLED = TRACE_ENABLED or os.environ.get("VAULTX_TRACE") == "1"
+
+# Histogram upper bounds (ms); the last bucket is everything above
+BUCKETS_MS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def _percentile(sorted_ms, pct: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * pct / 100))]
+
+
+class SpanStats:
+    """
+    One span: lifetime count/sum/buckets (for export) plus the last
+    `window` durations (for the rolling view).
+    """
+
+    __slots__ = ("name", "count", "total_ms", "buckets", "window", "_lock")
+
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.count = 0
+        self.total_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.window = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, ms: float):
+        with self._lock:
+            self.count += 1
+            self.total_ms += ms
+            self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+            self.window.append(ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self.window)
+            count, total_ms = self.count, self.total_ms
+            buckets = list(self.buckets)
+
+        recent_buckets = [0] * (len(BUCKETS_MS) + 1)
+        for ms in recent:
+            recent_buckets[bisect_left(BUCKETS_MS, ms)] += 1
+
+        return {
+            "count": count,
+            "total_ms": total_ms,
+            "buckets": buckets,
+            "recent": {
+                "count": len(recent),
+                "p50_ms": _percentile(recent, 50),
+                "p90_ms": _percentile(recent, 90),
+                "p99_ms": _percentile(recent, 99),
+                "max_ms": recent[-1] if recent else 0.0,
+                "buckets": recent_buckets,
+            },
+        }
+
+
+class Tracer:
+    def __init__(self, window: int = TRACE_WINDOW):
+        self.window = window
+        self._spans: dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, name: str) -> SpanStats:
+        spans = self._spans.get(name)
+        if spans is None:
+            with self._lock:
+                spans = self._spans.setdefault(name, SpanStats(name, self.window))
+        return spans
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            spans = sorted(self._spans.items())
+        return {name: stats.snapshot() for name, stats in spans}
+
+    def reset(self):
+        with self._lock:
+            names = list(self._spans)
+            self._spans = {name: SpanStats(name, self.window) for name in names}
+
+    # ========================
+    # Export
+    # ========================
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "timestamp": time.time(),
+                "buckets_ms": list(BUCKETS_MS),
+                "spans": self.snapshot(),
+            },
+            indent=2,
+        )
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition: one histogram, labelled by span.
+        """
+        metric = "vaultx_span_duration_seconds"
+        lines = [
+            f"# HELP {metric} Time spent in traced VaultX spans.",
+            f"# TYPE {metric} histogram",
+        ]
+
+        bounds = [f"{ms / 1000:g}" for ms in BUCKETS_MS] + ["+Inf"]
+
+        for name, snap in self.snapshot().items():
+            cumulative = 0
+            for bound, n in zip(bounds, snap["buckets"]):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {snap["total_ms"] / 1000:.6f}')
+            lines.append(f'{metric}_count{{span="{name}"}} {snap["count"]}')
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        Write JSON, or Prometheus text for .prom/.txt paths.
+        """
+        path = os.fspath(path)
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+tracer = Tracer()
+
+
+# ========================
+# Decorators
+# ========================
+
+def traced(name: str):
+    """
+    Record every call of the decorated function under `name`.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        stats = tracer.stats(name)
+        clock = time.perf_counter
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats.record((clock() - start) * 1000)
+
+        return wrapper
+
+    return decorate
+
+
+def trace_methods(prefix: str, *names: str):
+    """
+    Class decorator: trace the named methods (default: every public
+    one) as "<prefix>.<method>". Static methods stay static.
+    """
+    def decorate(cls):
+        if not ENABLED:
+            return cls
+
+        for attr, value in list(vars(cls).items()):
+            if names and attr not in names:
+                continue
+            if not names and attr.startswith("_"):
+                continue
+
+            if isinstance(value, staticmethod):
+                wrapped = staticmethod(traced(f"{prefix}.{attr}")(value.__func__))
+            elif callable(value):
+                wrapped = traced(f"{prefix}.{attr}")(value)
+            else:
+                continue
+
+            setattr(cls, attr, wrapped)
+
+        return cls
+
+    return decorate
@@ -0,0 +1,15 @@
+# vaultx.py
+#
+# Command-line entry point (see core/cli.py). Never imports Qt.
+
+import time
+
+_STARTED = time.perf_counter()
+
+import sys
+
+from core.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main(started=_STARTED))